@@ -1,10 +1,11 @@
 from .Components.components import Component
 from .transformers import transformers
-from .symbolic_transformers import transformers as symbolic_transformers
+from .symbolic_transformers import transformers as symbolic_transformers, parameters as symbolic_parameters
 from ..Network.network import Network
 import numpy as np
 import sympy as sp
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from typing import Iterable
 
 class AmbiguousComponentID(Exception): pass
 class CircuitTransformationError(Exception): pass
@@ -76,3 +77,14 @@ def transform_symbolic_circuit(circuit: Circuit, s: sp.Symbol = sp.Symbol('s', c
         )   
     except (ValueError, KeyError) as e:
         raise CircuitTransformationError from e
+
+def keep_symbolic(circuit: Circuit, component_ids: Iterable[str]) -> Circuit:
+    ids = set(component_ids)
+    def symbolic(component: Component) -> Component:
+        if component.id not in ids:
+            return component
+        try:
+            return replace(component, value=component.value | {symbolic_parameters[component.type]: 'nan'})
+        except KeyError as e:
+            raise CircuitTransformationError(f'Component "{component.id}" of type "{component.type}" has no symbolic parameter.') from e
+    return Circuit(components=[symbolic(component) for component in circuit.components], ground_node=circuit.ground_node)
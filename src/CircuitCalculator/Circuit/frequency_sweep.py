@@ -0,0 +1,142 @@
+from .circuit import Circuit, transform_circuit
+from ..Network.NodalAnalysis import node_analysis as na
+from ..Network.NodalAnalysis.compiled_network import CompiledNetwork, CompiledNetworkSolution, Port, compile_network
+from ..Network.solution import NetworkSolutionException
+from dataclasses import dataclass, field
+from typing import Callable
+import numpy as np
+
+SweepQuantity = Callable[[CompiledNetworkSolution], np.ndarray]
+
+frequency_selective_sources = ['dc_voltage_source', 'ac_voltage_source', 'dc_current_source', 'ac_current_source']
+periodic_sources = ['periodic_voltage_source', 'periodic_current_source']
+
+def structure_keys(circuit: Circuit, w: np.ndarray, w_resolution: float = 1e-3) -> np.ndarray:
+    keys = [np.zeros(len(w), dtype=int)]
+    if any(component.type in ['capacitor', 'inductance'] for component in circuit):
+        keys.append(w == 0)
+    for component in circuit:
+        if component.type in frequency_selective_sources:
+            keys.append(np.abs(w-float(component.value['w'])) <= w_resolution)
+        if component.type in periodic_sources:
+            w0 = float(component.value['w'])
+            n = np.round(w/w0)
+            active = np.abs(w/w0 - n) <= w_resolution/w0
+            keys.extend([active, np.where(active, n, 0)])
+    return np.stack(keys, axis=-1).astype(int)
+
+def frequency_groups(circuit: Circuit, w: np.ndarray, w_resolution: float = 1e-3) -> list[np.ndarray]:
+    if len(w) == 0:
+        return []
+    _, inverse = np.unique(structure_keys(circuit, w, w_resolution), axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    return [np.flatnonzero(inverse == k) for k in range(inverse.max()+1)]
+
+def reactive_element_values(circuit: Circuit, compiled_network: CompiledNetwork, w: np.ndarray) -> np.ndarray:
+    element_values = np.tile(compiled_network.element_values, (len(w), 1))
+    for component in circuit:
+        if component.id not in compiled_network.element_index:
+            continue
+        k = compiled_network.element_index[component.id]
+        if component.type == 'capacitor':
+            element_values[:, k] = 1j*w*float(component.value['C'])
+        if component.type == 'inductance':
+            element_values[:, k] = 1/(1j*w*float(component.value['L']))
+    return element_values
+
+@dataclass(frozen=True)
+class FrequencySweepGroup:
+    indices: np.ndarray
+    compiled_network: CompiledNetwork
+    element_values: np.ndarray
+
+def frequency_sweep_groups(circuit: Circuit, w: np.ndarray, w_resolution: float = 1e-3, rms: bool = True) -> list[FrequencySweepGroup]:
+    groups = []
+    for indices in frequency_groups(circuit, w, w_resolution):
+        compiled_network = compile_network(transform_circuit(circuit, w[indices[0]], w_resolution, rms))
+        groups.append(FrequencySweepGroup(indices, compiled_network, reactive_element_values(circuit, compiled_network, w[indices])))
+    return groups
+
+@dataclass(frozen=True)
+class FrequencySweepSolution:
+    w: np.ndarray
+    solutions: list[tuple[np.ndarray, CompiledNetworkSolution]]
+    peak_values: bool = False
+    _cache: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def _quantity(self, key: tuple[str, str], quantity: SweepQuantity) -> np.ndarray:
+        if key not in self._cache:
+            values = np.full(len(self.w), np.nan, dtype=complex)
+            for indices, solution in self.solutions:
+                try:
+                    values[indices] = quantity(solution)
+                except KeyError:
+                    pass
+            self._cache[key] = values
+        return self._cache[key]
+
+    def get_voltage(self, component_id: str) -> np.ndarray:
+        return self._quantity(('voltage', component_id), lambda solution: solution.get_voltage(component_id))
+
+    def get_current(self, component_id: str) -> np.ndarray:
+        return self._quantity(('current', component_id), lambda solution: solution.get_current(component_id))
+
+    def get_potential(self, node_id: str) -> np.ndarray:
+        return self._quantity(('potential', node_id), lambda solution: solution.get_potential(node_id))
+
+    def get_power(self, component_id: str) -> np.ndarray:
+        power = self.get_voltage(component_id)*np.conj(self.get_current(component_id))
+        return 1/2*power if self.peak_values else power
+
+    def get_voltages(self, component_ids: list[str]) -> np.ndarray:
+        return np.stack([self.get_voltage(id) for id in component_ids], axis=-1)
+
+    def get_currents(self, component_ids: list[str]) -> np.ndarray:
+        return np.stack([self.get_current(id) for id in component_ids], axis=-1)
+
+    def get_potentials(self, node_ids: list[str]) -> np.ndarray:
+        return np.stack([self.get_potential(id) for id in node_ids], axis=-1)
+
+    def get_powers(self, component_ids: list[str]) -> np.ndarray:
+        return np.stack([self.get_power(id) for id in component_ids], axis=-1)
+
+@dataclass(frozen=True)
+class FrequencySweepPoint:
+    sweep: FrequencySweepSolution
+    index: int
+
+    def get_voltage(self, branch_id: str) -> complex:
+        return self.sweep.get_voltage(branch_id)[self.index]
+
+    def get_current(self, branch_id: str) -> complex:
+        return self.sweep.get_current(branch_id)[self.index]
+
+    def get_potential(self, node_id: str) -> complex:
+        return self.sweep.get_potential(node_id)[self.index]
+
+    def get_power(self, branch_id: str) -> complex:
+        return self.sweep.get_power(branch_id)[self.index]
+
+def frequency_sweep_solution(circuit: Circuit, w: np.ndarray, peak_values: bool = False, w_resolution: float = 1e-3) -> FrequencySweepSolution:
+    w = np.asarray(w, dtype=float).reshape(-1)
+    try:
+        solutions = [
+            (group.indices, group.compiled_network.solve(group.element_values))
+            for group in frequency_sweep_groups(circuit, w, w_resolution, rms=not peak_values)
+        ]
+    except na.NodalAnalysisException as e:
+        raise NetworkSolutionException("Solving network failed.", floating_nodes=e.floating_nodes, contradictional_elements=e.contradictional_elements)
+    return FrequencySweepSolution(w=w, solutions=solutions, peak_values=peak_values)
+
+def open_circuit_impedance_sweep(circuit: Circuit, node1: str, node2: str, w: np.ndarray, w_resolution: float = 1e-3) -> np.ndarray:
+    return port_impedance_matrix_sweep(circuit, [(node1, node2)], w, w_resolution)[:, 0, 0]
+
+def port_impedance_matrix_sweep(circuit: Circuit, ports: list[Port], w: np.ndarray, w_resolution: float = 1e-3) -> np.ndarray:
+    w = np.asarray(w, dtype=float).reshape(-1)
+    Z = np.zeros((len(w), len(ports), len(ports)), dtype=complex)
+    try:
+        for group in frequency_sweep_groups(circuit, w, w_resolution):
+            Z[group.indices] = group.compiled_network.port_impedance_matrix(ports, group.element_values)
+    except na.NodalAnalysisException as e:
+        raise NetworkSolutionException("Solving network failed.", floating_nodes=e.floating_nodes, contradictional_elements=e.contradictional_elements)
+    return Z
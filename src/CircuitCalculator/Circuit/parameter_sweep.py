@@ -0,0 +1,115 @@
+from .circuit import Circuit, transform_circuit
+from .transformers import transformers
+from .Components.components import Component
+from ..Network.NodalAnalysis import node_analysis as na
+from ..Network.NodalAnalysis.compiled_network import CompiledNetwork, CompiledNetworkSolution, branch_kind, branch_parameters, compile_network
+from ..Network.solution import NetworkSolutionException
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Mapping
+import numpy as np
+
+SweepValues = Mapping[str, Mapping[str, Any]]
+
+structural_parameters = {'control_nodes', 'input_nodes', 'control_branch', 'wavetype'}
+
+class StructureChangingSweep(Exception): pass
+
+def is_swept(key: str, value: Any) -> bool:
+    return key not in structural_parameters and np.ndim(value) > 0 and np.issubdtype(np.asarray(value).dtype, np.number)
+
+def swept_values(circuit: Circuit, values: SweepValues = {}) -> dict[str, dict[str, np.ndarray]]:
+    swept = {c.id: {k: np.asarray(v) for k, v in c.value.items() if is_swept(k, v)} for c in circuit.components}
+    for id, component_values in values.items():
+        if id not in swept:
+            raise KeyError(f"Component with id '{id}' not found in the circuit.")
+        swept[id].update({k: np.asarray(v) for k, v in component_values.items()})
+    return {id: component_values for id, component_values in swept.items() if component_values}
+
+def sweep_shape(swept: dict[str, dict[str, np.ndarray]]) -> tuple[int, ...]:
+    return np.broadcast_shapes(*[np.shape(v) for component_values in swept.values() for v in component_values.values()])
+
+def with_values(component: Component, values: Mapping[str, Any]) -> Component:
+    return replace(component, value={**component.value, **values})
+
+def representative_circuit(circuit: Circuit, swept: dict[str, dict[str, np.ndarray]]) -> Circuit:
+    return Circuit(
+        components=[with_values(c, {k: v.flat[0] for k, v in swept.get(c.id, {}).items()}) for c in circuit.components],
+        ground_node=circuit.ground_node
+    )
+
+def swept_branch_parameters(compiled_network: CompiledNetwork, component: Component, values: dict[str, np.ndarray], w: float, w_resolution: float, rms: bool) -> tuple[np.ndarray, np.ndarray]:
+    component_shape = np.broadcast_shapes(*[np.shape(v) for v in values.values()])
+    stacked = np.stack([np.broadcast_to(v, component_shape).reshape(-1) for v in values.values()], axis=-1)
+    unique_values, inverse = np.unique(stacked, axis=0, return_inverse=True)
+    kind = branch_kind(compiled_network.network[component.id].element)
+    parameters = []
+    for row in unique_values:
+        element = transformers[component.type](with_values(component, dict(zip(values.keys(), row))), w, w_resolution, rms).element
+        if branch_kind(element) != kind:
+            raise StructureChangingSweep(f"Swept values of component '{component.id}' change the structure of the network.")
+        parameters.append(branch_parameters(element))
+    element_values, source_values = (np.array([p[k] for p in parameters]) for k in (0, 1))
+    inverse = inverse.reshape(-1)
+    return element_values[inverse].reshape(component_shape), source_values[inverse].reshape(component_shape)
+
+@dataclass(frozen=True)
+class ParameterSweepSolution:
+    solution: CompiledNetworkSolution
+    shape: tuple[int, ...]
+    w: float = 0
+    peak_values: bool = False
+
+    def _quantity(self, quantity: Callable[[], Any]) -> np.ndarray:
+        return np.broadcast_to(quantity(), self.shape)
+
+    def get_voltage(self, component_id: str) -> np.ndarray:
+        return self._quantity(lambda: self.solution.get_voltage(component_id))
+
+    def get_current(self, component_id: str) -> np.ndarray:
+        return self._quantity(lambda: self.solution.get_current(component_id))
+
+    def get_potential(self, node_id: str) -> np.ndarray:
+        return self._quantity(lambda: self.solution.get_potential(node_id))
+
+    def get_power(self, component_id: str) -> np.ndarray:
+        power = self.get_voltage(component_id)*np.conj(self.get_current(component_id))
+        return 1/2*power if self.peak_values else power
+
+@dataclass(frozen=True)
+class DCParameterSweepSolution(ParameterSweepSolution):
+    def get_voltage(self, component_id: str) -> np.ndarray:
+        return super().get_voltage(component_id).real
+
+    def get_current(self, component_id: str) -> np.ndarray:
+        return super().get_current(component_id).real
+
+    def get_potential(self, node_id: str) -> np.ndarray:
+        return super().get_potential(node_id).real
+
+    def get_power(self, component_id: str) -> np.ndarray:
+        return self.get_voltage(component_id)*self.get_current(component_id)
+
+def parameter_sweep_solution(circuit: Circuit, values: SweepValues = {}, w: float = 0, peak_values: bool = False, w_resolution: float = 1e-3) -> ParameterSweepSolution:
+    swept = swept_values(circuit, values)
+    shape = sweep_shape(swept)
+    base_circuit = representative_circuit(circuit, swept)
+    compiled_network = compile_network(transform_circuit(base_circuit, w, w_resolution, rms=not peak_values))
+    element_values = np.array(np.broadcast_to(compiled_network.element_values, shape + compiled_network.element_values.shape))
+    source_values = np.array(np.broadcast_to(compiled_network.source_values, shape + compiled_network.source_values.shape))
+    for id, component_values in swept.items():
+        if id not in compiled_network.element_index and id not in compiled_network.source_index:
+            continue
+        element_value, source_value = swept_branch_parameters(compiled_network, base_circuit[id], component_values, w, w_resolution, not peak_values)
+        if id in compiled_network.element_index:
+            element_values[..., compiled_network.element_index[id]] = element_value
+        if id in compiled_network.source_index:
+            source_values[..., compiled_network.source_index[id]] = source_value
+    try:
+        solution = compiled_network.solve(element_values, source_values)
+    except na.NodalAnalysisException as e:
+        raise NetworkSolutionException("Solving network failed.", floating_nodes=e.floating_nodes, contradictional_elements=e.contradictional_elements)
+    return ParameterSweepSolution(solution=solution, shape=shape, w=w, peak_values=peak_values)
+
+def dc_parameter_sweep_solution(circuit: Circuit, values: SweepValues = {}) -> DCParameterSweepSolution:
+    solution = parameter_sweep_solution(circuit, values)
+    return DCParameterSweepSolution(solution=solution.solution, shape=solution.shape)
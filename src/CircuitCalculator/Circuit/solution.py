@@ -1,13 +1,18 @@
-from .circuit import Circuit, transform, frequency_components, transform_symbolic_circuit
+from .circuit import Circuit, transform, frequency_components, transform_symbolic_circuit, keep_symbolic
 from ..SignalProcessing.types import TimeDomainFunction, FrequencyDomainSeries, TimeDomainSeries
-from ..SignalProcessing.state_space_model import NumericStateSpaceModel, continuous_state_space_solver
-from ..Network.NodalAnalysis.solution import numeric_nodal_analysis_bias_point_solution, symbolic_nodal_analysis_bias_point_solution
-from .state_space_model import numeric_state_space_model_constructor, StateSpaceMatrixConstructor
+from ..SignalProcessing.state_space_model import NumericStateSpaceModel, transient_state_space_solver, discretize, fixed_time_step, propagate_states, ExponentialInput, modal_states, sparse_state_space_solver, sparsify, DescriptorStateSpaceModel, descriptor_state_space_solver, consistent_initial_state
+from ..Network.NodalAnalysis.solution import NodalAnalysisTransientSolution, numeric_nodal_analysis_bias_point_solution, symbolic_nodal_analysis_bias_point_solution, hybrid_nodal_analysis_bias_point_solution
+from ..Network.NodalAnalysis.node_analysis import descriptor_matrices
+from ..Network.NodalAnalysis.label_mapping import default_label_mappings_factory
+from ..Network.NodalAnalysis.compiled_network import CompiledNetwork, compile_network
+from .frequency_sweep import FrequencySweepPoint, frequency_sweep_solution
+from .state_space_model import numeric_state_space_model_constructor, sparse_state_space_model_constructor, StateSpaceMatrixConstructor
 from ..Network.solution import NetworkSolution, NetworkSolver
-from typing import Any
-from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
 from typing import Protocol
 import numpy as np
+import scipy.sparse
 import sympy as sp
 
 class CircuitSolution(Protocol):
@@ -92,18 +97,51 @@ class ComplexSolution(ScalarCircuitSolution):
             return 1/2*self.get_voltage(component_id)*np.conj(self.get_current(component_id))
         return self.get_voltage(component_id)*np.conj(self.get_current(component_id))
 
+Simplification = Callable[[Any], Any]
+
+def full_simplification(expression: Any) -> Any:
+    return sp.sympify(expression).simplify().nsimplify()
+
+def cancel_simplification(expression: Any) -> Any:
+    return sp.cancel(sp.nsimplify(expression))
+
+def together_simplification(expression: Any) -> Any:
+    return sp.together(sp.nsimplify(expression))
+
+def factor_simplification(expression: Any) -> Any:
+    return sp.factor(sp.nsimplify(expression))
+
+def no_simplification(expression: Any) -> Any:
+    return sp.sympify(expression)
+
+def bounded_simplification(max_operations: int, simplification: Simplification = full_simplification, fallback: Simplification = cancel_simplification) -> Simplification:
+    def simplify(expression: Any) -> Any:
+        if sp.count_ops(expression) > max_operations:
+            return fallback(expression)
+        return simplification(expression)
+    return simplify
+
+@dataclass(frozen=True)
 class SymbolicSolution(ScalarCircuitSolution):
+    simplification: Simplification = full_simplification
+    _cache: dict[tuple[str, str], Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def _simplified(self, quantity: str, id: str, expression: Callable[[], Any]) -> Any:
+        if (quantity, id) not in self._cache:
+            self._cache[(quantity, id)] = self.simplification(expression())
+        return self._cache[(quantity, id)]
+
     def get_voltage(self, component_id: str) -> Any:
-        return self.solution.get_voltage(component_id).simplify().nsimplify()
+        return self._simplified('voltage', component_id, lambda: self.solution.get_voltage(component_id))
 
     def get_current(self, component_id: str) -> Any:
-        return self.solution.get_current(component_id).simplify().nsimplify()
+        return self._simplified('current', component_id, lambda: self.solution.get_current(component_id))
 
     def get_potential(self, node_id: str) -> Any:
-        return self.solution.get_potential(node_id).simplify().nsimplify()
+        return self._simplified('potential', node_id, lambda: self.solution.get_potential(node_id))
 
     def get_power(self, component_id: str) -> Any:
-        return (self.get_voltage(component_id)*self.get_current(component_id)).simplify().nsimplify()
+        return self._simplified('power', component_id, lambda: self.get_voltage(component_id)*self.get_current(component_id))
 
 @dataclass(frozen=True)
 class TimeDomainSolution(VectorCircuitSolution):
@@ -170,6 +208,90 @@ class TransientSolution:
     def get_power(self, component_id: str) -> TimeDomainSeries:
         return self.t, self.get_voltage(component_id)[1]*self.get_current(component_id)[1]
 
+    def _outputs(self, potential_nodes: list[str] = [], voltage_ids: list[str] = [], current_ids: list[str] = []) -> tuple[np.ndarray, np.ndarray]:
+        C, D = self.ssm.c_d_matrices(potential_nodes, voltage_ids, current_ids)
+        return self.t, np.reshape(C@self.x + D@self.u, (-1, len(self.t)))
+
+    def get_potentials(self, node_ids: list[str] | None = None) -> tuple[np.ndarray, np.ndarray]:
+        return self._outputs(potential_nodes=self.ssm.potential_nodes if node_ids is None else node_ids)
+
+    def get_voltages(self, component_ids: list[str] | None = None) -> tuple[np.ndarray, np.ndarray]:
+        return self._outputs(voltage_ids=self.ssm.component_ids if component_ids is None else component_ids)
+
+    def get_currents(self, component_ids: list[str] | None = None) -> tuple[np.ndarray, np.ndarray]:
+        return self._outputs(current_ids=self.ssm.component_ids if component_ids is None else component_ids)
+
+@dataclass(frozen=True)
+class DescriptorTransientSolution:
+    t: np.ndarray
+    solution: NodalAnalysisTransientSolution
+
+    def get_voltage(self, component_id: str) -> TimeDomainSeries:
+        return self.t, self.solution.get_voltage(component_id)
+
+    def get_current(self, component_id: str) -> TimeDomainSeries:
+        return self.t, self.solution.get_current(component_id)
+
+    def get_potential(self, node_id: str) -> TimeDomainSeries:
+        return self.t, self.solution.get_potential(node_id)
+
+    def get_power(self, component_id: str) -> TimeDomainSeries:
+        return self.t, self.get_voltage(component_id)[1]*self.get_current(component_id)[1]
+
+@dataclass(frozen=True)
+class EnsembleTransientSolution:
+    t: np.ndarray
+    ssm: StateSpaceMatrixConstructor
+    u: np.ndarray
+    x: np.ndarray
+
+    def _output(self, c: Any, d: Any) -> np.ndarray:
+        return (self.x @ np.asarray(c).T + self.u @ np.asarray(d).T)[..., 0]
+
+    def get_voltage(self, component_id: str) -> tuple[np.ndarray, np.ndarray]:
+        return self.t, self._output(*self.ssm.c_d_row_for_voltage(component_id))
+
+    def get_current(self, component_id: str) -> tuple[np.ndarray, np.ndarray]:
+        return self.t, self._output(*self.ssm.c_d_row_for_current(component_id))
+
+    def get_potential(self, node_id: str) -> tuple[np.ndarray, np.ndarray]:
+        return self.t, self._output(*self.ssm.c_d_row_for_potential(node_id))
+
+    def get_power(self, component_id: str) -> tuple[np.ndarray, np.ndarray]:
+        return self.t, self.get_voltage(component_id)[1]*self.get_current(component_id)[1]
+
+@dataclass(frozen=True)
+class TransientState:
+    t: float
+    dt: float
+    x: np.ndarray
+    u: np.ndarray
+
+@dataclass(frozen=True)
+class TransientBlock:
+    t: np.ndarray
+    y: np.ndarray
+    rows: dict[tuple[str, str], int]
+    state: TransientState
+
+    def _output(self, quantity: str, id: str) -> TimeDomainSeries:
+        try:
+            return self.t, self.y[self.rows[(quantity, id)]]
+        except KeyError as e:
+            raise KeyError(f'{quantity.capitalize()} of "{id}" was not selected as output.') from e
+
+    def get_voltage(self, component_id: str) -> TimeDomainSeries:
+        return self._output('voltage', component_id)
+
+    def get_current(self, component_id: str) -> TimeDomainSeries:
+        return self._output('current', component_id)
+
+    def get_potential(self, node_id: str) -> TimeDomainSeries:
+        return self._output('potential', node_id)
+
+    def get_power(self, component_id: str) -> TimeDomainSeries:
+        return self.t, self.get_voltage(component_id)[1]*self.get_current(component_id)[1]
+
 def dc_solution(circuit: Circuit, solver: NetworkSolver = numeric_nodal_analysis_bias_point_solution) -> DCSolution:
     network = transform(circuit, w=[0])[0]
     solution = solver(network)
@@ -180,19 +302,34 @@ def complex_solution(circuit: Circuit, w: float = 0, peak_values: bool = False,
     solution = solver(network)
     return ComplexSolution(solution=solution, w=w, peak_values=peak_values)
 
-def symbolic_solution(circuit: Circuit, s: sp.core.symbol.Symbol = sp.Symbol('s', complex=True), solver: NetworkSolver = symbolic_nodal_analysis_bias_point_solution) -> SymbolicSolution:
+def compiled_circuit(circuit: Circuit, w: float = 0, peak_values: bool = False) -> CompiledNetwork:
+    return compile_network(transform(circuit, w=[w], rms=not peak_values)[0])
+
+def symbolic_solution(circuit: Circuit, s: sp.core.symbol.Symbol = sp.Symbol('s', complex=True), solver: NetworkSolver = symbolic_nodal_analysis_bias_point_solution, simplification: Simplification = full_simplification) -> SymbolicSolution:
     network = transform_symbolic_circuit(circuit, s=s)
     solution = solver(network)
-    return SymbolicSolution(solution=solution)
+    return SymbolicSolution(solution=solution, simplification=simplification)
+
+def hybrid_solution(circuit: Circuit, keep: Iterable[str] = ('s',), values: Mapping[str, complex | float] = {}, s: sp.core.symbol.Symbol = sp.Symbol('s', complex=True)) -> SymbolicSolution:
+    keep = set(keep)
+    network = transform_symbolic_circuit(keep_symbolic(circuit, keep - {s.name}), s=s)
+    solution = hybrid_nodal_analysis_bias_point_solution(network, values={name: value for name, value in values.items() if name not in keep})
+    return SymbolicSolution(solution=solution, simplification=no_simplification)
+
+def complex_solutions(circuit: Circuit, w: list[float], peak_values: bool = False, solver: NetworkSolver = numeric_nodal_analysis_bias_point_solution) -> list[ComplexSolution]:
+    if solver is not numeric_nodal_analysis_bias_point_solution:
+        return [complex_solution(circuit, w=w_, peak_values=peak_values, solver=solver) for w_ in w]
+    sweep = frequency_sweep_solution(circuit, np.array(w), peak_values=peak_values)
+    return [ComplexSolution(solution=FrequencySweepPoint(sweep, k), w=w_, peak_values=peak_values) for k, w_ in enumerate(w)]
 
 def time_domain_solution(circuit: Circuit, w_max: float = 0, solver: NetworkSolver = numeric_nodal_analysis_bias_point_solution) -> TimeDomainSolution:
     w = frequency_components(circuit, w_max)
-    solutions = [complex_solution(circuit, w=w_, peak_values=True, solver=solver) for w_ in w]
+    solutions = complex_solutions(circuit, w, peak_values=True, solver=solver)
     return TimeDomainSolution(solutions=solutions, w=w)
 
 def frequency_domain_solution(circuit: Circuit, w_max: float = 0, solver: NetworkSolver = numeric_nodal_analysis_bias_point_solution) -> FrequencyDomainSolution:
     w = np.array(frequency_components(circuit, w_max))
-    solutions = [complex_solution(circuit, w=w_, peak_values=False, solver=solver) for w_ in w]
+    solutions = complex_solutions(circuit, list(w), peak_values=False, solver=solver)
     return FrequencyDomainSolution(solutions=solutions, w=w)
 
 def transient_solution(circuit: Circuit, tin: np.ndarray = np.zeros(0), input: dict[str, TimeDomainFunction] = {'': lambda t: np.zeros(0)}) -> TransientSolution:
@@ -203,7 +340,7 @@ def transient_solution(circuit: Circuit, tin: np.ndarray = np.zeros(0), input: d
             raise KeyError(f'Input element with id "{input_id}" not defined.') from e
     ssm = numeric_state_space_model_constructor(circuit)
     u = np.array([_input_fcn(input_id)(tin) for input_id in ssm.sources])
-    tout, x, _ = continuous_state_space_solver(
+    tout, x, _ = transient_state_space_solver(
         NumericStateSpaceModel(A=ssm.A, B=ssm.B, C=np.eye(ssm.A.shape[0]), D=np.zeros((ssm.A.shape[0], ssm.B.shape[1]))),
         u.T,
         tin,
@@ -211,5 +348,101 @@ def transient_solution(circuit: Circuit, tin: np.ndarray = np.zeros(0), input: d
     )
     x = np.reshape(x, (x.shape[0], ssm.A.shape[0])).T
     return TransientSolution(t=tout, ssm=ssm, u=u, x=x)
-        
-        
\ No newline at end of file
+
+def descriptor_transient_solution(circuit: Circuit, tin: np.ndarray, input: dict[str, TimeDomainFunction], method: str = 'trapezoidal') -> DescriptorTransientSolution:
+    network = transform(circuit, w=[0])[0]
+    c_values = {C.id : float(C.value['C']) for C in circuit.components if C.type == 'capacitor'}
+    l_values = {L.id : float(L.value['L']) for L in circuit.components if L.type == 'inductance'}
+    label_mappings = default_label_mappings_factory(network)
+    E, A, B, DQ = (scipy.sparse.csr_matrix(M).real for M in descriptor_matrices(network, c_values, l_values, label_mappings_factory=lambda _: label_mappings))
+    sources = [source for source in label_mappings.source_and_inductance_mapping if source not in l_values]
+    t = np.asarray(tin, dtype=float)
+    try:
+        u = np.array([np.broadcast_to(input[source](t), t.shape) for source in sources], dtype=float).reshape(len(sources), len(t))
+    except KeyError as e:
+        raise KeyError(f'Input element with id "{e.args[0]}" not defined.') from e
+    model = DescriptorStateSpaceModel(E=E, A=A, B=B)
+    x0, j0 = consistent_initial_state(model, u[:, 0], DQ) if len(t) else (np.zeros(E.shape[0]), np.zeros(DQ.shape[1]))
+    _, x, xdot = descriptor_state_space_solver(model, u.T, t, x0, method=method)
+    state_derivatives = np.asarray(DQ.T @ xdot.T)
+    if len(t):
+        state_derivatives[:, 0] = j0/np.array([-C for C in c_values.values()] + list(l_values.values()))
+    solution = NodalAnalysisTransientSolution(
+        network=network,
+        solution_vector=x.T,
+        label_mappings_factory=lambda _: label_mappings,
+        inputs={source: u[k] for k, source in enumerate(sources)},
+        capacitor_currents={id: C*state_derivatives[k] for k, (id, C) in enumerate(c_values.items())}
+    )
+    return DescriptorTransientSolution(t=t, solution=solution)
+
+def sparse_transient_solution(circuit: Circuit, tin: np.ndarray, input: dict[str, TimeDomainFunction], method: str = 'trapezoidal') -> TransientSolution:
+    ssm = sparse_state_space_model_constructor(circuit)
+    try:
+        u = np.array([input[input_id](tin) for input_id in ssm.sources]).reshape(len(ssm.sources), len(tin))
+    except KeyError as e:
+        raise KeyError(f'Input element with id "{e.args[0]}" not defined.') from e
+    n = ssm.A.shape[0]
+    model = NumericStateSpaceModel(A=sparsify(ssm.A), B=sparsify(ssm.B), C=scipy.sparse.identity(n, format='csr'), D=scipy.sparse.csr_matrix((n, len(ssm.sources)))) # type: ignore
+    tout, _, x = sparse_state_space_solver(model, u.T, tin, np.zeros(n), method=method)
+    return TransientSolution(t=tout, ssm=ssm, u=u, x=x.T)
+
+def modal_transient_solution(circuit: Circuit, tin: np.ndarray, input: Mapping[str, list[ExponentialInput]]) -> TransientSolution:
+    ssm = numeric_state_space_model_constructor(circuit)
+    try:
+        terms = [input[input_id] for input_id in ssm.sources]
+    except KeyError as e:
+        raise KeyError(f'Input element with id "{e.args[0]}" not defined.') from e
+    t = np.asarray(tin, dtype=float)
+    u = np.array([sum((term(t) for term in source_terms), np.zeros(len(t))) for source_terms in terms]).reshape(len(terms), len(t))
+    x = modal_states(np.asarray(ssm.A), np.asarray(ssm.B), terms, t, np.zeros(len(ssm.A)))
+    return TransientSolution(t=t, ssm=ssm, u=u, x=x.T)
+
+def ensemble_transient_solution(circuit: Circuit, tin: np.ndarray, u: np.ndarray, sources: list[str] | None = None, hold: str = 'foh') -> EnsembleTransientSolution:
+    ssm = numeric_state_space_model_constructor(circuit)
+    u = np.asarray(u)
+    if u.ndim != 3 or u.shape[1] != len(tin):
+        raise ValueError(f'Input must have shape (scenarios, {len(tin)}, sources), got {u.shape}.')
+    sources = ssm.sources if sources is None else sources
+    if sorted(sources) != sorted(ssm.sources) or u.shape[2] != len(sources):
+        raise KeyError(f'Input sources {sources} do not match circuit sources {ssm.sources}.')
+    u = u[:, :, [sources.index(source) for source in ssm.sources]]
+    model = discretize(NumericStateSpaceModel(A=np.asarray(ssm.A), B=np.asarray(ssm.B), C=np.eye(len(ssm.A)), D=np.zeros((len(ssm.A), len(ssm.sources)))), fixed_time_step(np.asarray(tin, dtype=float)), hold)
+    x = propagate_states(model, np.moveaxis(u, 1, 0), np.zeros(model.n_states))
+    return EnsembleTransientSolution(t=np.asarray(tin), ssm=ssm, u=u, x=np.moveaxis(x, 0, 1))
+
+TransientInput = TimeDomainFunction | Iterator[np.ndarray]
+
+def transient_stream(circuit: Circuit, dt: float, n_samples: int, input: Mapping[str, TransientInput], potential_nodes: list[str] = [], voltage_ids: list[str] = [], current_ids: list[str] = [], chunk_size: int = 65536, state: TransientState | None = None, hold: str = 'foh') -> Iterator[TransientBlock]:
+    def _input(input_id: str) -> TransientInput:
+        try:
+            return input[input_id]
+        except KeyError as e:
+            raise KeyError(f'Input element with id "{input_id}" not defined.') from e
+    def _input_chunk(input_id: str, source: TransientInput, t: np.ndarray) -> np.ndarray:
+        if callable(source):
+            return np.broadcast_to(source(t), t.shape)
+        try:
+            values = np.asarray(next(source))
+        except StopIteration as e:
+            raise ValueError(f'Input of "{input_id}" is exhausted at t={t[0]}.') from e
+        if values.shape != t.shape:
+            raise ValueError(f'Input chunk has shape {values.shape}, expected {t.shape}.')
+        return values
+    if state is not None and not np.isclose(state.dt, dt, rtol=1e-9, atol=0):
+        raise ValueError(f'Time step {dt} does not match time step {state.dt} of the resumed state.')
+    ssm = numeric_state_space_model_constructor(circuit)
+    sources = {input_id: _input(input_id) for input_id in ssm.sources}
+    C, D = ssm.c_d_matrices(potential_nodes, voltage_ids, current_ids)
+    rows = {key: k for k, key in enumerate([('potential', id) for id in potential_nodes] + [('voltage', id) for id in voltage_ids] + [('current', id) for id in current_ids])}
+    model = discretize(NumericStateSpaceModel(A=np.asarray(ssm.A), B=np.asarray(ssm.B), C=np.asarray(C), D=np.asarray(D)), dt, hold)
+    t0 = 0.0 if state is None else state.t + dt
+    for start in range(0, n_samples, chunk_size):
+        t = t0 + dt*np.arange(start, min(start + chunk_size, n_samples))
+        u = np.array([_input_chunk(input_id, source, t) for input_id, source in sources.items()]).reshape(len(sources), len(t)).T
+        if state is None:
+            x = propagate_states(model, u, np.zeros(model.n_states))
+        else:
+            x = propagate_states(model, np.vstack((state.u, u)), state.x)[1:]
+        state = TransientState(t=float(t[-1]), dt=dt, x=x[-1], u=u[-1:])
+        yield TransientBlock(t=t, y=(x @ model.C.T + u @ model.D.T).T, rows=rows, state=state)
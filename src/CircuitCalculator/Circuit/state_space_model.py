@@ -26,6 +26,17 @@ class StateSpaceMatrixConstructor:
     def D(self, potential_nodes: list[str], voltage_ids: list[str], current_ids: list[str]) -> Any:
         return self._state_space_model.extend_D_matrix(potential_nodes, voltage_ids, current_ids)
 
+    def c_d_matrices(self, potential_nodes: list[str] = [], voltage_ids: list[str] = [], current_ids: list[str] = []) -> tuple[Any, Any]:
+        return self._state_space_model.output_matrices(potential_nodes, voltage_ids, current_ids)
+
+    @property
+    def potential_nodes(self) -> list[str]:
+        return self._state_space_model.potential_nodes
+
+    @property
+    def component_ids(self) -> list[str]:
+        return self._state_space_model.branch_ids
+
     def c_d_row_for_potential(self, node_id: str) -> tuple[Any, Any]:
         return self._state_space_model.c_row_for_potential(node_id), self._state_space_model.d_row_for_potential(node_id)
 
@@ -48,13 +59,23 @@ def numeric_state_space_model_constructor(circuit) -> StateSpaceMatrixConstructo
     )
     return StateSpaceMatrixConstructor(state_space_model)
 
+def sparse_state_space_model_constructor(circuit) -> StateSpaceMatrixConstructor:
+    network = cc.transform_circuit(circuit, w=0)
+    state_space_model = ssm.sparse_state_space_model(
+        network=network,
+        c_values={C.id : float(C.value['C']) for C in [c for c in circuit.components if c.type == 'capacitor']},
+        l_values={L.id : float(L.value['L']) for L in [c for c in circuit.components if c.type == 'inductance']}
+    )
+    return StateSpaceMatrixConstructor(state_space_model)
+
 def numeric_state_space_model(circuit: cc.Circuit, potential_nodes: list[str] = [], voltage_ids: list[str] = [], current_ids: list[str] = []) -> NumericStateSpaceModel:
     state_space_model = numeric_state_space_model_constructor(circuit)
+    C, D = state_space_model.c_d_matrices(potential_nodes, voltage_ids, current_ids)
     return NumericStateSpaceModel(
         A=np.array(state_space_model.A),
         B=np.array(state_space_model.B),
-        C=np.array(state_space_model.C(potential_nodes, voltage_ids, current_ids)),
-        D=np.array(state_space_model.D(potential_nodes, voltage_ids, current_ids))
+        C=np.array(C),
+        D=np.array(D)
     )
 
 def symbolic_state_space_model_constructor(circuit) -> StateSpaceMatrixConstructor:
@@ -73,9 +94,10 @@ def symbolic_state_space_model_constructor(circuit) -> StateSpaceMatrixConstruct
 
 def symbolic_state_space_model(circuit: cc.Circuit, potential_nodes: list[str] = [], voltage_ids: list[str] = [], current_ids: list[str] = []) -> SymbolicStateSpaceModel:
     state_space_model = symbolic_state_space_model_constructor(circuit)
+    C, D = state_space_model.c_d_matrices(potential_nodes, voltage_ids, current_ids)
     return SymbolicStateSpaceModel(
         A=state_space_model.A,
         B=state_space_model.B,
-        C=state_space_model.C(potential_nodes, voltage_ids, current_ids),
-        D=state_space_model.D(potential_nodes, voltage_ids, current_ids)
+        C=C,
+        D=D
     )
\ No newline at end of file
@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable
+import numpy as np
+import sympy as sp
+
+FREQUENCY_SYMBOL = 's'
+
+def argument_order(symbols: set[sp.Symbol]) -> tuple[sp.Symbol, ...]:
+    return tuple(sorted(symbols, key=lambda symbol: (symbol.name != FREQUENCY_SYMBOL, symbol.name, sp.srepr(symbol))))
+
+@dataclass(frozen=True)
+class CompiledExpression:
+    arguments: tuple[str, ...]
+    shape: tuple[int, ...]
+    function: Callable[..., Any]
+
+    def _arguments(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> list[Any]:
+        if len(args) > len(self.arguments):
+            raise TypeError(f"Expected at most {len(self.arguments)} positional arguments, got {len(args)}.")
+        values = dict(zip(self.arguments, args))
+        for name, value in kwargs.items():
+            if name not in self.arguments:
+                raise TypeError(f"Unexpected argument '{name}', expected {list(self.arguments)}.")
+            if name in values:
+                raise TypeError(f"Argument '{name}' given twice.")
+            values[name] = value
+        missing = [name for name in self.arguments if name not in values]
+        if missing:
+            raise TypeError(f"Missing arguments {missing}.")
+        return [np.asarray(values[name]) for name in self.arguments]
+
+    def __call__(self, *args: Any, **kwargs: Any) -> np.ndarray:
+        arguments = self._arguments(args, kwargs)
+        batch_shape = np.broadcast_shapes(*[np.shape(a) for a in arguments])
+        values = np.broadcast_arrays(*self.function(*arguments), np.empty(batch_shape))[:-1]
+        result = np.stack(values, axis=-1) if values else np.zeros(batch_shape + (0,))
+        return result.reshape(batch_shape + self.shape)
+
+@lru_cache(maxsize=256)
+def _compile(entries: tuple[sp.Expr, ...], shape: tuple[int, ...], arguments: tuple[sp.Symbol, ...]) -> CompiledExpression:
+    function = sp.lambdify(arguments, list(entries), modules='numpy', cse=True)
+    return CompiledExpression(arguments=tuple(a.name for a in arguments), shape=shape, function=function)
+
+def compile_expression(expression: Any, arguments: tuple[sp.Symbol, ...] | None = None) -> CompiledExpression:
+    if isinstance(expression, sp.MatrixBase):
+        entries, shape = tuple(sp.sympify(e) for e in expression), tuple(expression.shape)
+    else:
+        entries, shape = (sp.sympify(expression),), ()
+    if arguments is None:
+        arguments = argument_order(set().union(*[e.free_symbols for e in entries]))
+    return _compile(entries, shape, tuple(arguments))
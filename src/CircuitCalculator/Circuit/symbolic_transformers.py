@@ -166,20 +166,24 @@ def short_circuit(short_circuit: cp.Component, _: sp.Symbol) -> ntw.Branch:
         elm.short_circuit(short_circuit.id)
     )
 
-transformers : dict[str, CircuitComponentTranslator] = {
-    'resistor' : resistor,
-    'impedance' : impedance,
-    'capacitor' : capacitor,
-    'inductance' : inductance,
-    'voltage_source' : voltage_source,
-    'current_source' : current_source,
-    'voltage_controlled_current_source' : voltage_controlled_current_source,
-    'current_controlled_current_source' : current_controlled_current_source,
-    'voltage_controlled_voltage_source' : voltage_controlled_voltage_source,
-    'operational_amplifier' : operational_amplifier,
-    'current_controlled_voltage_source' : current_controlled_voltage_source,
-    'open_circuit' : open_circuit,
-    'short_circuit' : short_circuit,
-    'dc_voltage_source' : voltage_source,
-    'dc_current_source' : current_source
+translators : dict[str, tuple[CircuitComponentTranslator, str | None]] = {
+    'resistor' : (resistor, 'R'),
+    'impedance' : (impedance, 'Z'),
+    'capacitor' : (capacitor, 'C'),
+    'inductance' : (inductance, 'L'),
+    'voltage_source' : (voltage_source, 'V'),
+    'current_source' : (current_source, 'I'),
+    'voltage_controlled_current_source' : (voltage_controlled_current_source, 'G'),
+    'current_controlled_current_source' : (current_controlled_current_source, 'current_gain'),
+    'voltage_controlled_voltage_source' : (voltage_controlled_voltage_source, 'voltage_gain'),
+    'operational_amplifier' : (operational_amplifier, 'gain'),
+    'current_controlled_voltage_source' : (current_controlled_voltage_source, 'transresistance'),
+    'open_circuit' : (open_circuit, None),
+    'short_circuit' : (short_circuit, None),
+    'dc_voltage_source' : (voltage_source, 'V'),
+    'dc_current_source' : (current_source, 'I')
 }
+
+transformers : dict[str, CircuitComponentTranslator] = {type: translator for type, (translator, _) in translators.items()}
+
+parameters : dict[str, str] = {type: parameter for type, (_, parameter) in translators.items() if parameter is not None}
@@ -1,8 +1,14 @@
 from dataclasses import dataclass
 
+import numpy as np
+
 from .circuit import Circuit, transform_circuit
+from .frequency_sweep import frequency_sweep_groups
 from ..Network.NodalAnalysis import network_analysis as na
 from ..Network.NodalAnalysis import node_analysis
+from ..Network.NodalAnalysis.compiled_network import Port
+from ..Network.diagnostics import short_circuited_ports
+from ..Network.solution import NetworkSolutionException
 
 
 @dataclass(frozen=True)
@@ -32,6 +38,48 @@ class EquivalentSourceParameters:
 
     from_norten_parameters = from_norton_parameters
 
+    def __getitem__(self, index) -> "EquivalentSourceParameters":
+        return EquivalentSourceParameters(
+            open_circuit_voltage=self.open_circuit_voltage[index],
+            short_circuit_current=self.short_circuit_current[index],
+            impedance=self.impedance[index],
+            admittance=self.admittance[index]
+        )
+
+
+def thevenin_equivalents(
+    circuit: Circuit,
+    terminals: list[Port],
+    w: np.ndarray = np.array([0]),
+    *,
+    w_resolution: float = 1e-3,
+    rms: bool = True
+) -> tuple[np.ndarray, np.ndarray]:
+    w = np.asarray(w, dtype=float).reshape(-1)
+    U0 = np.zeros((len(w), len(terminals)), dtype=complex)
+    Z = np.zeros((len(w), len(terminals)), dtype=complex)
+    for group in frequency_sweep_groups(circuit, w, w_resolution, rms):
+        try:
+            node_analysis.check_network_topology(group.compiled_network.network)
+            U0[group.indices], Z[group.indices] = group.compiled_network.thevenin_equivalents(terminals, group.element_values)
+        except node_analysis.NodalAnalysisException as e:
+            raise NetworkSolutionException("Solving network failed.", floating_nodes=e.floating_nodes, contradictional_elements=e.contradictional_elements)
+        Z[np.ix_(group.indices, short_circuited_ports(group.compiled_network.network, terminals))] = 0
+    return U0, Z
+
+
+def equivalent_source_parameters(
+    circuit: Circuit,
+    terminals: list[Port],
+    w: np.ndarray = np.array([0]),
+    *,
+    w_resolution: float = 1e-3,
+    rms: bool = True
+) -> EquivalentSourceParameters:
+    U0, Z = thevenin_equivalents(circuit, terminals, w, w_resolution=w_resolution, rms=rms)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return EquivalentSourceParameters.from_thevenin_parameters(U0, Z)
+
 
 def open_circuit_voltage(
     circuit: Circuit,
@@ -54,7 +102,7 @@ def short_circuit_current(
     w_resolution: float = 1e-3,
     rms: bool = True
 ) -> complex:
-    return na.short_circuit_current(transform_circuit(circuit, w, w_resolution=w_resolution, rms=rms), node1, node2)
+    return norten_parameters(circuit, node1, node2, w, w_resolution=w_resolution, rms=rms).short_circuit_current
 
 
 def thevenin_parameters(
@@ -66,10 +114,8 @@ def thevenin_parameters(
     w_resolution: float = 1e-3,
     rms: bool = True
 ) -> EquivalentSourceParameters:
-    network = transform_circuit(circuit, w, w_resolution=w_resolution, rms=rms)
-    U0 = na.open_circuit_voltage(network, node1, node2)
-    Z = node_analysis.open_circuit_impedance(network, node1, node2)
-    return EquivalentSourceParameters.from_thevenin_parameters(U0, Z)
+    U0, Z = thevenin_equivalents(circuit, [(node1, node2)], np.array([w]), w_resolution=w_resolution, rms=rms)
+    return EquivalentSourceParameters.from_thevenin_parameters(U0[0, 0], Z[0, 0])
 
 
 def norten_parameters(
@@ -81,10 +127,8 @@ def norten_parameters(
     w_resolution: float = 1e-3,
     rms: bool = True
 ) -> EquivalentSourceParameters:
-    network = transform_circuit(circuit, w, w_resolution=w_resolution, rms=rms)
-    IK = na.short_circuit_current(network, node1, node2)
-    Z = node_analysis.open_circuit_impedance(network, node1, node2)
-    return EquivalentSourceParameters.from_norton_parameters(IK, 1/Z)
+    U0, Z = thevenin_equivalents(circuit, [(node1, node2)], np.array([w]), w_resolution=w_resolution, rms=rms)
+    return EquivalentSourceParameters.from_norton_parameters(U0[0, 0]/Z[0, 0], 1/Z[0, 0])
 
 
 norton_parameters = norten_parameters
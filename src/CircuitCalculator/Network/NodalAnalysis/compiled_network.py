@@ -0,0 +1,403 @@
+import numpy as np
+import scipy.sparse
+import sympy as sp
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Mapping
+from ..diagnostics import short_circuited_ports
+from ..network import Branch, Network
+from ..norten_thevenin_elements import NortenElement
+from . import matrix_operations as mo
+from .label_mapping import LabelMappingsFactory, NetworkLabelMappings, default_label_mappings_factory
+from .node_analysis import nodal_analysis_exception, port_injection_matrix
+from .node_analysis_calculations import MatrixStamps, is_norten_thevenin_element, nodal_analysis_stamps
+
+DENSE_BATCH_SIZE = 256
+DENSE_BATCH_ELEMENTS = 2**22
+
+Port = tuple[str, str]
+
+def control_attribute(element: Any) -> str:
+    if element.is_voltage_controlled_current_source:
+        return 'transconductance'
+    if element.is_current_controlled_current_source:
+        return 'current_gain'
+    if element.is_voltage_controlled_voltage_source:
+        return 'voltage_gain'
+    return 'transresistance'
+
+def control_factor(element: Any) -> complex:
+    return getattr(element, control_attribute(element))
+
+def is_source_element(element: Any) -> bool:
+    return element.is_current_source or element.type in ('voltage_source', 'current_source')
+
+def branch_parameters(element: Any) -> tuple[complex | None, complex | None]:
+    if element.is_controlled_source:
+        return complex(control_factor(element)), None
+    if element.is_ideal_voltage_source:
+        return None, complex(element.V)
+    if not is_norten_thevenin_element(element):
+        return None, None
+    if not is_source_element(element):
+        return complex(element.Y), None
+    return complex(element.Y), complex(element.V if isinstance(element, NortenElement) else element.I)
+
+def branch_kind(element: Any) -> tuple[bool, ...]:
+    element_value, source_value = branch_parameters(element)
+    return (
+        element.is_controlled_source,
+        element_value is not None,
+        source_value is not None,
+        source_value is not None and element.is_ideal_current_source,
+        isinstance(element, NortenElement)
+    )
+
+@dataclass(frozen=True)
+class ParametrizedElement:
+    element: Any
+    attributes: Mapping[str, Any]
+
+    def __getattr__(self, attribute: str) -> Any:
+        if attribute in ('element', 'attributes'):
+            raise AttributeError(attribute)
+        if attribute in self.attributes:
+            return self.attributes[attribute]
+        return getattr(self.element, attribute)
+
+def parametrized_branch(branch: Branch, element_value: sp.Symbol | None, source_value: sp.Symbol | None) -> Branch:
+    element = branch.element
+    attributes: dict[str, Any] = {}
+    if element.is_controlled_source:
+        attributes[control_attribute(element)] = element_value
+    elif element_value is None and source_value is not None:
+        attributes['V'] = source_value
+    elif element_value is not None:
+        attributes.update(Y=element_value, Z=1/element_value, is_ideal_current_source=False)
+        if source_value is not None and isinstance(element, NortenElement):
+            attributes.update(V=source_value, I=source_value*element_value, is_current_source=True)
+        elif source_value is not None:
+            attributes.update(V=source_value/element_value, I=source_value, is_current_source=True)
+    return Branch(branch.node1, branch.node2, ParametrizedElement(element, attributes))
+
+def monomial_factors(term: Any, parameters: Mapping[sp.Symbol, int]) -> tuple[complex, list[int]]:
+    coefficient, factors = complex(1), []
+    for factor in sp.Mul.make_args(term):
+        if factor.is_number:
+            coefficient *= int(factor) if factor.is_Integer else complex(factor)
+            continue
+        parameter, exponent = factor.as_base_exp()
+        if parameter not in parameters or not exponent.is_Integer or exponent < 1:
+            raise ValueError(f"Stamp term {term} is not a monomial in the network parameters.")
+        factors.extend([parameters[parameter]]*int(exponent))
+    return coefficient, factors
+
+@dataclass(frozen=True)
+class StampPattern:
+    shape: tuple[int, int]
+    rows: np.ndarray
+    columns: np.ndarray
+    coefficients: np.ndarray
+    factors: np.ndarray
+    has_factor: np.ndarray
+
+    @classmethod
+    def from_stamps(cls, stamps: MatrixStamps, parameters: Mapping[sp.Symbol, int]) -> "StampPattern":
+        rows: list[int] = []
+        columns: list[int] = []
+        coefficients: list[complex] = []
+        factors: list[list[int]] = []
+        for row, column, value in zip(stamps.rows, stamps.columns, stamps.values):
+            value = sp.sympify(value)
+            for term in sp.Add.make_args(sp.expand(value) if value.has(sp.Add) else value):
+                coefficient, term_factors = monomial_factors(term, parameters)
+                if coefficient == 0:
+                    continue
+                rows.append(row)
+                columns.append(column)
+                coefficients.append(coefficient)
+                factors.append(term_factors)
+        width = max([len(f) for f in factors], default=0)
+        factor_array = np.zeros((len(factors), width), dtype=int)
+        has_factor = np.zeros((len(factors), width), dtype=bool)
+        for k, f in enumerate(factors):
+            factor_array[k, :len(f)] = f
+            has_factor[k, :len(f)] = True
+        return cls(stamps.shape, np.array(rows, dtype=int), np.array(columns, dtype=int), np.array(coefficients, dtype=complex), factor_array, has_factor)
+
+    def values(self, parameters: np.ndarray) -> np.ndarray:
+        return self.coefficients*np.prod(np.where(self.has_factor, parameters[..., self.factors], 1), axis=-1)
+
+    @cached_property
+    def _slots(self) -> tuple[np.ndarray, np.ndarray]:
+        keys, slots = np.unique(self.columns*self.shape[0] + self.rows, return_inverse=True)
+        return keys, slots.reshape(-1)
+
+    @cached_property
+    def _scatter(self) -> scipy.sparse.csr_matrix:
+        keys, slots = self._slots
+        return scipy.sparse.csr_matrix(
+            (np.ones(len(slots)), (slots, np.arange(len(slots)))),
+            shape=(len(keys), len(slots))
+        )
+
+    @cached_property
+    def _csc_structure(self) -> tuple[np.ndarray, np.ndarray]:
+        keys, _ = self._slots
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(keys // self.shape[0], minlength=self.shape[1]))))
+        return keys % self.shape[0], indptr
+
+    @cached_property
+    def factor_stamps(self) -> dict[int, np.ndarray]:
+        stamps, positions = np.nonzero(self.has_factor)
+        pairs = np.unique(np.stack((self.factors[stamps, positions], stamps), axis=-1).reshape(-1, 2), axis=0)
+        factors, first = np.unique(pairs[:, 0], return_index=True)
+        return {int(factor): k for factor, k in zip(factors, np.split(pairs[:, 1], first[1:]))}
+
+    def stamp_values(self, parameters: np.ndarray, stamps: np.ndarray) -> np.ndarray:
+        return self.coefficients[stamps]*np.prod(np.where(self.has_factor[stamps], parameters[self.factors[stamps]], 1), axis=-1)
+
+    def data(self, parameters: np.ndarray) -> np.ndarray:
+        values = self.values(parameters)
+        batch_shape = values.shape[:-1]
+        data = (self._scatter @ values.reshape(-1, values.shape[-1]).T).T
+        return data.reshape(batch_shape + (data.shape[-1],))
+
+    def sparse_matrix(self, parameters: np.ndarray) -> scipy.sparse.csc_matrix:
+        indices, indptr = self._csc_structure
+        return scipy.sparse.csc_matrix((self.data(parameters), indices, indptr), shape=self.shape)
+
+    @cached_property
+    def _line_incidence(self) -> tuple[scipy.sparse.csr_matrix, scipy.sparse.csr_matrix]:
+        keys, _ = self._slots
+        def incidence(lines: np.ndarray, n: int) -> scipy.sparse.csr_matrix:
+            return scipy.sparse.csr_matrix((np.ones(len(lines)), (lines, np.arange(len(lines)))), shape=(n, len(lines)))
+        return incidence(keys % self.shape[0], self.shape[0]), incidence(keys // self.shape[0], self.shape[1])
+
+    def connected(self, parameters: np.ndarray) -> np.ndarray:
+        nonzero = self.data(parameters) != 0
+        batch_shape = nonzero.shape[:-1]
+        nonzero = nonzero.reshape(-1, nonzero.shape[-1]).T.astype(float)
+        rows, columns = self._line_incidence
+        connected = ((rows @ nonzero) > 0) & ((columns @ nonzero) > 0)
+        return connected.T.reshape(batch_shape + (self.shape[0],))
+
+    def dense_matrix(self, parameters: np.ndarray) -> np.ndarray:
+        keys, _ = self._slots
+        data = self.data(parameters)
+        batch_shape = data.shape[:-1]
+        matrix = np.zeros((int(np.prod(batch_shape)), self.shape[0]*self.shape[1]), dtype=complex)
+        matrix[:, (keys % self.shape[0])*self.shape[1] + keys // self.shape[0]] = data.reshape(-1, data.shape[-1])
+        return matrix.reshape(batch_shape + self.shape)
+
+@dataclass(frozen=True)
+class CompiledNetwork:
+    network: Network
+    label_mappings: NetworkLabelMappings
+    element_ids: list[str]
+    element_values: np.ndarray
+    source_ids: list[str]
+    source_values: np.ndarray
+    coefficients: StampPattern
+    constants: StampPattern
+    ideal_current_sources: frozenset[str]
+
+    @cached_property
+    def element_index(self) -> dict[str, int]:
+        return {id: k for k, id in enumerate(self.element_ids)}
+
+    @cached_property
+    def source_index(self) -> dict[str, int]:
+        return {id: k for k, id in enumerate(self.source_ids)}
+
+    def element_vector(self, values: Mapping[str, complex] = {}) -> np.ndarray:
+        vector = self.element_values.copy()
+        for id, value in values.items():
+            if id not in self.element_index:
+                raise KeyError(f"Element '{id}' is not a parameter of the compiled network.")
+            vector[self.element_index[id]] = value
+        return vector
+
+    def source_vector(self, values: Mapping[str, complex] = {}) -> np.ndarray:
+        vector = self.source_values.copy()
+        for id, value in values.items():
+            if id not in self.source_index:
+                raise KeyError(f"Source '{id}' is not a source of the compiled network.")
+            vector[self.source_index[id]] = value
+        return vector
+
+    def parameters(self, element_values: np.ndarray | None = None, source_values: np.ndarray | None = None) -> np.ndarray:
+        element_values, source_values = self._broadcast_values(element_values, source_values)
+        return np.concatenate((element_values, source_values), axis=-1)
+
+    def coefficient_matrix(self, element_values: np.ndarray | None = None) -> scipy.sparse.csc_matrix:
+        return self.coefficients.sparse_matrix(self.parameters(element_values))
+
+    def coefficient_matrices(self, element_values: np.ndarray) -> np.ndarray:
+        return self.coefficients.dense_matrix(self.parameters(element_values))
+
+    def constants_vector(self, element_values: np.ndarray | None = None, source_values: np.ndarray | None = None) -> np.ndarray:
+        return self.constants.dense_matrix(self.parameters(element_values, source_values))
+
+    def _broadcast_values(self, element_values: np.ndarray | None, source_values: np.ndarray | None) -> tuple[np.ndarray, np.ndarray]:
+        element_values = self.element_values if element_values is None else np.asarray(element_values, dtype=complex)
+        source_values = self.source_values if source_values is None else np.asarray(source_values, dtype=complex)
+        batch_shape = np.broadcast_shapes(element_values.shape[:-1], source_values.shape[:-1])
+        return (
+            np.broadcast_to(element_values, batch_shape + element_values.shape[-1:]),
+            np.broadcast_to(source_values, batch_shape + source_values.shape[-1:])
+        )
+
+    def _solve_single(self, element_values: np.ndarray, b: np.ndarray, unconnected: np.ndarray | None = None) -> np.ndarray:
+        A = self.coefficient_matrix(element_values)
+        if unconnected is not None:
+            A = (A + scipy.sparse.diags(unconnected.astype(complex))).tocsc()
+        try:
+            x = mo.SciPySparseMatrixOperations().solve(A, b)
+            return np.array(x, dtype=complex).reshape(np.shape(b))
+        except mo.SolvingLineareEquationSystemFailed as e:
+            raise nodal_analysis_exception(e, self.label_mappings)
+
+    def solve_linear_system(self, element_values: np.ndarray, b: np.ndarray, unconnected: np.ndarray | None = None) -> np.ndarray:
+        n = self.coefficients.shape[0]
+        batch_shape = element_values.shape[:-1]
+        if batch_shape == ():
+            return self._solve_single(element_values, b, unconnected)
+        count = int(np.prod(batch_shape))
+        element_values = element_values.reshape(count, element_values.shape[-1])
+        b = b.reshape(count, n, b.shape[-1])
+        unconnected = np.zeros((count, n), dtype=bool) if unconnected is None else unconnected.reshape(count, n)
+        x = np.zeros(b.shape, dtype=complex)
+        if n > DENSE_BATCH_SIZE:
+            for k in range(len(b)):
+                x[k] = self._solve_single(element_values[k], b[k], unconnected[k])
+            return x.reshape(batch_shape + x.shape[1:])
+        chunk = max(1, DENSE_BATCH_ELEMENTS // max(1, n*n))
+        diagonal = np.arange(n)
+        for start in range(0, len(b), chunk):
+            stop = min(start+chunk, len(b))
+            A = self.coefficient_matrices(element_values[start:stop])
+            A[:, diagonal, diagonal] += unconnected[start:stop]
+            try:
+                x[start:stop] = np.linalg.solve(A, b[start:stop])
+            except np.linalg.LinAlgError:
+                for k in range(start, stop):
+                    x[k] = self._solve_single(element_values[k], b[k], unconnected[k])
+        return x.reshape(batch_shape + x.shape[1:])
+
+    def solve(self, element_values: np.ndarray | None = None, source_values: np.ndarray | None = None) -> "CompiledNetworkSolution":
+        element_values, source_values = self._broadcast_values(element_values, source_values)
+        b = self.constants_vector(element_values, source_values)
+        x = self.solve_linear_system(element_values, b)
+        return CompiledNetworkSolution(self, element_values, source_values, x.reshape(x.shape[:-2] + (-1,)))
+
+    def injection_matrix(self, ports: list[Port]) -> np.ndarray:
+        return port_injection_matrix(self.network, ports, self.label_mappings)
+
+    def port_impedance_matrix(self, ports: list[Port], element_values: np.ndarray | None = None) -> np.ndarray:
+        element_values, _ = self._broadcast_values(element_values, None)
+        P = self.injection_matrix(ports)
+        connected = self.coefficients.connected(self.parameters(element_values))
+        injections = np.where(connected[..., None], P, 0)
+        isolated = np.any(injections != P, axis=-2)
+        Z = P.T @ self.solve_linear_system(element_values, injections, ~connected)
+        Z[isolated[..., :, None] | isolated[..., None, :]] = np.nan
+        Z[isolated[..., :, None] & np.eye(len(ports), dtype=bool)] = np.inf
+        shorted = short_circuited_ports(self.network, ports)
+        Z[..., shorted, :] = 0
+        Z[..., :, shorted] = 0
+        return Z
+
+    def thevenin_equivalents(self, terminals: list[Port], element_values: np.ndarray | None = None, source_values: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        element_values, source_values = self._broadcast_values(element_values, source_values)
+        P = self.injection_matrix(terminals)
+        b = self.constants_vector(element_values, source_values)
+        X = self.solve_linear_system(element_values, np.concatenate((b, np.broadcast_to(P, b.shape[:-1] + P.shape[-1:])), axis=-1))
+        return np.einsum('nk,...n->...k', P, X[..., 0]), np.einsum('nk,...nk->...k', P, X[..., 1:])
+
+    def open_circuit_impedance(self, node1: str, node2: str, element_values: np.ndarray | None = None) -> np.ndarray:
+        return self.port_impedance_matrix([(node1, node2)], element_values)[..., 0, 0]
+
+@dataclass(frozen=True)
+class CompiledNetworkSolution:
+    compiled_network: CompiledNetwork
+    element_values: np.ndarray
+    source_values: np.ndarray
+    solution_vector: np.ndarray
+
+    def _element_value(self, branch_id: str) -> complex:
+        return self.element_values[..., self.compiled_network.element_index[branch_id]]
+
+    def _source_current(self, branch_id: str) -> complex:
+        current = self.source_values[..., self.compiled_network.source_index[branch_id]]
+        if isinstance(self.compiled_network.network[branch_id].element, NortenElement):
+            return current*self._element_value(branch_id)
+        return current
+
+    def get_potential(self, node_id: str) -> complex:
+        if node_id == self.compiled_network.network.reference_node_label:
+            return np.zeros(self.solution_vector.shape[:-1], dtype=complex)[()]
+        return self.solution_vector[..., self.compiled_network.label_mappings.node_mapping[node_id]]
+
+    def get_voltage(self, branch_id: str) -> complex:
+        branch = self.compiled_network.network[branch_id]
+        return self.get_potential(branch.node1) - self.get_potential(branch.node2)
+
+    def get_current(self, branch_id: str) -> complex:
+        label_mappings = self.compiled_network.label_mappings
+        element = self.compiled_network.network[branch_id].element
+        if element.is_voltage_controlled_current_source:
+            control_voltage = self.get_potential(element.control_node1) - self.get_potential(element.control_node2)
+            return self._element_value(branch_id)*control_voltage
+        if element.is_current_controlled_current_source:
+            return self._element_value(branch_id)*self.get_current(element.control_branch)
+        if branch_id in label_mappings.voltage_source_mapping:
+            return self.solution_vector[..., label_mappings.node_mapping.N + label_mappings.voltage_source_mapping[branch_id]]
+        if branch_id in self.compiled_network.ideal_current_sources:
+            return self._source_current(branch_id)
+        if branch_id in self.compiled_network.source_index:
+            return -(self._source_current(branch_id) + self.get_voltage(branch_id)*self._element_value(branch_id))
+        return self.get_voltage(branch_id)*self._element_value(branch_id)
+
+    def get_power(self, branch_id: str) -> complex:
+        return self.get_voltage(branch_id)*np.conj(self.get_current(branch_id))
+
+def compile_network(network: Network, label_mappings_factory: LabelMappingsFactory = default_label_mappings_factory) -> CompiledNetwork:
+    label_mappings = label_mappings_factory(network)
+    element_ids: list[str] = []
+    element_values: list[complex] = []
+    source_ids: list[str] = []
+    source_values: list[complex] = []
+    ideal_current_sources: set[str] = set()
+    for branch in network.branches:
+        element_value, source_value = branch_parameters(branch.element)
+        if element_value is not None:
+            element_ids.append(branch.id)
+            element_values.append(element_value)
+        if source_value is None:
+            continue
+        source_ids.append(branch.id)
+        source_values.append(source_value)
+        if branch.element.is_ideal_current_source:
+            ideal_current_sources.add(branch.id)
+
+    symbols = sp.symbols(f'p:{len(element_ids) + len(source_ids)}')
+    element_symbols = dict(zip(element_ids, symbols))
+    source_symbols = dict(zip(source_ids, symbols[len(element_ids):]))
+    parametrized_network = Network(
+        branches=[parametrized_branch(b, element_symbols.get(b.id), source_symbols.get(b.id)) for b in network.branches],
+        reference_node_label=network.reference_node_label
+    )
+    stamps = nodal_analysis_stamps(parametrized_network, mo.SymPyMatrixOperations(), label_mappings)
+    parameters = {symbol: k for k, symbol in enumerate(symbols)}
+    return CompiledNetwork(
+        network=network,
+        label_mappings=label_mappings,
+        element_ids=element_ids,
+        element_values=np.array(element_values, dtype=complex),
+        source_ids=source_ids,
+        source_values=np.array(source_values, dtype=complex),
+        coefficients=StampPattern.from_stamps(stamps.coefficients, parameters),
+        constants=StampPattern.from_stamps(stamps.constants, parameters),
+        ideal_current_sources=frozenset(ideal_current_sources)
+    )
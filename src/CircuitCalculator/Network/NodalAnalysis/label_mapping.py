@@ -1,5 +1,6 @@
 from typing import Callable
 from dataclasses import dataclass
+from functools import cached_property
 from ..network import Network
 
 class DistinctValues(Exception):
@@ -19,6 +20,16 @@ class LabelMapping:
     def __call__(self, *labels: str) -> tuple[int, ...]:
         return tuple(self[label] for label in labels)
 
+    def __contains__(self, label: object) -> bool:
+        return label in self.mapping
+
+    @cached_property
+    def inverse(self) -> dict[int, str]:
+        return {v: k for k, v in self.mapping.items()}
+
+    def label(self, index: int) -> str:
+        return self.inverse[index]
+
     def filter_keys(self, filter_fcn: Callable[[str], bool]) -> "LabelMapping":
         return LabelMapping({k: self.mapping[k] for k in self.mapping.keys() if filter_fcn(k)})
 
@@ -71,11 +82,11 @@ class NetworkLabelMappings:
     current_source_mapper: LabelMapper
     voltage_source_mapper: LabelMapper
 
-    @property
+    @cached_property
     def node_mapping(self) -> LabelMapping:
         return self.node_mapper(self.network)
 
-    @property
+    @cached_property
     def source_mapping(self) -> LabelMapping:
         return self.source_mapper(self.network)
 
@@ -83,11 +94,11 @@ class NetworkLabelMappings:
     def source_and_inductance_mapping(self) -> LabelMapping:
         return self.source_mapping
 
-    @property
+    @cached_property
     def current_source_mapping(self) -> LabelMapping:
         return self.current_source_mapper(self.network)
 
-    @property
+    @cached_property
     def voltage_source_mapping(self) -> LabelMapping:
         return self.voltage_source_mapper(self.network)
 
@@ -1,9 +1,12 @@
 import numpy as np
+import scipy.sparse
+import scipy.sparse.linalg
 import sympy as sp
 from sympy.matrices.common import NonInvertibleMatrixError
-from typing import Protocol, Any
+from sympy.polys.matrices import DomainMatrix
+from typing import Protocol, Any, Mapping
 
-Matrix = np.ndarray | sp.Matrix
+Matrix = np.ndarray | sp.Matrix | scipy.sparse.sparray | scipy.sparse.spmatrix
 symbolic = sp.core.symbol.Symbol
 
 class MatrixInversionException(Exception):
@@ -79,11 +82,13 @@ class MatrixOperations(Protocol):
     @staticmethod
     def diag_vec(values: Any) -> list[complex | symbolic]: ...
 
-    @staticmethod
-    def inv(matrix: Any) -> Any: ...
+    def inv(self, matrix: Any) -> Any: ...
 
-    @staticmethod
-    def solve(A: Any, b: Any) -> tuple[complex | symbolic, ...]: ...
+    def solve(self, A: Any, b: Any) -> tuple[complex | symbolic, ...]: ...
+
+    def solve_matrix(self, A: Any, B: Any) -> Any: ...
+
+    def solve_functional(self, A: Any, b: Any, weights: dict[int, complex | symbolic]) -> complex | symbolic: ...
 
     @staticmethod
     def elm(value: complex | symbolic) -> MatrixElement: ...
@@ -100,6 +105,9 @@ class MatrixOperations(Protocol):
     @staticmethod
     def delete(matrix: Any, idx: list[int], axis: int) -> Any: ...
 
+    @staticmethod
+    def from_triplets(shape: tuple[int, int], rows: list[int], columns: list[int], values: list[complex | symbolic]) -> Any: ...
+
 class NumPyMatrixOperations:
     @staticmethod
     def zeros(shape: tuple[int, int]) -> np.ndarray:
@@ -157,6 +165,20 @@ class NumPyMatrixOperations:
                 dependent_columns=dependent_cols(A)
             ) from e
 
+    @staticmethod
+    def solve_functional(A: np.ndarray, b: np.ndarray, weights: dict[int, complex | symbolic]) -> complex:
+        x = NumPyMatrixOperations.solve_matrix(A, b)
+        return sum(w*x[i, 0] for i, w in weights.items())
+
+    @staticmethod
+    def solve_matrix(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+        if A.shape[0] == 0:
+            return np.zeros((0, B.shape[1]), dtype=complex)
+        try:
+            return np.linalg.solve(A, B)
+        except np.linalg.LinAlgError:
+            raise MatrixInversionException("Matrix inversion failed, possibly due to singular matrix.")
+
     @staticmethod
     def elm(value: complex | symbolic) -> NumericMatrixElement:
         return NumericMatrixElement(value)
@@ -177,6 +199,12 @@ class NumPyMatrixOperations:
     def delete(matrix: np.ndarray, idx: list[int], axis: int) -> np.ndarray:
         return np.delete(matrix, idx, axis)
 
+    @staticmethod
+    def from_triplets(shape: tuple[int, int], rows: list[int], columns: list[int], values: list[complex | symbolic]) -> np.ndarray:
+        matrix = np.zeros(shape, dtype=complex)
+        np.add.at(matrix, (np.array(rows, dtype=int), np.array(columns, dtype=int)), np.array(values, dtype=complex))
+        return matrix
+
 class SymPyMatrixOperations:
     @staticmethod
     def zeros(shape: tuple[int, int]) -> sp.Matrix:
@@ -220,6 +248,20 @@ class SymPyMatrixOperations:
         except NonInvertibleMatrixError:
             raise MatrixInversionException("Matrix inversion failed, possibly due to singular matrix.")
 
+    @staticmethod
+    def solve_functional(A: sp.Matrix, b: sp.Matrix, weights: dict[int, complex | symbolic]) -> symbolic:
+        x = SymPyMatrixOperations.solve(A, b)
+        return sum((w*x[i] for i, w in weights.items()), sp.sympify(0))
+
+    @staticmethod
+    def solve_matrix(A: sp.Matrix, B: sp.Matrix) -> sp.Matrix:
+        if A.shape[0] == 0:
+            return sp.zeros(0, B.shape[1])
+        try:
+            return sp.Matrix(A.LUsolve(B))
+        except NonInvertibleMatrixError:
+            raise MatrixInversionException("Matrix inversion failed, possibly due to singular matrix.")
+
     @staticmethod
     def elm(value: complex | symbolic) -> SymbolicMatrixElement:
         return SymbolicMatrixElement(value)
@@ -245,4 +287,282 @@ class SymPyMatrixOperations:
             return matrix.row_del(*idx)
         if axis == 1:
             return matrix.col_del(*idx)
-        return matrix
\ No newline at end of file
+        return matrix
+
+    @staticmethod
+    def from_triplets(shape: tuple[int, int], rows: list[int], columns: list[int], values: list[complex | symbolic]) -> sp.Matrix:
+        matrix = sp.zeros(*shape)
+        for row, column, value in zip(rows, columns, values):
+            matrix[row, column] += value
+        return matrix
+
+def term_count(value: Any) -> int:
+    return len(value) if isinstance(value, dict) else 1
+
+def exact_rational(expression: Any) -> Any:
+    return expression.xreplace({f: sp.Rational(str(f)) for f in expression.atoms(sp.Float)})
+
+def fraction_free_elimination(A: sp.Matrix, B: sp.Matrix) -> tuple[Any, list[dict[int, Any]], Any]:
+    n = A.shape[0]
+    augmented = DomainMatrix.from_Matrix(A.row_join(B)).to_sparse()
+    if augmented.domain.is_Field and augmented.domain.has_assoc_Ring:
+        _, augmented = augmented.clear_denoms_rowwise(convert=True)
+    K = augmented.domain
+    rows = [dict(augmented.rep.get(i, {})) for i in range(n)]
+    levels = [0]*n
+    pivots = [K.one]
+    def row_at_level(i: int, level: int) -> dict[int, Any]:
+        if levels[i] != level:
+            rows[i] = {c: K.exquo(value*pivots[level], pivots[levels[i]]) for c, value in rows[i].items()}
+            levels[i] = level
+        return rows[i]
+    remaining = set(range(n))
+    pivot_rows: list[dict[int, Any]] = []
+    for k in range(n):
+        candidates = [i for i in remaining if k in rows[i]]
+        if not candidates:
+            raise MatrixInversionException("Matrix inversion failed, possibly due to singular matrix.")
+        p = min(candidates, key=lambda i: (len(rows[i]), term_count(rows[i][k])))
+        remaining.discard(p)
+        pivot_row = row_at_level(p, k)
+        pivot_rows.append(pivot_row)
+        for i in candidates:
+            if i == p:
+                continue
+            row = row_at_level(i, k)
+            factor = row.pop(k)
+            eliminated = {}
+            for c in (row.keys() | pivot_row.keys()) - {k}:
+                value = K.exquo(pivot_row[k]*row.get(c, K.zero) - factor*pivot_row.get(c, K.zero), pivots[k])
+                if value:
+                    eliminated[c] = value
+            rows[i], levels[i] = eliminated, k+1
+        pivots.append(pivot_row[k])
+    return K, pivot_rows, pivots[-1]
+
+def fraction_free_quotient(K: Any, numerator: Any, denominator: Any) -> symbolic:
+    F = K if K.is_Field else K.get_field()
+    return F.to_sympy(F.quo(F.convert(numerator, K), F.convert(denominator, K)))
+
+def fraction_free_solve(A: sp.Matrix, B: sp.Matrix) -> sp.Matrix:
+    if A.has(sp.Float) or B.has(sp.Float):
+        return fraction_free_solve(exact_rational(A), exact_rational(B))
+    n, m = A.shape[0], B.shape[1]
+    K, pivot_rows, determinant = fraction_free_elimination(A, B)
+    numerators: dict[tuple[int, int], Any] = {}
+    for k in reversed(range(n)):
+        row = pivot_rows[k]
+        for j in range(m):
+            value = determinant*row.get(n+j, K.zero)
+            for c, a in row.items():
+                if c < n and c != k:
+                    value -= a*numerators[c, j]
+            numerators[k, j] = K.exquo(value, row[k])
+    return sp.Matrix(n, m, lambda i, j: fraction_free_quotient(K, numerators[i, j], determinant))
+
+def fraction_free_functional(A: sp.Matrix, b: sp.Matrix, weights: dict[int, complex | symbolic]) -> symbolic:
+    if A.has(sp.Float) or b.has(sp.Float) or any(sp.sympify(w).has(sp.Float) for w in weights.values()):
+        return fraction_free_functional(exact_rational(A), exact_rational(b), {i: exact_rational(sp.sympify(w)) for i, w in weights.items()})
+    n = A.shape[0]
+    bordered = A.row_join(sp.zeros(n, 1)).col_join(sp.Matrix([[-weights.get(i, 0) for i in range(n)] + [1]]))
+    K, pivot_rows, determinant = fraction_free_elimination(bordered, b.col_join(sp.zeros(1, 1)))
+    return fraction_free_quotient(K, pivot_rows[-1].get(n+1, K.zero), determinant)
+
+class SymPyDomainMatrixOperations(SymPyMatrixOperations):
+    @staticmethod
+    def inv(matrix: sp.Matrix) -> sp.Matrix:
+        if matrix.shape[0] == 0:
+            return sp.zeros(0, 0)
+        return fraction_free_solve(matrix, sp.eye(matrix.shape[0]))
+
+    @staticmethod
+    def solve(A: sp.Matrix, b: sp.Matrix) -> tuple[symbolic, ...]:
+        if A.shape[0] == 0:
+            return ()
+        return tuple(fraction_free_solve(A, b))
+
+    @staticmethod
+    def solve_matrix(A: sp.Matrix, B: sp.Matrix) -> sp.Matrix:
+        if A.shape[0] == 0:
+            return sp.zeros(0, B.shape[1])
+        return fraction_free_solve(A, sp.Matrix(B))
+
+    @staticmethod
+    def solve_functional(A: sp.Matrix, b: sp.Matrix, weights: dict[int, complex | symbolic]) -> symbolic:
+        if A.shape[0] == 0:
+            return sp.sympify(0)
+        return fraction_free_functional(A, b, weights)
+
+def monic_float_fraction(expression: Any) -> Any:
+    numerator, denominator = sp.fraction(sp.sympify(expression))
+    if denominator.is_number:
+        return (numerator/denominator).evalf()
+    leading_coefficient = sp.Poly(denominator, *sorted(denominator.free_symbols, key=str)).LC()
+    return sp.expand(numerator/leading_coefficient).evalf()/sp.expand(denominator/leading_coefficient).evalf()
+
+class SymPyHybridMatrixOperations(SymPyDomainMatrixOperations):
+    def __init__(self, values: Mapping[str, complex | float]) -> None:
+        self.values = dict(values)
+
+    def _numeric(self, matrix: sp.Matrix) -> sp.Matrix:
+        substitutions = {symbol: sp.sympify(self.values[symbol.name]) for symbol in matrix.free_symbols if symbol.name in self.values}
+        return exact_rational(matrix.xreplace(substitutions))
+
+    def inv(self, matrix: sp.Matrix) -> sp.Matrix:
+        return SymPyDomainMatrixOperations.inv(self._numeric(matrix)).applyfunc(monic_float_fraction)
+
+    def solve(self, A: sp.Matrix, b: sp.Matrix) -> tuple[symbolic, ...]:
+        return tuple(monic_float_fraction(x) for x in SymPyDomainMatrixOperations.solve(self._numeric(A), self._numeric(b)))
+
+    def solve_matrix(self, A: sp.Matrix, B: sp.Matrix) -> sp.Matrix:
+        return SymPyDomainMatrixOperations.solve_matrix(self._numeric(A), self._numeric(sp.Matrix(B))).applyfunc(monic_float_fraction)
+
+    def solve_functional(self, A: sp.Matrix, b: sp.Matrix, weights: dict[int, complex | symbolic]) -> symbolic:
+        return monic_float_fraction(SymPyDomainMatrixOperations.solve_functional(self._numeric(A), self._numeric(b), weights))
+
+SparseMatrixKey = tuple[bytes, bytes, bytes, tuple[int, int]]
+
+def sparse_matrix_key(matrix: scipy.sparse.csc_matrix) -> SparseMatrixKey:
+    return matrix.data.tobytes(), matrix.indices.tobytes(), matrix.indptr.tobytes(), matrix.shape
+
+class SciPySparseMatrixOperations:
+    def __init__(self, permc_spec: str = 'COLAMD', diag_pivot_thresh: float | None = None, inverse_block_size: int = 256) -> None:
+        self.permc_spec = permc_spec
+        self.diag_pivot_thresh = diag_pivot_thresh
+        self.inverse_block_size = inverse_block_size
+        self._factorization: tuple[SparseMatrixKey, scipy.sparse.linalg.SuperLU] | None = None
+
+    @staticmethod
+    def zeros(shape: tuple[int, int]) -> np.ndarray:
+        return np.zeros(shape, dtype=complex)
+
+    @staticmethod
+    def nan(shape: tuple[int, int]) -> np.ndarray:
+        return np.full(shape, np.nan, dtype=complex)
+
+    @staticmethod
+    def column_vector(values: list[complex | symbolic]) -> np.ndarray:
+        return np.array([NumericMatrixElement(v).value for v in values], dtype=complex).reshape(len(values), 1)
+
+    @staticmethod
+    def vstack(matrices: tuple[Any, ...]) -> Any:
+        if any(scipy.sparse.issparse(m) for m in matrices):
+            return scipy.sparse.vstack(matrices, format='csc')
+        return np.vstack(matrices)
+
+    @staticmethod
+    def hstack(matrices: tuple[Any, ...]) -> Any:
+        if any(scipy.sparse.issparse(m) for m in matrices):
+            return scipy.sparse.hstack(matrices, format='csc')
+        return np.hstack(matrices)
+
+    @staticmethod
+    def diag(values: list[complex | symbolic]) -> np.ndarray:
+        return np.diag([NumericMatrixElement(v).value for v in values])
+
+    @staticmethod
+    def diag_vec(values: Any) -> list[complex | symbolic]:
+        return [NumericMatrixElement(v).value for v in values.diagonal()]
+
+    def factorize(self, matrix: Any) -> scipy.sparse.linalg.SuperLU:
+        matrix = scipy.sparse.csc_matrix(matrix, dtype=complex, copy=True)
+        matrix.sum_duplicates()
+        matrix.sort_indices()
+        key = sparse_matrix_key(matrix)
+        if self._factorization is not None and self._factorization[0] == key:
+            return self._factorization[1]
+        lu = scipy.sparse.linalg.splu(matrix, permc_spec=self.permc_spec, diag_pivot_thresh=self.diag_pivot_thresh)
+        self._factorization = (key, lu)
+        return lu
+
+    def inv(self, matrix: Any) -> scipy.sparse.csc_matrix:
+        return self.solve_matrix(matrix, scipy.sparse.identity(self.shape(matrix)[0], dtype=complex, format='csc'))
+
+    def solve(self, A: Any, b: Any) -> tuple[complex, ...]:
+        def zero_cols(A: Any) -> tuple[int, ...]:
+            return tuple(int(i) for i in np.where(~SciPySparseMatrixOperations.any_element(A, axis=0))[0])
+        if self.shape(A)[0] == 0:
+            return ()
+        b = b.toarray() if scipy.sparse.issparse(b) else np.asarray(b)
+        try:
+            x = self.factorize(A).solve(b.astype(complex))
+        except RuntimeError as e:
+            raise SolvingLineareEquationSystemFailed(
+                message="Solving linear equation system failed.",
+                zero_columns=zero_cols(A)
+            ) from e
+        if not np.all(np.isfinite(x)):
+            raise SolvingLineareEquationSystemFailed(
+                message="Solving linear equation system failed.",
+                zero_columns=zero_cols(A)
+            )
+        return tuple(x.flatten())
+
+    def solve_functional(self, A: Any, b: Any, weights: dict[int, complex | symbolic]) -> complex:
+        x = self.solve_matrix(A, b.toarray() if scipy.sparse.issparse(b) else b)
+        return sum(w*x[i, 0] for i, w in weights.items())
+
+    def solve_matrix(self, A: Any, B: Any) -> Any:
+        def solve_block(B: Any) -> np.ndarray:
+            X = lu.solve(np.asarray(B, dtype=complex))
+            if not np.all(np.isfinite(X)):
+                raise MatrixInversionException("Matrix inversion failed, possibly due to singular matrix.")
+            return X
+
+        n = self.shape(A)[0]
+        if n == 0:
+            return scipy.sparse.csc_matrix(B.shape, dtype=complex) if scipy.sparse.issparse(B) else np.zeros((0, np.shape(B)[1]), dtype=complex)
+        try:
+            lu = self.factorize(A)
+        except RuntimeError:
+            raise MatrixInversionException("Matrix inversion failed, possibly due to singular matrix.")
+        if not scipy.sparse.issparse(B):
+            return solve_block(B)
+        B = scipy.sparse.csc_matrix(B)
+        blocks = [
+            scipy.sparse.csc_matrix(solve_block(B[:, start:start+self.inverse_block_size].toarray()))
+            for start in range(0, B.shape[1], self.inverse_block_size)
+        ]
+        return scipy.sparse.hstack(blocks, format='csc') if blocks else scipy.sparse.csc_matrix((n, 0), dtype=complex)
+
+    @staticmethod
+    def elm(value: complex | symbolic) -> NumericMatrixElement:
+        return NumericMatrixElement(value)
+
+    @staticmethod
+    def shape(matrix: Any) -> tuple[int, int]:
+        return (matrix.shape[0], matrix.shape[1])
+
+    @staticmethod
+    def contains_nan(matrix: Any) -> bool:
+        if scipy.sparse.issparse(matrix):
+            return bool(np.any(np.isnan(matrix.data)))
+        return bool(np.any(np.isnan(matrix)))
+
+    @staticmethod
+    def any_element(matrix: Any, axis: int) -> np.ndarray:
+        if not scipy.sparse.issparse(matrix):
+            return np.any(matrix, axis=axis)
+        matrix = scipy.sparse.csc_matrix(matrix, copy=True)
+        matrix.eliminate_zeros()
+        return np.asarray(matrix.getnnz(axis=axis)) > 0
+
+    @staticmethod
+    def delete(matrix: Any, idx: list[int], axis: int) -> Any:
+        if not scipy.sparse.issparse(matrix):
+            return np.delete(matrix, idx, axis)
+        retained = np.ones(matrix.shape[axis], dtype=bool)
+        retained[idx] = False
+        matrix = scipy.sparse.csc_matrix(matrix)
+        if axis == 0:
+            return matrix[retained, :]
+        return matrix[:, retained]
+
+    @staticmethod
+    def from_triplets(shape: tuple[int, int], rows: list[int], columns: list[int], values: list[complex | symbolic]) -> scipy.sparse.csc_matrix:
+        matrix = scipy.sparse.coo_matrix(
+            (np.array(values, dtype=complex), (np.array(rows, dtype=int), np.array(columns, dtype=int))),
+            shape=shape
+        ).tocsc()
+        matrix.eliminate_zeros()
+        return matrix
@@ -1,6 +1,30 @@
 from . import node_analysis as na
+from .matrix_operations import MatrixInversionException
+from .compiled_network import Port, compile_network
+from .label_mapping import LabelMappingsFactory, default_label_mappings_factory
 from .solution import numeric_nodal_analysis_bias_point_solution
 from ..network import Network
+from ..solution import NetworkSolutionException
+from dataclasses import dataclass
+from functools import cached_property
+import numpy as np
+
+@dataclass(frozen=True)
+class PortMatrices:
+    ports: list[Port]
+    Z: np.ndarray
+
+    @cached_property
+    def Y(self) -> np.ndarray:
+        Z = self.Z.reshape((-1,) + self.Z.shape[-2:])
+        Y = np.zeros(Z.shape, dtype=complex)
+        for Z_k, Y_k in zip(Z, Y):
+            connected = np.flatnonzero(np.isfinite(np.diagonal(Z_k)))
+            try:
+                Y_k[np.ix_(connected, connected)] = np.linalg.inv(Z_k[np.ix_(connected, connected)])
+            except np.linalg.LinAlgError as e:
+                raise MatrixInversionException("Port admittance matrix is undefined, ports are short circuited.") from e
+        return Y.reshape(self.Z.shape)
 
 def open_circuit_voltage(network: Network, node1: str, node2: str) -> complex:
     solution = numeric_nodal_analysis_bias_point_solution(network)
@@ -14,3 +38,10 @@ def short_circuit_current(network: Network, node1: str, node2: str) -> complex:
     Z = complex(na.open_circuit_impedance(network, node1, node2))
     V = open_circuit_voltage(network, node1, node2)
     return V/Z
+
+def port_matrices(network: Network, ports: list[Port], label_mappings_factory: LabelMappingsFactory = default_label_mappings_factory) -> PortMatrices:
+    try:
+        Z = compile_network(network, label_mappings_factory).port_impedance_matrix(ports)
+    except na.NodalAnalysisException as e:
+        raise NetworkSolutionException("Solving network failed.", floating_nodes=e.floating_nodes, contradictional_elements=e.contradictional_elements)
+    return PortMatrices(ports=ports, Z=Z)
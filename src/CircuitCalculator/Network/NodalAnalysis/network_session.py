@@ -0,0 +1,253 @@
+import numpy as np
+import scipy.sparse
+import scipy.sparse.linalg
+from typing import Any
+from ..network import AmbiguousBranchIDs, Branch, Network
+from ..norten_thevenin_elements import NortenElement
+from ..solution import NetworkSolutionException
+from . import matrix_operations as mo
+from .compiled_network import CompiledNetwork, CompiledNetworkSolution, branch_kind, branch_parameters, compile_network
+from .label_mapping import LabelMappingsFactory, default_label_mappings_factory
+from .node_analysis import nodal_analysis_exception
+from .node_analysis_calculations import is_norten_thevenin_element
+
+Stamp = tuple[int, int]
+
+def is_low_rank_element(element: Any) -> bool:
+    return is_norten_thevenin_element(element) and not element.is_ideal_voltage_source and not element.is_controlled_source
+
+def same_structure(element1: Any, element2: Any) -> bool:
+    control = ('control_node1', 'control_node2', 'control_branch')
+    return branch_kind(element1) == branch_kind(element2) and all(getattr(element1, a, None) == getattr(element2, a, None) for a in control)
+
+def source_current(element: Any) -> complex:
+    Y, source = branch_parameters(element)
+    if source is None:
+        return 0
+    return source*Y if isinstance(element, NortenElement) else source
+
+class NetworkSession:
+    def __init__(self, network: Network, label_mappings_factory: LabelMappingsFactory = default_label_mappings_factory, max_rank: int = 32, refactorization_interval: int = 256) -> None:
+        self.label_mappings_factory = label_mappings_factory
+        self.max_rank = max_rank
+        self.refactorization_interval = refactorization_interval
+        self._reference_node = network.reference_node_label
+        self._branches: dict[str, Branch] = {branch.id: branch for branch in network.branches}
+        self._rebuild()
+
+    @property
+    def network(self) -> Network:
+        if self._network is None:
+            self._network = Network(list(self._branches.values()), self._reference_node)
+        return self._network
+
+    @property
+    def compiled_network(self) -> CompiledNetwork:
+        return self._compiled
+
+    def _rebuild(self) -> None:
+        self._network: Network | None = None
+        self._compiled = compile_network(self.network, self.label_mappings_factory)
+        self._parameters = self._compiled.parameters()
+        self._inserted: dict[str, Branch] = {}
+        self._removed: set[str] = set()
+        self._control_branches = {b.element.control_branch for b in self._compiled.network.branches if hasattr(b.element, 'control_branch')}
+        self._structure_changed = False
+        self._refactorize()
+
+    def _refactorize(self) -> None:
+        self._delta: dict[Stamp, complex] = {}
+        for branch in self._inserted.values():
+            self._add_admittance(branch, branch_parameters(branch.element)[0])
+        A = self._compiled.coefficient_matrix(self._element_values)
+        if self._delta:
+            (rows, columns), values = zip(*self._delta.keys()), list(self._delta.values())
+            A = A + scipy.sparse.csc_matrix((values, (rows, columns)), shape=A.shape)
+        self._delta = {}
+        self._columns: dict[int, np.ndarray] = {}
+        self._edits = 0
+        self._solution_vector: np.ndarray | None = None
+        if A.shape[0] == 0:
+            self._lu = None
+            return
+        try:
+            self._lu = scipy.sparse.linalg.splu(scipy.sparse.csc_matrix(A, dtype=complex))
+        except RuntimeError as e:
+            zero_columns = tuple(int(i) for i in np.where(~mo.SciPySparseMatrixOperations.any_element(A, axis=0))[0])
+            exception = nodal_analysis_exception(mo.SolvingLineareEquationSystemFailed("Solving linear equation system failed.", zero_columns=zero_columns), self._compiled.label_mappings)
+            raise NetworkSolutionException("Solving network failed.", floating_nodes=exception.floating_nodes, contradictional_elements=exception.contradictional_elements) from e
+
+    @property
+    def _element_values(self) -> np.ndarray:
+        return self._parameters[:len(self._compiled.element_ids)]
+
+    @property
+    def _source_values(self) -> np.ndarray:
+        return self._parameters[len(self._compiled.element_ids):]
+
+    def _node_row(self, node: str) -> int | None:
+        if node == self._reference_node:
+            return None
+        return self._compiled.label_mappings.node_mapping[node]
+
+    def _is_mapped_node(self, node: str) -> bool:
+        return node == self._reference_node or node in self._compiled.label_mappings.node_mapping
+
+    def _add_delta(self, row: int | None, column: int | None, value: complex) -> None:
+        if row is None or column is None:
+            return
+        value = self._delta.get((row, column), 0) + value
+        if value == 0:
+            self._delta.pop((row, column), None)
+        else:
+            self._delta[(row, column)] = value
+
+    def _add_admittance(self, branch: Branch, Y: complex) -> None:
+        i, j = self._node_row(branch.node1), self._node_row(branch.node2)
+        self._add_delta(i, i, Y)
+        if branch.node1 != branch.node2:
+            self._add_delta(j, j, Y)
+            self._add_delta(i, j, -Y)
+            self._add_delta(j, i, -Y)
+
+    def _set_parameter(self, index: int, value: complex) -> None:
+        stamps = self._compiled.coefficients.factor_stamps.get(index)
+        if stamps is None:
+            self._parameters[index] = value
+            return
+        coefficients = self._compiled.coefficients
+        old_values = coefficients.stamp_values(self._parameters, stamps)
+        self._parameters[index] = value
+        new_values = coefficients.stamp_values(self._parameters, stamps)
+        for row, column, delta in zip(coefficients.rows[stamps], coefficients.columns[stamps], new_values-old_values):
+            self._add_delta(int(row), int(column), delta)
+
+    def _edited(self) -> None:
+        self._network = None
+        self._solution_vector = None
+        self._edits += 1
+
+    def change_element(self, element: Any) -> None:
+        old_branch = self._branches[element.name]
+        branch = Branch(old_branch.node1, old_branch.node2, element)
+        self._branches[branch.id] = branch
+        self._edited()
+        if branch.id in self._inserted and is_low_rank_element(element):
+            self._add_admittance(branch, branch_parameters(element)[0] - branch_parameters(old_branch.element)[0])
+            self._inserted[branch.id] = branch
+        elif branch.id in self._compiled.element_index and same_structure(element, old_branch.element):
+            element_value, source_value = branch_parameters(element)
+            self._set_parameter(self._compiled.element_index[branch.id], element_value)
+            if source_value is not None:
+                self._set_parameter(len(self._compiled.element_ids) + self._compiled.source_index[branch.id], source_value)
+        elif branch.id in self._compiled.source_index and same_structure(element, old_branch.element):
+            self._set_parameter(len(self._compiled.element_ids) + self._compiled.source_index[branch.id], branch_parameters(element)[1])
+        else:
+            self._structure_changed = True
+
+    def remove_element(self, branch_id: str) -> None:
+        branch = self._branches.pop(branch_id)
+        self._edited()
+        if branch_id in self._inserted:
+            self._add_admittance(branch, -branch_parameters(branch.element)[0])
+            del self._inserted[branch_id]
+        elif branch_id in self._compiled.element_index and is_low_rank_element(branch.element) and branch_id not in self._control_branches:
+            self._set_parameter(self._compiled.element_index[branch_id], 0)
+            if branch_id in self._compiled.source_index:
+                self._set_parameter(len(self._compiled.element_ids) + self._compiled.source_index[branch_id], 0)
+            self._removed.add(branch_id)
+        else:
+            self._structure_changed = True
+
+    def insert_element(self, branch: Branch) -> None:
+        if branch.id in self._branches:
+            raise AmbiguousBranchIDs
+        self._branches[branch.id] = branch
+        self._edited()
+        if branch.id not in self._removed and is_low_rank_element(branch.element) and self._is_mapped_node(branch.node1) and self._is_mapped_node(branch.node2):
+            self._add_admittance(branch, branch_parameters(branch.element)[0])
+            self._inserted[branch.id] = branch
+        else:
+            self._structure_changed = True
+
+    def _base_solution(self, b: np.ndarray) -> np.ndarray:
+        return self._lu.solve(b) if self._lu is not None else b
+
+    def _column(self, row: int) -> np.ndarray:
+        if row not in self._columns:
+            e = np.zeros(self._compiled.coefficients.shape[0], dtype=complex)
+            e[row] = 1
+            self._columns[row] = self._base_solution(e)
+        return self._columns[row]
+
+    def _constants_vector(self) -> np.ndarray:
+        b = self._compiled.constants_vector(self._element_values, self._source_values)[:, 0]
+        for branch in self._inserted.values():
+            J = source_current(branch.element)
+            for node, sign in ((branch.node1, -1), (branch.node2, 1)):
+                row = self._node_row(node)
+                if row is not None:
+                    b[row] += sign*J
+        return b
+
+    def _low_rank_solution(self, b: np.ndarray) -> np.ndarray:
+        y = self._base_solution(b)
+        if not self._delta:
+            return y
+        rows = sorted({row for row, _ in self._delta})
+        columns = sorted({column for _, column in self._delta})
+        row_index = {row: k for k, row in enumerate(rows)}
+        column_index = {column: k for k, column in enumerate(columns)}
+        D = np.zeros((len(rows), len(columns)), dtype=complex)
+        for (row, column), value in self._delta.items():
+            D[row_index[row], column_index[column]] = value
+        W = np.stack([self._column(row) for row in rows], axis=-1)
+        K = np.eye(len(rows)) + D @ W[columns, :]
+        if np.linalg.cond(K) > 1e12:
+            raise np.linalg.LinAlgError
+        return y - W @ np.linalg.solve(K, D @ y[columns])
+
+    def solve(self) -> np.ndarray:
+        if self._solution_vector is not None:
+            return self._solution_vector
+        if self._structure_changed:
+            self._rebuild()
+        rank = max(len({row for row, _ in self._delta}), len({column for _, column in self._delta}))
+        if rank > self.max_rank or self._edits >= self.refactorization_interval:
+            self._refactorize()
+        b = self._constants_vector()
+        try:
+            x = self._low_rank_solution(b)
+            if not np.all(np.isfinite(x)):
+                raise np.linalg.LinAlgError
+        except np.linalg.LinAlgError:
+            self._rebuild()
+            x = self._base_solution(self._constants_vector())
+        self._solution_vector = x
+        return x
+
+    def _compiled_solution(self) -> CompiledNetworkSolution:
+        return CompiledNetworkSolution(self._compiled, self._element_values, self._source_values, self.solve())
+
+    def get_potential(self, node_id: str) -> complex:
+        if node_id != self._reference_node and node_id not in self._compiled.label_mappings.node_mapping:
+            raise KeyError(f"Node '{node_id}' is floating.")
+        return self._compiled_solution().get_potential(node_id)
+
+    def get_voltage(self, branch_id: str) -> complex:
+        branch = self._branches[branch_id]
+        return self.get_potential(branch.node1) - self.get_potential(branch.node2)
+
+    def get_current(self, branch_id: str) -> complex:
+        branch = self._branches[branch_id]
+        if branch_id not in self._inserted:
+            return self._compiled_solution().get_current(branch_id)
+        Y, source = branch_parameters(branch.element)
+        if source is not None and branch.element.is_ideal_current_source:
+            return source_current(branch.element)
+        if source is not None:
+            return -(source_current(branch.element) + self.get_voltage(branch_id)*Y)
+        return self.get_voltage(branch_id)*Y
+
+    def get_power(self, branch_id: str) -> complex:
+        return self.get_voltage(branch_id)*np.conj(self.get_current(branch_id))
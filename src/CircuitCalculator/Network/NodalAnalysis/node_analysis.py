@@ -1,12 +1,12 @@
 import numpy as np
-import itertools
-from typing import Mapping
+from typing import Any, Mapping
 from ..network import Network
+from ..diagnostics import topology_diagnostics, voltage_source_forest
 from . import matrix_operations as mo
 from .matrix_operations import symbolic
 from .. import transformers as trf
-from .label_mapping import LabelMappingsFactory, default_label_mappings_factory
-from .node_analysis_calculations import nodal_analysis_coefficient_matrix, nodal_analysis_constants_vector, source_incidence_matrix
+from .label_mapping import LabelMappingsFactory, NetworkLabelMappings, default_label_mappings_factory
+from .node_analysis_calculations import nodal_analysis_coefficient_matrix, nodal_analysis_system, source_incidence_matrix
 
 class NodalAnalysisException(Exception):
     def __init__(self, message: str, floating_nodes: tuple[str, ...], contradictional_elements: tuple[str, ...]) -> None:
@@ -14,28 +14,38 @@ class NodalAnalysisException(Exception):
         self.floating_nodes = floating_nodes
         self.contradictional_elements = contradictional_elements
 
+def nodal_analysis_exception(e: mo.SolvingLineareEquationSystemFailed, label_mappings: NetworkLabelMappings) -> NodalAnalysisException:
+    N = label_mappings.node_mapping.N
+    return NodalAnalysisException(
+        message="Solving network with nodal analysis failed.",
+        floating_nodes=tuple(label_mappings.node_mapping.inverse.get(i, 'unknown') for i in e.zero_columns),
+        contradictional_elements=tuple(label_mappings.voltage_source_mapping.inverse.get(i-N, 'unknown') for i in e.dependent_columns)
+    )
+
+def check_network_topology(network: Network) -> None:
+    diagnostics = topology_diagnostics(network)
+    if diagnostics.is_solvable:
+        return
+    raise NodalAnalysisException(
+        message=f"Network topology is not solvable (floating nodes: {list(diagnostics.floating_nodes)}, contradictional elements: {list(diagnostics.contradictional_elements)}).",
+        floating_nodes=diagnostics.floating_nodes,
+        contradictional_elements=diagnostics.contradictional_elements
+    )
+
 def nodal_analysis_solution(network: Network, matrix_ops: mo.MatrixOperations = mo.NumPyMatrixOperations(), label_mappings_factory: LabelMappingsFactory = default_label_mappings_factory) -> tuple[complex | symbolic, ...]:
+    check_network_topology(network)
     label_mappings = label_mappings_factory(network)
-    A = nodal_analysis_coefficient_matrix(network, matrix_ops=matrix_ops, label_mappings=label_mappings)
-    b = nodal_analysis_constants_vector(network, matrix_ops=matrix_ops, label_mappings=label_mappings)
+    A, b = nodal_analysis_system(network, matrix_ops=matrix_ops, label_mappings=label_mappings)
     try:
         return matrix_ops.solve(A, b)
     except mo.SolvingLineareEquationSystemFailed as e:
-        inv_node_mapping = {v: k for v, k in zip(label_mappings.node_mapping.values, label_mappings.node_mapping.keys)}
-        inv_voltage_source_mapping = {v+len(inv_node_mapping): k for v, k in zip(label_mappings.voltage_source_mapping.values, label_mappings.voltage_source_mapping)}
-        raise NodalAnalysisException(
-            message="Solving network with nodal analysis failed.",
-            floating_nodes=tuple(inv_node_mapping.get(i, 'unknown') for i in e.zero_columns),
-            contradictional_elements=tuple(inv_voltage_source_mapping.get(i, 'unknown') for i in e.dependent_columns)
-        )
+        raise nodal_analysis_exception(e, label_mappings)
 
 def open_circuit_impedance(network: Network, node1: str, node2: str, matrix_ops: mo.MatrixOperations = mo.NumPyMatrixOperations(), label_mappings_factory: LabelMappingsFactory = default_label_mappings_factory) -> complex | symbolic:
     def retained_indices(matrix: mo.Matrix, axis: int) -> list[int]:
         return [i for i, has_element in enumerate(matrix_ops.any_element(matrix, axis=axis)) if has_element]
 
-    if node1 == node2:
-        return matrix_ops.elm(0).value
-    if any([b.element.is_ideal_voltage_source for b in network.branches_between(node1, node2)]):
+    if voltage_source_forest(network).connects(node1, node2):
         return matrix_ops.elm(0).value
     if network.is_zero_node(node1):
         node1, node2 = node2, node1
@@ -52,8 +62,20 @@ def open_circuit_impedance(network: Network, node1: str, node2: str, matrix_ops:
     rows_to_remove = [i for i in range(matrix_ops.shape(Y)[0]) if i not in retained_rows]
     Y = matrix_ops.delete(Y, columns_to_remove, axis=1)
     Y = matrix_ops.delete(Y, rows_to_remove, axis=0)
-    Z = matrix_ops.inv(Y)
-    return Z[retained_columns.index(i1), retained_rows.index(i1)]
+    row = retained_rows.index(i1)
+    e = matrix_ops.column_vector([1 if i == row else 0 for i in range(matrix_ops.shape(Y)[0])])
+    return matrix_ops.solve_functional(Y, e, {retained_columns.index(i1): 1})
+
+def port_injection_matrix(network: Network, ports: list[tuple[str, str]], label_mappings: NetworkLabelMappings) -> np.ndarray:
+    P = np.zeros((label_mappings.node_mapping.N + label_mappings.voltage_source_mapping.N, len(ports)))
+    for k, port in enumerate(ports):
+        for node, current in zip(port, (1, -1)):
+            if node == network.reference_node_label:
+                continue
+            if node not in label_mappings.node_mapping:
+                raise KeyError(f"Node '{node}' of port {port} is not part of the network.")
+            P[label_mappings.node_mapping[node], k] += current
+    return P
 
 def element_impedance(network: Network, element: str, matrix_ops: mo.MatrixOperations = mo.NumPyMatrixOperations(), label_mappings_factory: LabelMappingsFactory = default_label_mappings_factory) -> complex | symbolic:
     return open_circuit_impedance(
@@ -64,53 +86,62 @@ def element_impedance(network: Network, element: str, matrix_ops: mo.MatrixOpera
         label_mappings_factory=label_mappings_factory
     )
 
+def state_incidence_matrices(network: Network, c_values: Mapping[str, float | symbolic], l_values: Mapping[str, float | symbolic], matrix_ops: mo.MatrixOperations, label_mappings: NetworkLabelMappings) -> tuple[mo.Matrix, mo.Matrix]:
+    node_mapping = label_mappings.node_mapping
+    def element_incidence(label: str) -> dict[int, int]:
+        branch = network[label]
+        incidence = {}
+        if branch.node1 in node_mapping:
+            incidence[node_mapping[branch.node1]] = +1
+        if branch.node2 in node_mapping:
+            incidence[node_mapping[branch.node2]] = -1
+        return incidence
+    def source_incidence(label: str) -> dict[int, int]:
+        if label in label_mappings.current_source_mapping:
+            return {row: -value for row, value in element_incidence(label).items()}
+        return {node_mapping.N + label_mappings.voltage_source_mapping[label]: 1}
+    def incidence_matrix(columns: list[dict[int, int]]) -> mo.Matrix:
+        triplets = [(row, column, value) for column, incidence in enumerate(columns) for row, value in incidence.items()]
+        rows, cols, values = (list(t) for t in zip(*triplets)) if triplets else ([], [], [])
+        return matrix_ops.from_triplets((node_mapping.N + label_mappings.voltage_source_mapping.N, len(columns)), rows, cols, values)
+
+    sources = label_mappings.source_and_inductance_mapping
+    DQ = incidence_matrix([element_incidence(c) for c in c_values] + [source_incidence(l) for l in sources if l in l_values])
+    QS = incidence_matrix([source_incidence(l) for l in sources if l not in l_values])
+    return DQ, QS
+
 def state_space_matrices(network: Network, c_values: Mapping[str, float | symbolic] = {}, l_values: Mapping[str, float | symbolic] = {}, matrix_ops: mo.MatrixOperations = mo.NumPyMatrixOperations(), label_mappings_factory: LabelMappingsFactory = default_label_mappings_factory) -> tuple[mo.Matrix, mo.Matrix, mo.Matrix, mo.Matrix]:
+    def diag(values: list[Any]) -> mo.Matrix:
+        return matrix_ops.from_triplets((len(values), len(values)), list(range(len(values))), list(range(len(values))), values)
+    def zeros(shape: tuple[int, int]) -> mo.Matrix:
+        return matrix_ops.from_triplets(shape, [], [], [])
+
     label_mappings = label_mappings_factory(network)
-    def element_incidence_matrix(values: Mapping[str, float | symbolic]) -> np.ndarray:
-        Delta = np.zeros((len(values), label_mappings.node_mapping.N))
-        for (k, value), (i_label) in itertools.product(enumerate(values), label_mappings.node_mapping):
-            if i_label == network[value].node1:
-                Delta[k][label_mappings.node_mapping(i_label)] = +1
-            if i_label == network[value].node2:
-                Delta[k][label_mappings.node_mapping(i_label)] = -1
-        return np.hstack((Delta, np.zeros((Delta.shape[0], label_mappings.voltage_source_mapper(network).N))))
-    def source_and_inductance_incidence_matrix(values: Mapping[str, float | symbolic]) -> tuple[np.ndarray, np.ndarray]:
-        Qi = source_incidence_matrix(network=network, label_mappings=label_mappings)
-        Q = np.zeros((label_mappings.voltage_source_mapping.N, label_mappings.voltage_source_mapping.N), dtype=int)
-        for i in label_mappings.voltage_source_mapping.values:
-            Q[i][i] = 1
-        Q = np.vstack((np.hstack( (Qi, np.zeros((Qi.shape[0], Q.shape[1]) ))),
-                    np.hstack( (np.zeros((Q.shape[0], Qi.shape[1])), Q) )))
-        source_mapping = label_mappings.source_and_inductance_mapping
-
-        def incidence_column(label: str) -> int:
-            if label in label_mappings.current_source_mapping.keys:
-                return label_mappings.current_source_mapping[label]
-            return label_mappings.current_source_mapping.N + label_mappings.voltage_source_mapping[label]
-
-        QS = Q[:,[incidence_column(l) for l in source_mapping if l not in values]]
-        QL = Q[:,[incidence_column(l) for l in source_mapping if l in values]]
-        return QS, QL
-    def value_matrix(c_values: Mapping[str, float | symbolic], l_values: Mapping[str, float | symbolic]) -> np.ndarray:
-        return matrix_ops.vstack((
-            matrix_ops.hstack(( matrix_ops.diag([-C for C in c_values.values()]), matrix_ops.zeros((len(c_values), len(l_values))) )), # type: ignore
-            matrix_ops.hstack(( matrix_ops.zeros((len(l_values), len(c_values))), matrix_ops.diag([L for L in l_values.values()]) ))
-        ))
-
-    Delta = element_incidence_matrix(c_values)
+    DQ, QS = state_incidence_matrices(network, c_values, l_values, matrix_ops, label_mappings)
     A_tilde = nodal_analysis_coefficient_matrix(network, matrix_ops=matrix_ops, label_mappings=label_mappings)
-    QS, QL = source_and_inductance_incidence_matrix(l_values)
-    DQ = np.hstack((Delta.T, QL))
-    Lambda = value_matrix(c_values, l_values)
-    invLambda = matrix_ops.diag([1/L for L in matrix_ops.diag_vec(Lambda)]) # type: ignore
+    invLambda = diag([-1/C for C in c_values.values()] + [1/L for L in l_values.values()])
+    n, n_states, n_sources = matrix_ops.shape(A_tilde)[0], len(c_values) + len(l_values), matrix_ops.shape(QS)[1]
 
-    inv_A_tilde = matrix_ops.inv(A_tilde)
-    transformed_inv_A_tilde = DQ.T @ inv_A_tilde
-    sorted_A_tilde = matrix_ops.inv(transformed_inv_A_tilde @ DQ)
+    K = matrix_ops.vstack((
+        matrix_ops.hstack((A_tilde, DQ)),
+        matrix_ops.hstack((DQ.T, zeros((n_states, n_states))))
+    ))
+    Y = matrix_ops.solve_matrix(K, matrix_ops.vstack((
+        matrix_ops.hstack((zeros((n, n_states)), QS)),
+        matrix_ops.hstack((diag([1]*n_states), zeros((n_states, n_sources))))
+    )))
 
-    A = invLambda @ sorted_A_tilde
-    C = transformed_inv_A_tilde.T @ sorted_A_tilde
-    B = (-invLambda @ C.T) @ QS
-    D = (inv_A_tilde - transformed_inv_A_tilde.T @ C.T) @ QS
+    A = -invLambda @ Y[n:, :n_states]
+    B = -invLambda @ Y[n:, n_states:]
+    C = Y[:n, :n_states]
+    D = Y[:n, n_states:]
 
     return A, B, C, D
+
+def descriptor_matrices(network: Network, c_values: Mapping[str, float] = {}, l_values: Mapping[str, float] = {}, matrix_ops: mo.MatrixOperations = mo.SciPySparseMatrixOperations(), label_mappings_factory: LabelMappingsFactory = default_label_mappings_factory) -> tuple[mo.Matrix, mo.Matrix, mo.Matrix, mo.Matrix]:
+    label_mappings = label_mappings_factory(network)
+    DQ, QS = state_incidence_matrices(network, c_values, l_values, matrix_ops, label_mappings)
+    A_tilde = nodal_analysis_coefficient_matrix(network, matrix_ops=matrix_ops, label_mappings=label_mappings)
+    values = [-C for C in c_values.values()] + [L for L in l_values.values()]
+    Lambda = matrix_ops.from_triplets((len(values), len(values)), list(range(len(values))), list(range(len(values))), values) # type: ignore
+    return -(DQ @ Lambda @ DQ.T), -A_tilde, QS, DQ
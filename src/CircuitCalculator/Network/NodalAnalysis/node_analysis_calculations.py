@@ -1,15 +1,11 @@
 import numpy as np
-import itertools
-from typing import Any, Callable
+from dataclasses import dataclass, field
+from typing import Any
 from ..network import Branch, Network
 from . import matrix_operations as mo
 from .. import transformers as trf
 from .label_mapping import NetworkLabelMappings
 
-class DimensionError(Exception):
-    ...
-
-
 class InvalidControlledSource(Exception):
     ...
 
@@ -61,7 +57,7 @@ def branch_current_terms(
     voltage_source_terms: dict[str, mo.MatrixElement] = {}
     constant = matrix_ops.elm(0)
 
-    if branch_id in label_mappings.voltage_source_mapping.keys:
+    if branch_id in label_mappings.voltage_source_mapping:
         voltage_source_terms[branch_id] = matrix_ops.elm(1)
         return node_terms, voltage_source_terms, constant
 
@@ -86,283 +82,142 @@ def branch_current_terms(
     return node_terms, voltage_source_terms, constant
 
 
-def admittance_connected_to(network: Network, node: str, me: Callable[[Any], mo.MatrixElement]) -> complex:
-    admittances = [me(getattr(b.element, 'Y', 0)) for b in network.branches_connected_to(node)]
-    return sum([e.value for e in admittances if e.isfinite])
-
-
-def admittance_between(network: Network, node1: str, node2: str, me: Callable[[Any], mo.MatrixElement]) -> complex:
-    admittances = [me(getattr(b.element, 'Y', 0)) for b in network.branches_between(node1, node2)]
-    return sum([e.value for e in admittances if e.isfinite])
-
-
-def voltage_controlled_current_source_matrix(
-    network: Network,
-    matrix_ops: mo.MatrixOperations,
-    label_mappings: NetworkLabelMappings,
-) -> mo.Matrix:
-    def stamp(source: Branch) -> None:
-        transconductance = matrix_ops.elm(source.element.transconductance).value
-        control_nodes = ((source.element.control_node1, 1), (source.element.control_node2, -1))
-        for output_node, output_sign in output_nodes(source):
-            row = node_index(network, label_mappings, output_node)
-            if row is None:
-                continue
-            for control_node, control_sign in control_nodes:
-                column = node_index(network, label_mappings, control_node, "Control node")
-                if column is None:
-                    continue
-                Y[row, column] += output_sign*control_sign*transconductance
-
-    node_mapping = label_mappings.node_mapper(network)
-    Y = matrix_ops.zeros((node_mapping.N, node_mapping.N))
-    for branch in network.branches:
-        if branch.element.is_voltage_controlled_current_source:
-            stamp(branch)
-    return Y
-
+def source_incidence_matrix(network: Network, label_mappings: NetworkLabelMappings) -> np.ndarray:
+    node_index = label_mappings.node_mapping
+    cs_index = label_mappings.current_source_mapping
+    Q = np.zeros((node_index.N, cs_index.N))
+    for cs in cs_index.keys:
+        source_element = network[cs]
+        if network.reference_node_label != source_element.node1:
+            Q[node_index[source_element.node1]][cs_index[cs]] = -1
+        if network.reference_node_label != network[cs].node2:
+            Q[node_index[source_element.node2]][cs_index[cs]] = 1
+    return Q
 
-def current_controlled_current_source_incidence_matrix(
-    network: Network,
-    matrix_ops: mo.MatrixOperations,
-    label_mappings: NetworkLabelMappings,
-) -> mo.Matrix:
-    def stamp(source: Branch) -> None:
-        current_gain = matrix_ops.elm(source.element.current_gain).value
-        _, voltage_source_terms, _ = branch_current_terms(
-            network,
-            matrix_ops,
-            label_mappings,
-            source.element.control_branch,
-        )
-        for output_node, output_sign in output_nodes(source):
-            row = node_index(network, label_mappings, output_node)
-            if row is None:
-                continue
-            for voltage_source, coefficient in voltage_source_terms.items():
-                column = label_mappings.voltage_source_mapping[voltage_source]
-                B[row, column] += output_sign*current_gain*coefficient.value
+@dataclass
+class MatrixStamps:
+    shape: tuple[int, int]
+    rows: list[int] = field(default_factory=list)
+    columns: list[int] = field(default_factory=list)
+    values: list[Any] = field(default_factory=list)
 
-    node_mapping = label_mappings.node_mapper(network)
-    B = matrix_ops.zeros((node_mapping.N, label_mappings.voltage_source_mapping.N))
-    for branch in network.branches:
-        if branch.element.is_current_controlled_current_source:
-            stamp(branch)
-    return B
+    def add(self, row: int | None, column: int | None, value: Any) -> None:
+        if row is None or column is None:
+            return
+        self.rows.append(row)
+        self.columns.append(column)
+        self.values.append(value)
 
+    def to_matrix(self, matrix_ops: mo.MatrixOperations) -> mo.Matrix:
+        return matrix_ops.from_triplets(self.shape, self.rows, self.columns, self.values)
 
-def current_controlled_current_source_admittance_matrix(
-    network: Network,
-    matrix_ops: mo.MatrixOperations,
-    label_mappings: NetworkLabelMappings,
-) -> mo.Matrix:
-    def stamp(source: Branch) -> None:
-        current_gain = matrix_ops.elm(source.element.current_gain).value
-        node_terms, _, _ = branch_current_terms(
-            network,
-            matrix_ops,
-            label_mappings,
-            source.element.control_branch,
-        )
-        for output_node, output_sign in output_nodes(source):
-            row = node_index(network, label_mappings, output_node)
-            if row is None:
-                continue
-            for node, coefficient in node_terms.items():
-                column = node_index(network, label_mappings, node)
-                if column is None:
-                    continue
-                Y[row, column] += output_sign*current_gain*coefficient.value
 
-    node_mapping = label_mappings.node_mapper(network)
-    Y = matrix_ops.zeros((node_mapping.N, node_mapping.N))
-    for branch in network.branches:
-        if branch.element.is_current_controlled_current_source:
-            stamp(branch)
-    return Y
+@dataclass(frozen=True)
+class NodalAnalysisStamps:
+    coefficients: MatrixStamps
+    constants: MatrixStamps
 
 
-def current_controlled_current_source_vector(
+def nodal_analysis_stamps(
     network: Network,
     matrix_ops: mo.MatrixOperations,
     label_mappings: NetworkLabelMappings,
-) -> mo.Matrix:
-    def stamp(source: Branch) -> None:
-        current_gain = matrix_ops.elm(source.element.current_gain).value
-        _, _, constant = branch_current_terms(
-            network,
-            matrix_ops,
-            label_mappings,
-            source.element.control_branch,
-        )
-        for output_node, output_sign in output_nodes(source):
+) -> NodalAnalysisStamps:
+    node_mapping = label_mappings.node_mapping
+    voltage_source_mapping = label_mappings.voltage_source_mapping
+    N, M = node_mapping.N, voltage_source_mapping.N
+    A = MatrixStamps((N+M, N+M))
+    b = MatrixStamps((N+M, 1))
+
+    def node_row(node: str) -> int | None:
+        return node_mapping.mapping.get(node)
+
+    def voltage_source_row(branch_id: str) -> int:
+        return N + voltage_source_mapping[branch_id]
+
+    def stamp_admittance(branch: Branch, passive_branch: Branch) -> None:
+        admittance = matrix_ops.elm(getattr(passive_branch.element, 'Y', 0))
+        if not admittance.isfinite:
+            return
+        i, j = node_row(branch.node1), node_row(branch.node2)
+        A.add(i, i, admittance.value)
+        if branch.node1 == branch.node2:
+            return
+        A.add(j, j, admittance.value)
+        A.add(i, j, -admittance.value)
+        A.add(j, i, -admittance.value)
+
+    def stamp_current_source(branch: Branch) -> None:
+        if not branch.element.is_current_source:
+            return
+        current = matrix_ops.elm(branch.element.I).value
+        b.add(node_row(branch.node1), 0, -current)
+        b.add(node_row(branch.node2), 0, current)
+
+    def stamp_voltage_source(branch: Branch) -> None:
+        k = voltage_source_row(branch.id)
+        for node, sign in output_nodes(branch):
+            A.add(node_row(node), k, sign)
+            A.add(k, node_row(node), sign)
+            if branch.node1 == branch.node2:
+                break
+        if not branch.element.is_controlled_voltage_source:
+            b.add(k, 0, matrix_ops.elm(branch.element.V).value)
+
+    def stamp_control_nodes(row: int, element: Any, factor: Any) -> None:
+        for control_node, control_sign in ((element.control_node1, 1), (element.control_node2, -1)):
+            A.add(row, node_index(network, label_mappings, control_node, "Control node"), control_sign*factor)
+
+    def stamp_control_branch(row: int, terms: tuple[dict[str, mo.MatrixElement], dict[str, mo.MatrixElement], mo.MatrixElement], factor: Any) -> None:
+        node_terms, voltage_source_terms, constant = terms
+        for node, coefficient in node_terms.items():
+            A.add(row, node_index(network, label_mappings, node), factor*coefficient.value)
+        for voltage_source, coefficient in voltage_source_terms.items():
+            A.add(row, voltage_source_row(voltage_source), factor*coefficient.value)
+        b.add(row, 0, -factor*constant.value)
+
+    def stamp_controlled_current_source(branch: Branch) -> None:
+        element = branch.element
+        if element.is_current_controlled_current_source:
+            terms = branch_current_terms(network, matrix_ops, label_mappings, element.control_branch)
+        for output_node, output_sign in output_nodes(branch):
             row = node_index(network, label_mappings, output_node)
             if row is None:
                 continue
-            I[row, 0] += -output_sign*current_gain*constant.value
-
-    node_mapping = label_mappings.node_mapper(network)
-    I = matrix_ops.zeros((node_mapping.N, 1))
-    for branch in network.branches:
-        if branch.element.is_current_controlled_current_source:
-            stamp(branch)
-    return I
-
-
-def voltage_controlled_voltage_source_constraint_matrix(
-    network: Network,
-    matrix_ops: mo.MatrixOperations,
-    label_mappings: NetworkLabelMappings,
-) -> mo.Matrix:
-    def stamp(source: Branch) -> None:
-        voltage_gain = matrix_ops.elm(source.element.voltage_gain).value
-        row = label_mappings.voltage_source_mapping[source.id]
-        control_nodes = ((source.element.control_node1, 1), (source.element.control_node2, -1))
-        for control_node, control_sign in control_nodes:
-            column = node_index(network, label_mappings, control_node, "Control node")
-            if column is None:
-                continue
-            A[row, column] += -control_sign*voltage_gain
-
-    A = matrix_ops.zeros((label_mappings.voltage_source_mapping.N, label_mappings.node_mapping.N))
-    for branch in network.branches:
-        if branch.element.is_voltage_controlled_voltage_source:
-            stamp(branch)
-    return A
-
-
-def current_controlled_voltage_source_constraint_matrix(
-    network: Network,
-    matrix_ops: mo.MatrixOperations,
-    label_mappings: NetworkLabelMappings,
-) -> tuple[mo.Matrix, mo.Matrix]:
-    def stamp(source: Branch) -> None:
-        transresistance = matrix_ops.elm(source.element.transresistance).value
-        node_terms, voltage_source_terms, _ = branch_current_terms(
-            network,
-            matrix_ops,
-            label_mappings,
-            source.element.control_branch,
-        )
-        row = label_mappings.voltage_source_mapping[source.id]
-        for node, coefficient in node_terms.items():
-            column = node_index(network, label_mappings, node)
-            if column is None:
-                continue
-            A[row, column] += -transresistance*coefficient.value
-        for voltage_source, coefficient in voltage_source_terms.items():
-            column = label_mappings.voltage_source_mapping[voltage_source]
-            Z[row, column] += -transresistance*coefficient.value
+            if element.is_voltage_controlled_current_source:
+                stamp_control_nodes(row, element, output_sign*matrix_ops.elm(element.transconductance).value)
+            if element.is_current_controlled_current_source:
+                stamp_control_branch(row, terms, output_sign*matrix_ops.elm(element.current_gain).value)
+
+    def stamp_controlled_voltage_source(branch: Branch) -> None:
+        element = branch.element
+        row = voltage_source_row(branch.id)
+        if element.is_voltage_controlled_voltage_source:
+            stamp_control_nodes(row, element, -matrix_ops.elm(element.voltage_gain).value)
+        if element.is_current_controlled_voltage_source:
+            terms = branch_current_terms(network, matrix_ops, label_mappings, element.control_branch)
+            stamp_control_branch(row, terms, -matrix_ops.elm(element.transresistance).value)
 
-    A = matrix_ops.zeros((label_mappings.voltage_source_mapping.N, label_mappings.node_mapping.N))
-    Z = matrix_ops.zeros((label_mappings.voltage_source_mapping.N, label_mappings.voltage_source_mapping.N))
-    for branch in network.branches:
-        if branch.element.is_current_controlled_voltage_source:
-            stamp(branch)
-    return A, Z
-
-
-def current_controlled_voltage_source_vector(
-    network: Network,
-    matrix_ops: mo.MatrixOperations,
-    label_mappings: NetworkLabelMappings,
-) -> mo.Matrix:
-    def stamp(source: Branch) -> None:
-        transresistance = matrix_ops.elm(source.element.transresistance).value
-        _, _, constant = branch_current_terms(
-            network,
-            matrix_ops,
-            label_mappings,
-            source.element.control_branch,
-        )
-        row = label_mappings.voltage_source_mapping[source.id]
-        V[row, 0] += transresistance*constant.value
-
-    V = matrix_ops.zeros((label_mappings.voltage_source_mapping.N, 1))
-    for branch in network.branches:
-        if branch.element.is_current_controlled_voltage_source:
-            stamp(branch)
-    return V
-
-
-def node_admittance_matrix(network: Network, matrix_ops: mo.MatrixOperations, label_mappings: NetworkLabelMappings) -> mo.Matrix:
-    def node_matrix_element(i_label:str, j_label:str) -> complex:
-        if i_label == j_label:
-            return admittance_connected_to(passive_network, i_label, matrix_ops.elm)
-        return -admittance_between(passive_network, i_label, j_label, matrix_ops.elm)
-    node_mapping = label_mappings.node_mapper(network)
     passive_network = trf.remove_active_elements(network)
-    Y = matrix_ops.zeros((node_mapping.N, node_mapping.N))
-    for i_label, j_label in itertools.product(node_mapping, repeat=2):
-        Y[node_mapping(i_label, j_label)] = node_matrix_element(i_label, j_label)
-    return (
-        Y
-        + voltage_controlled_current_source_matrix(network, matrix_ops, label_mappings)
-        + current_controlled_current_source_admittance_matrix(network, matrix_ops, label_mappings)
-    )
-
-def voltage_source_incidence_matrix(network: Network, matrix_ops: mo.MatrixOperations, label_mappings: NetworkLabelMappings) -> mo.Matrix:
-    def voltage_source_direction(voltage_source: str, node: str) -> int:
-        if network[voltage_source].node1 == node:
-            return 1
-        if network[voltage_source].node2 == node:
-            return -1
-        return 0
-    node_index = label_mappings.node_mapper(network)
-    A = matrix_ops.zeros((node_index.N, label_mappings.voltage_source_mapping.N))
-    for node, vs in itertools.product(node_index.keys, label_mappings.voltage_source_mapping.keys):
-        A[node_index[node], label_mappings.voltage_source_mapping[vs]] = voltage_source_direction(vs, node)
-    return A
+    for branch, passive_branch in zip(network.branches, passive_network.branches):
+        if branch.element.is_controlled_current_source:
+            stamp_controlled_current_source(branch)
+        elif branch.id in voltage_source_mapping:
+            stamp_voltage_source(branch)
+            if branch.element.is_controlled_voltage_source:
+                stamp_controlled_voltage_source(branch)
+        elif is_norten_thevenin_element(branch.element):
+            stamp_admittance(branch, passive_branch)
+            stamp_current_source(branch)
+    return NodalAnalysisStamps(coefficients=A, constants=b)
 
 def nodal_analysis_coefficient_matrix(
     network: Network,
     matrix_ops: mo.MatrixOperations,
     label_mappings: NetworkLabelMappings,
 ) -> mo.Matrix:
-    Y = node_admittance_matrix(network, matrix_ops, label_mappings)
-    B = voltage_source_incidence_matrix(network, matrix_ops, label_mappings)
-    B_top = B + current_controlled_current_source_incidence_matrix(
-        network,
-        matrix_ops,
-        label_mappings,
-    )
-    A_vcvs = voltage_controlled_voltage_source_constraint_matrix(network, matrix_ops, label_mappings)
-    A_ccvs, Z_ccvs = current_controlled_voltage_source_constraint_matrix(network, matrix_ops, label_mappings)
-    Z = matrix_ops.zeros((B.shape[1], B.shape[1])) + Z_ccvs
-    return matrix_ops.vstack((
-        matrix_ops.hstack((Y, B_top)),
-        matrix_ops.hstack((B.T + A_vcvs + A_ccvs, Z)),
-    ))
-
-def source_incidence_matrix(network: Network, label_mappings: NetworkLabelMappings) -> np.ndarray:
-    node_index = label_mappings.node_mapper(network)
-    cs_index = label_mappings.current_source_mapper(network)
-    Q = np.zeros((node_index.N, cs_index.N))
-    for cs in cs_index.keys:
-        source_element = network[cs]
-        if network.reference_node_label != source_element.node1:
-            Q[node_index[source_element.node1]][cs_index[cs]] = -1
-        if network.reference_node_label != network[cs].node2:
-            Q[node_index[source_element.node2]][cs_index[cs]] = 1
-    return Q
+    return nodal_analysis_stamps(network, matrix_ops, label_mappings).coefficients.to_matrix(matrix_ops)
 
-def current_source_vector(network: Network, matrix_ops: mo.MatrixOperations, label_mappings: NetworkLabelMappings) -> mo.Matrix:
-    cs_index = label_mappings.current_source_mapping.filter_keys(lambda x: network[x].element.is_current_source)
-    return matrix_ops.column_vector([network[x].element.I for x in cs_index.keys])
-
-def current_source_incidence_vector(network: Network, matrix_ops: mo.MatrixOperations, label_mappings: NetworkLabelMappings) -> np.ndarray:
-    Q = source_incidence_matrix(network, label_mappings)
-    Is = current_source_vector(network, matrix_ops, label_mappings)
-    return Q@Is
-
-def nodal_analysis_constants_vector(network: Network, matrix_ops: mo.MatrixOperations, label_mappings: NetworkLabelMappings) -> mo.Matrix:
-    I = (
-        current_source_incidence_vector(network, matrix_ops, label_mappings)
-        + current_controlled_current_source_vector(network, matrix_ops, label_mappings)
-    )
-    V = matrix_ops.column_vector([
-        network[vs].element.V if not network[vs].element.is_controlled_voltage_source else 0
-        for vs in label_mappings.voltage_source_mapping.keys
-    ])
-    V = V + current_controlled_voltage_source_vector(network, matrix_ops, label_mappings)
-    return matrix_ops.vstack((I, V))
+def nodal_analysis_system(network: Network, matrix_ops: mo.MatrixOperations, label_mappings: NetworkLabelMappings) -> tuple[mo.Matrix, mo.Matrix]:
+    stamps = nodal_analysis_stamps(network, matrix_ops, label_mappings)
+    return stamps.coefficients.to_matrix(matrix_ops), stamps.constants.to_matrix(matrix_ops)
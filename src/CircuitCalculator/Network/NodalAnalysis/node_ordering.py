@@ -0,0 +1,123 @@
+import numpy as np
+import scipy.sparse
+import scipy.sparse.csgraph
+import scipy.sparse.linalg
+from functools import lru_cache
+from typing import Callable
+from ..network import Network
+from .label_mapping import (
+    LabelMapper,
+    LabelMapping,
+    NetworkLabelMappings,
+    alphabetic_current_source_mapper,
+    alphabetic_source_mapper,
+    alphabetic_voltage_source_mapper,
+)
+
+NodeOrder = Callable[[scipy.sparse.csr_matrix], np.ndarray]
+GraphKey = tuple[bytes, bytes, tuple[int, int], str]
+
+def coupled_node_pairs(network: Network) -> list[tuple[str, str]]:
+    pairs = []
+    for id in network.branch_ids:
+        branch = network[id]
+        pairs.append((branch.node1, branch.node2))
+        if not branch.element.is_controlled_source:
+            continue
+        if hasattr(branch.element, 'control_branch'):
+            control_branch = network.topology.branch_index.get(branch.element.control_branch)
+            if control_branch is None:
+                continue
+            control_nodes = (control_branch.node1, control_branch.node2)
+        else:
+            control_nodes = (branch.element.control_node1, branch.element.control_node2)
+        pairs.extend((node, control_node) for node in (branch.node1, branch.node2) for control_node in control_nodes)
+    return pairs
+
+def node_graph(network: Network) -> tuple[list[str], scipy.sparse.csr_matrix]:
+    labels = sorted(label for label in network.node_labels if label != network.reference_node_label)
+    index = {label: i for i, label in enumerate(labels)}
+    edges = [(index[n1], index[n2]) for n1, n2 in coupled_node_pairs(network) if n1 in index and n2 in index and n1 != n2]
+    rows, columns = (np.array(c, dtype=int) for c in zip(*edges)) if edges else (np.zeros(0, dtype=int), np.zeros(0, dtype=int))
+    graph = scipy.sparse.csr_matrix((np.ones(2*len(edges)), (np.concatenate((rows, columns)), np.concatenate((columns, rows)))), shape=(len(labels), len(labels)))
+    graph.data[:] = 1
+    return labels, graph
+
+def reverse_cuthill_mckee_order(graph: scipy.sparse.csr_matrix) -> np.ndarray:
+    return np.asarray(scipy.sparse.csgraph.reverse_cuthill_mckee(graph, symmetric_mode=True))
+
+def graph_key(graph: scipy.sparse.csr_matrix) -> GraphKey:
+    graph = scipy.sparse.csr_matrix(graph)
+    graph.sum_duplicates()
+    graph.sort_indices()
+    return graph.indices.tobytes(), graph.indptr.tobytes(), graph.shape, graph.indices.dtype.str
+
+def minimum_degree_order(graph: scipy.sparse.csr_matrix) -> np.ndarray:
+    return _minimum_degree_order(graph_key(graph)).copy()
+
+@lru_cache(maxsize=32)
+def _minimum_degree_order(key: GraphKey) -> np.ndarray:
+    indices, indptr, (n, _), index_dtype = key
+    if n == 0:
+        return np.zeros(0, dtype=int)
+    indices_array = np.frombuffer(indices, dtype=index_dtype)
+    graph = scipy.sparse.csr_matrix((np.ones(len(indices_array)), indices_array, np.frombuffer(indptr, dtype=index_dtype)), shape=(n, n))
+    degree = np.asarray(graph.sum(axis=1)).reshape(-1)
+    laplacian = scipy.sparse.csc_matrix(scipy.sparse.diags(degree + 1) - graph)
+    lu = scipy.sparse.linalg.splu(laplacian, permc_spec='MMD_AT_PLUS_A', diag_pivot_thresh=0, options={'SymmetricMode': True})
+    return np.argsort(lu.perm_c)
+
+def pseudo_peripheral_levels(graph: scipy.sparse.csr_matrix) -> np.ndarray:
+    levels = scipy.sparse.csgraph.shortest_path(graph, unweighted=True, indices=0)
+    for _ in range(4):
+        start = int(np.argmax(levels))
+        next_levels = scipy.sparse.csgraph.shortest_path(graph, unweighted=True, indices=start)
+        if next_levels.max() <= levels.max():
+            return next_levels
+        levels = next_levels
+    return levels
+
+def nested_dissection_order(graph: scipy.sparse.csr_matrix, leaf_size: int = 64) -> np.ndarray:
+    order: list[np.ndarray] = []
+    def dissect(nodes: np.ndarray) -> None:
+        if len(nodes) <= leaf_size:
+            order.append(nodes)
+            return
+        subgraph = graph[nodes][:, nodes]
+        n_components, component = scipy.sparse.csgraph.connected_components(subgraph, directed=False)
+        if n_components > 1:
+            for k in range(n_components):
+                dissect(nodes[component == k])
+            return
+        levels = pseudo_peripheral_levels(subgraph)
+        middle = int(levels.max())//2
+        if middle == 0:
+            order.append(nodes)
+            return
+        dissect(nodes[levels < middle])
+        dissect(nodes[levels > middle])
+        order.append(nodes[levels == middle])
+    dissect(np.arange(graph.shape[0]))
+    return np.concatenate(order) if order else np.zeros(0, dtype=int)
+
+def ordered_node_mapper(node_order: NodeOrder) -> LabelMapper:
+    def node_mapper(network: Network) -> LabelMapping:
+        labels, graph = node_graph(network)
+        return LabelMapping({labels[i]: k for k, i in enumerate(node_order(graph))})
+    return node_mapper
+
+def ordered_label_mappings_factory(node_order: NodeOrder) -> Callable[[Network], NetworkLabelMappings]:
+    node_mapper = ordered_node_mapper(node_order)
+    def label_mappings_factory(network: Network) -> NetworkLabelMappings:
+        return NetworkLabelMappings(
+            network=network,
+            node_mapper=node_mapper,
+            source_mapper=alphabetic_source_mapper,
+            current_source_mapper=alphabetic_current_source_mapper,
+            voltage_source_mapper=alphabetic_voltage_source_mapper
+        )
+    return label_mappings_factory
+
+reverse_cuthill_mckee_label_mappings_factory = ordered_label_mappings_factory(reverse_cuthill_mckee_order)
+minimum_degree_label_mappings_factory = ordered_label_mappings_factory(minimum_degree_order)
+nested_dissection_label_mappings_factory = ordered_label_mappings_factory(nested_dissection_order)
@@ -1,4 +1,5 @@
-from typing import Any
+from typing import Any, Mapping
+from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from functools import cached_property
 import numpy as np
@@ -7,31 +8,21 @@ from ..solution import NetworkSolution, NetworkSolutionException
 from . import matrix_operations as mo
 from . import label_mapping as map
 from . import node_analysis as na
+from . import node_ordering
+from .node_analysis_calculations import nodal_analysis_system
 
-@dataclass(frozen=True)
-class NodalAnalysisSolution:
+class NodalAnalysisQuantities(ABC):
     network: Network
-    solution_vector: tuple
-    label_mappings_factory: map.LabelMappingsFactory
-
-    @cached_property
-    def label_mappings(self) -> map.NetworkLabelMappings:
-        return self.label_mappings_factory(self.network)
 
-    @cached_property
-    def _potentials(self) -> tuple:
-        return tuple(self.solution_vector[i] for i in sorted(self.label_mappings.node_mapping.values))
+    @property
+    @abstractmethod
+    def label_mappings(self) -> map.NetworkLabelMappings: ...
 
-    @cached_property
-    def _voltage_source_currents(self) -> tuple:
-        all_indices = set(range(len(self.solution_vector)))
-        remaining_indices = all_indices - set(self.label_mappings.node_mapping.values)
-        return tuple(self.solution_vector[i] for i in sorted(remaining_indices))
+    @abstractmethod
+    def get_potential(self, node_id: str) -> Any: ...
 
-    def get_potential(self, node_id: str) -> complex:
-        if node_id == self.network.reference_node_label:
-            return 0
-        return self._potentials[self.label_mappings.node_mapping[node_id]]
+    @abstractmethod
+    def _voltage_source_current(self, branch_id: str) -> Any: ...
 
     def get_current(self, branch_id: str) -> complex:
         if self.network[branch_id].element.is_voltage_controlled_current_source:
@@ -41,8 +32,8 @@ class NodalAnalysisSolution:
         if self.network[branch_id].element.is_current_controlled_current_source:
             element = self.network[branch_id].element
             return element.current_gain*self.get_current(element.control_branch)
-        if branch_id in self.label_mappings.voltage_source_mapping.keys:
-            return self._voltage_source_currents[self.label_mappings.voltage_source_mapping[branch_id]]
+        if branch_id in self.label_mappings.voltage_source_mapping:
+            return self._voltage_source_current(branch_id)
         if self.network[branch_id].element.is_ideal_current_source:
             return complex(self.network[branch_id].element.I)
         if self.network[branch_id].element.is_current_source:
@@ -58,19 +49,133 @@ class NodalAnalysisSolution:
     def get_power(self, branch_id: str) -> Any:
         return self.get_voltage(branch_id)*self.get_current(branch_id).conjugate()
 
-def numeric_nodal_analysis_bias_point_solution(network: Network, label_mappings_factory: map.LabelMappingsFactory = map.default_label_mappings_factory) -> NetworkSolution:
+@dataclass(frozen=True)
+class NodalAnalysisSolution(NodalAnalysisQuantities):
+    network: Network
+    solution_vector: tuple
+    label_mappings_factory: map.LabelMappingsFactory
+
+    @cached_property
+    def label_mappings(self) -> map.NetworkLabelMappings:
+        return self.label_mappings_factory(self.network)
+
+    @cached_property
+    def _potentials(self) -> tuple:
+        return tuple(self.solution_vector[i] for i in sorted(self.label_mappings.node_mapping.values))
+
+    @cached_property
+    def _voltage_source_currents(self) -> tuple:
+        all_indices = set(range(len(self.solution_vector)))
+        remaining_indices = all_indices - set(self.label_mappings.node_mapping.values)
+        return tuple(self.solution_vector[i] for i in sorted(remaining_indices))
+
+    def get_potential(self, node_id: str) -> complex:
+        if node_id == self.network.reference_node_label:
+            return 0
+        return self._potentials[self.label_mappings.node_mapping[node_id]]
+
+    def _voltage_source_current(self, branch_id: str) -> complex:
+        return self._voltage_source_currents[self.label_mappings.voltage_source_mapping[branch_id]]
+
+@dataclass(frozen=True)
+class NodalAnalysisTransientSolution(NodalAnalysisSolution):
+    inputs: Mapping[str, np.ndarray]
+    capacitor_currents: Mapping[str, np.ndarray]
+
+    def get_potential(self, node_id: str) -> np.ndarray:
+        if node_id == self.network.reference_node_label:
+            return np.zeros(np.shape(self.solution_vector)[1])
+        return self._potentials[self.label_mappings.node_mapping[node_id]]
+
+    def get_current(self, branch_id: str) -> np.ndarray:
+        if branch_id in self.capacitor_currents:
+            return self.capacitor_currents[branch_id]
+        element = self.network[branch_id].element
+        if branch_id in self.inputs and element.is_ideal_current_source:
+            return self.inputs[branch_id]
+        if branch_id in self.inputs and element.is_current_source:
+            return - (self.inputs[branch_id] + self.get_voltage(branch_id)/element.Z)
+        return super().get_current(branch_id)
+
+@dataclass(frozen=True)
+class NodalAnalysisQuerySolution(NodalAnalysisQuantities):
+    """Solves only for the queried quantities. The empty query is solved on construction, so singular systems raise MatrixInversionException right away."""
+    network: Network
+    matrix_ops: mo.MatrixOperations
+    label_mappings_factory: map.LabelMappingsFactory
+
+    def __post_init__(self) -> None:
+        self._query({})
+
+    @cached_property
+    def label_mappings(self) -> map.NetworkLabelMappings:
+        return self.label_mappings_factory(self.network)
+
+    @cached_property
+    def _system(self) -> tuple[mo.Matrix, mo.Matrix]:
+        return nodal_analysis_system(self.network, matrix_ops=self.matrix_ops, label_mappings=self.label_mappings)
+
+    @cached_property
+    def _queries(self) -> dict[tuple[tuple[int, Any], ...], Any]:
+        return {}
+
+    def _query(self, weights: dict[int, Any]) -> Any:
+        key = tuple(sorted(weights.items()))
+        if key not in self._queries:
+            self._queries[key] = self.matrix_ops.solve_functional(*self._system, weights)
+        return self._queries[key]
+
+    def _node_weights(self, node_id: str, weight: int) -> dict[int, int]:
+        if node_id == self.network.reference_node_label:
+            return {}
+        return {self.label_mappings.node_mapping[node_id]: weight}
+
+    def get_potential(self, node_id: str) -> Any:
+        return self._query(self._node_weights(node_id, 1))
+
+    def get_voltage(self, branch_id: str) -> Any:
+        branch = self.network[branch_id]
+        if branch.node1 == branch.node2:
+            return self._query({})
+        return self._query(self._node_weights(branch.node1, 1) | self._node_weights(branch.node2, -1))
+
+    def _voltage_source_current(self, branch_id: str) -> Any:
+        return self._query({self.label_mappings.node_mapping.N + self.label_mappings.voltage_source_mapping[branch_id]: 1})
+
+def numeric_solution(network: Network, matrix_ops: mo.MatrixOperations, label_mappings_factory: map.LabelMappingsFactory) -> NetworkSolution:
+        label_mappings = label_mappings_factory(network)
         try:
             return NodalAnalysisSolution(
                 network=network,
-                solution_vector=na.nodal_analysis_solution(network, matrix_ops=mo.NumPyMatrixOperations(), label_mappings_factory=label_mappings_factory),
-                label_mappings_factory=label_mappings_factory
+                solution_vector=na.nodal_analysis_solution(network, matrix_ops=matrix_ops, label_mappings_factory=lambda _: label_mappings),
+                label_mappings_factory=lambda _: label_mappings
             )
         except na.NodalAnalysisException as e:
             raise NetworkSolutionException("Solving network failed.", floating_nodes=e.floating_nodes, contradictional_elements=e.contradictional_elements)
 
+def numeric_nodal_analysis_bias_point_solution(network: Network, label_mappings_factory: map.LabelMappingsFactory = map.default_label_mappings_factory) -> NetworkSolution:
+        return numeric_solution(network, mo.NumPyMatrixOperations(), label_mappings_factory)
+
+def sparse_nodal_analysis_bias_point_solution(network: Network, label_mappings_factory: map.LabelMappingsFactory = map.default_label_mappings_factory) -> NetworkSolution:
+        return numeric_solution(network, mo.SciPySparseMatrixOperations(), label_mappings_factory)
+
+def ordered_sparse_nodal_analysis_bias_point_solution(network: Network, label_mappings_factory: map.LabelMappingsFactory = node_ordering.minimum_degree_label_mappings_factory) -> NetworkSolution:
+        return numeric_solution(network, mo.SciPySparseMatrixOperations(permc_spec='NATURAL', diag_pivot_thresh=0.1), label_mappings_factory)
+
 def symbolic_nodal_analysis_bias_point_solution(network: Network, label_mappings_factory: map.LabelMappingsFactory = map.default_label_mappings_factory) -> NetworkSolution:
-        return NodalAnalysisSolution(
+        na.check_network_topology(network)
+        label_mappings = label_mappings_factory(network)
+        return NodalAnalysisQuerySolution(
+            network=network,
+            matrix_ops=mo.SymPyDomainMatrixOperations(),
+            label_mappings_factory=lambda _: label_mappings
+        )
+
+def hybrid_nodal_analysis_bias_point_solution(network: Network, values: Mapping[str, complex | float], label_mappings_factory: map.LabelMappingsFactory = map.default_label_mappings_factory) -> NetworkSolution:
+        na.check_network_topology(network)
+        label_mappings = label_mappings_factory(network)
+        return NodalAnalysisQuerySolution(
             network=network,
-            solution_vector=na.nodal_analysis_solution(network, matrix_ops=mo.SymPyMatrixOperations(), label_mappings_factory=label_mappings_factory),
-            label_mappings_factory=label_mappings_factory
+            matrix_ops=mo.SymPyHybridMatrixOperations(values),
+            label_mappings_factory=lambda _: label_mappings
         )
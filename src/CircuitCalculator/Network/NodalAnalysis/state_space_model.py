@@ -1,114 +1,145 @@
-from typing import Mapping
+from typing import Any, Mapping
+from functools import cached_property
 from .node_analysis import state_space_matrices
 from . import label_mapping as map
 from ..network import Network
 from . import matrix_operations as mo
 from .matrix_operations import symbolic
 
+RowWeights = dict[int, Any]
+
+def linear_combination(*terms: tuple[Any, RowWeights]) -> RowWeights:
+    weights: RowWeights = {}
+    for factor, row_weights in terms:
+        for row, weight in row_weights.items():
+            weights[row] = weights.get(row, 0) + factor*weight
+    return weights
+
 class StateSpaceGenericOutput:
     def __init__(self, network: Network, c_values: Mapping[str, float | symbolic], l_values: Mapping[str, float | symbolic], matrix_ops: mo.MatrixOperations, label_mappings_factory: map.LabelMappingsFactory):
         self.network = network
         self.c_values = c_values
         self.l_values = l_values
         self.matrix_ops = matrix_ops
+        label_mappings = label_mappings_factory(self.network)
         self.A, self.B, self.C, self.D = state_space_matrices(
             network=self.network,
             c_values=self.c_values,
             l_values=self.l_values,
             matrix_ops=self.matrix_ops,
-            label_mappings_factory=label_mappings_factory
+            label_mappings_factory=lambda _: label_mappings
         )
-        self._node_label_mapping = label_mappings_factory(self.network).node_mapping
-        self._source_label_mapping = label_mappings_factory(self.network).source_and_inductance_mapping
-        self._voltage_source_label_mapping = label_mappings_factory(self.network).voltage_source_mapping
-        self._current_source_label_mapping = label_mappings_factory(self.network).current_source_mapping
+        self._node_label_mapping = label_mappings.node_mapping
+        self._source_label_mapping = label_mappings.source_and_inductance_mapping
+        self._voltage_source_label_mapping = label_mappings.voltage_source_mapping
+        self._current_source_label_mapping = label_mappings.current_source_mapping
+        self._capacitor_index = {branch_id: k for k, branch_id in enumerate(self.c_values)}
+        self._capacitor_offset = self.matrix_ops.shape(self.C)[0]
+        self._current_source_offset = self._capacitor_offset + len(self.c_values)
+        self._current_weights_cache: dict[str, RowWeights] = {}
 
-    def _row_for_potential(self, node_id: str, matrix: mo.Matrix) -> mo.Matrix:
-        if node_id in self._node_label_mapping:
-            return matrix[self._node_label_mapping[node_id]:self._node_label_mapping[node_id]+1, :] # type: ignore
-        return self.matrix_ops.zeros((1, matrix.shape[1]))
+    @cached_property
+    def _capacitances(self) -> mo.Matrix:
+        n_c = len(self.c_values)
+        return self.matrix_ops.from_triplets((n_c, n_c), list(range(n_c)), list(range(n_c)), list(self.c_values.values()))
 
-    def c_row_for_potential(self, node_id: str) -> mo.Matrix:
-        return self._row_for_potential(node_id, self.C)
+    @cached_property
+    def _C_base(self) -> mo.Matrix:
+        n_c = len(self.c_values)
+        return self.matrix_ops.vstack((
+            self.C,
+            self._capacitances @ self.A[:n_c, :], # type: ignore
+            self.matrix_ops.zeros((self._current_source_label_mapping.N, self.matrix_ops.shape(self.C)[1]))
+        ))
 
-    def c_row_voltage(self, branch_id: str) -> mo.Matrix:
+    @cached_property
+    def _D_base(self) -> mo.Matrix:
+        n_c, n_cs = len(self.c_values), self._current_source_label_mapping.N
+        return self.matrix_ops.vstack((
+            self.D,
+            self._capacitances @ self.B[:n_c, :], # type: ignore
+            self.matrix_ops.from_triplets((n_cs, self.matrix_ops.shape(self.D)[1]), list(range(n_cs)), list(range(n_cs)), [1]*n_cs)
+        ))
+
+    def _potential_weights(self, node_id: str) -> RowWeights:
+        if node_id in self._node_label_mapping:
+            return {self._node_label_mapping[node_id]: 1}
+        return {}
+
+    def _voltage_weights(self, branch_id: str) -> RowWeights:
         branch = self.network[branch_id]
-        c_pos = self.c_row_for_potential(branch.node1)
-        c_neg = self.c_row_for_potential(branch.node2)
-        return c_pos - c_neg
+        return linear_combination((1, self._potential_weights(branch.node1)), (-1, self._potential_weights(branch.node2)))
 
-    def c_row_current(self, branch_id: str) -> mo.Matrix:
+    def _current_weights(self, branch_id: str) -> RowWeights:
+        if branch_id not in self._current_weights_cache:
+            self._current_weights_cache[branch_id] = self._branch_current_weights(branch_id)
+        return self._current_weights_cache[branch_id]
+
+    def _branch_current_weights(self, branch_id: str) -> RowWeights:
         element = self.network[branch_id].element
         if element.is_voltage_controlled_current_source:
-            return element.transconductance * (
-                self.c_row_for_potential(element.control_node1)
-                - self.c_row_for_potential(element.control_node2)
+            return linear_combination(
+                (element.transconductance, self._potential_weights(element.control_node1)),
+                (-element.transconductance, self._potential_weights(element.control_node2))
             )
         if element.is_current_controlled_current_source:
-            return element.current_gain * self.c_row_current(element.control_branch)
-        if branch_id in self.c_values:
-            idx = list(self.c_values.keys()).index(branch_id)
-            return self.c_values[branch_id] * self.A[idx, :] # type: ignore
+            return linear_combination((element.current_gain, self._current_weights(element.control_branch)))
+        if branch_id in self._capacitor_index:
+            return {self._capacitor_offset + self._capacitor_index[branch_id]: 1}
         if branch_id in self._voltage_source_label_mapping:
-            return self.C[self._voltage_source_label_mapping[branch_id] + self._node_label_mapping.N, :] # type: ignore
+            return {self._voltage_source_label_mapping[branch_id] + self._node_label_mapping.N: 1}
         if branch_id in self._current_source_label_mapping:
-            return self.matrix_ops.zeros((1, self.C.shape[1]))
-        branch = self.network[branch_id]
-        c_pos = self.c_row_for_potential(branch.node1)
-        c_neg = self.c_row_for_potential(branch.node2)
-        return (c_pos - c_neg) / branch.element.Z
+            return {self._current_source_offset + self._current_source_label_mapping[branch_id]: 1}
+        return linear_combination((1/element.Z, self._voltage_weights(branch_id)))
+
+    def output_weights(self, potential_nodes: list[str] = [], voltage_ids: list[str] = [], current_ids: list[str] = []) -> list[RowWeights]:
+        return [self._potential_weights(id) for id in potential_nodes] \
+            + [self._voltage_weights(id) for id in voltage_ids] \
+            + [self._current_weights(id) for id in current_ids]
+
+    def _gather(self, weights: list[RowWeights], base: mo.Matrix) -> mo.Matrix:
+        triplets = [(row, column, weight) for row, row_weights in enumerate(weights) for column, weight in row_weights.items()]
+        rows, columns, values = (list(t) for t in zip(*triplets)) if triplets else ([], [], [])
+        return self.matrix_ops.from_triplets((len(weights), self.matrix_ops.shape(base)[0]), rows, columns, values) @ base # type: ignore
+
+    def output_matrices(self, potential_nodes: list[str] = [], voltage_ids: list[str] = [], current_ids: list[str] = []) -> tuple[mo.Matrix, mo.Matrix]:
+        weights = self.output_weights(potential_nodes, voltage_ids, current_ids)
+        return self._gather(weights, self._C_base), self._gather(weights, self._D_base)
+
+    @property
+    def potential_nodes(self) -> list[str]:
+        return sorted(self.network.node_labels)
+
+    @property
+    def branch_ids(self) -> list[str]:
+        return list(self.network.branch_ids)
+
+    def all_potentials_and_currents(self) -> tuple[mo.Matrix, mo.Matrix]:
+        return self.output_matrices(potential_nodes=self.potential_nodes, current_ids=self.branch_ids)
+
+    def c_row_for_potential(self, node_id: str) -> mo.Matrix:
+        return self._gather([self._potential_weights(node_id)], self._C_base)
+
+    def c_row_voltage(self, branch_id: str) -> mo.Matrix:
+        return self._gather([self._voltage_weights(branch_id)], self._C_base)
+
+    def c_row_current(self, branch_id: str) -> mo.Matrix:
+        return self._gather([self._current_weights(branch_id)], self._C_base)
 
     def d_row_for_potential(self, node_id: str) -> mo.Matrix:
-        return self._row_for_potential(node_id, self.D)
+        return self._gather([self._potential_weights(node_id)], self._D_base)
 
     def d_row_voltage(self, branch_id: str) -> mo.Matrix:
-        branch = self.network[branch_id]
-        d_pos = self.d_row_for_potential(branch.node1)
-        d_neg = self.d_row_for_potential(branch.node2)
-        return d_pos - d_neg
+        return self._gather([self._voltage_weights(branch_id)], self._D_base)
 
     def d_row_current(self, branch_id: str) -> mo.Matrix:
-        element = self.network[branch_id].element
-        if element.is_voltage_controlled_current_source:
-            return element.transconductance * (
-                self.d_row_for_potential(element.control_node1)
-                - self.d_row_for_potential(element.control_node2)
-            )
-        if element.is_current_controlled_current_source:
-            return element.current_gain * self.d_row_current(element.control_branch)
-        if branch_id in self.c_values:
-            idx = list(self.c_values.keys()).index(branch_id)
-            return self.c_values[branch_id] * self.B[idx, :] # type: ignore
-        if branch_id in self._voltage_source_label_mapping:
-            return self.D[self._voltage_source_label_mapping[branch_id] + self._node_label_mapping.N, :] # type: ignore
-        if branch_id in self._current_source_label_mapping:
-            d_row = self.matrix_ops.zeros((1, self.D.shape[1]))
-            d_row[0, self._current_source_label_mapping[branch_id]] = 1
-            return d_row
-        branch = self.network[branch_id]
-        d_pos = self.d_row_for_potential(branch.node1)
-        d_neg = self.d_row_for_potential(branch.node2)
-        return (d_pos - d_neg) / branch.element.Z
+        return self._gather([self._current_weights(branch_id)], self._D_base)
 
     def extend_C_matrix(self, potential_nodes: list[str] = [], voltage_ids: list[str] = [], current_ids: list[str] = []) -> mo.Matrix:
-        extended_C = self.matrix_ops.zeros((0, self.C.shape[1]))
-        for id in potential_nodes:
-            extended_C = self.matrix_ops.vstack((extended_C, self.c_row_for_potential(id)))
-        for id in voltage_ids:
-            extended_C = self.matrix_ops.vstack((extended_C, self.c_row_voltage(id)))
-        for id in current_ids:
-            extended_C = self.matrix_ops.vstack((extended_C, self.c_row_current(id)))
-        return extended_C
+        return self._gather(self.output_weights(potential_nodes, voltage_ids, current_ids), self._C_base)
 
     def extend_D_matrix(self, potential_nodes: list[str] = [], voltage_ids: list[str] = [], current_ids: list[str] = []) -> mo.Matrix:
-        extended_D = self.matrix_ops.zeros((0, self.D.shape[1]))
-        for id in potential_nodes:
-            extended_D = self.matrix_ops.vstack((extended_D, self.d_row_for_potential(id)))
-        for id in voltage_ids:
-            extended_D = self.matrix_ops.vstack((extended_D, self.d_row_voltage(id)))
-        for id in current_ids:
-            extended_D = self.matrix_ops.vstack((extended_D, self.d_row_current(id)))
-        return extended_D
+        return self._gather(self.output_weights(potential_nodes, voltage_ids, current_ids), self._D_base)
 
     def sources(self) -> list[str]:
         return [source for source in self._source_label_mapping.keys if source not in self.l_values]
@@ -129,6 +160,15 @@ def symbolic_state_space_model(network: Network, c_values: Mapping[str, symbolic
         network=network,
         c_values=c_values,
         l_values=l_values,
-        matrix_ops=mo.SymPyMatrixOperations(),
+        matrix_ops=mo.SymPyDomainMatrixOperations(),
+        label_mappings_factory=label_mappings_factory
+    )
+
+def sparse_state_space_model(network: Network, c_values: Mapping[str, float], l_values: Mapping[str, float], label_mappings_factory: map.LabelMappingsFactory = map.default_label_mappings_factory) -> StateSpaceGenericOutput:
+    return StateSpaceGenericOutput(
+        network=network,
+        c_values=c_values,
+        l_values=l_values,
+        matrix_ops=mo.SciPySparseMatrixOperations(),
         label_mappings_factory=label_mappings_factory
     )
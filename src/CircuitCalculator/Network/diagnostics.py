@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from typing import Any
+
+from .network import Branch, DisjointNodeSets, Network
+
+@dataclass(frozen=True)
+class TopologyDiagnostics:
+    floating_nodes: tuple[str, ...]
+    voltage_source_loops: tuple[tuple[str, ...], ...]
+    current_source_cutsets: tuple[tuple[str, ...], ...]
+
+    @property
+    def is_solvable(self) -> bool:
+        return not self.floating_nodes and not self.voltage_source_loops
+
+    @property
+    def contradictional_elements(self) -> tuple[str, ...]:
+        elements = [id for loop in self.voltage_source_loops for id in loop] + [id for cutset in self.current_source_cutsets for id in cutset]
+        return tuple(dict.fromkeys(elements))
+
+def coupled_nodes(network: Network, branch: Branch) -> list[str]:
+    element = branch.element
+    nodes = [branch.node1, branch.node2]
+    if not element.is_controlled_source:
+        return nodes
+    if hasattr(element, 'control_branch'):
+        control_branch = network.topology.branch_index.get(element.control_branch)
+        return nodes + ([control_branch.node1, control_branch.node2] if control_branch is not None else [])
+    return nodes + [element.control_node1, element.control_node2]
+
+def is_coupling(element: Any) -> bool:
+    return element.is_controlled_source or element.is_ideal_voltage_source or element.Y != 0
+
+def forest_path(forest: dict[str, list[tuple[str, str]]], start: str, end: str) -> list[str]:
+    previous: dict[str, tuple[str, str]] = {start: (start, '')}
+    queue = [start]
+    while queue and end not in previous:
+        node = queue.pop()
+        for neighbour, id in forest.get(node, []):
+            if neighbour not in previous:
+                previous[neighbour] = (node, id)
+                queue.append(neighbour)
+    path = []
+    while end != start:
+        end, id = previous[end]
+        path.append(id)
+    return path
+
+def is_independent_voltage_source(element: Any) -> bool:
+    return element.is_ideal_voltage_source and not element.is_controlled_source
+
+@dataclass(frozen=True)
+class VoltageSourceForest:
+    node_sets: DisjointNodeSets
+    branches: dict[str, list[tuple[str, str]]]
+    loops: tuple[tuple[str, ...], ...]
+
+    def connects(self, node1: str, node2: str) -> bool:
+        return self.node_sets.connected(node1, node2)
+
+def voltage_source_forest(network: Network) -> VoltageSourceForest:
+    node_sets = DisjointNodeSets()
+    forest: dict[str, list[tuple[str, str]]] = {}
+    loops: list[tuple[str, ...]] = []
+    for id in network.branch_ids:
+        branch = network.topology.branch_index[id]
+        if not is_independent_voltage_source(branch.element):
+            continue
+        if node_sets.connected(branch.node1, branch.node2):
+            loops.append(tuple(forest_path(forest, branch.node1, branch.node2)[::-1]) + (branch.id,))
+            continue
+        node_sets.union(branch.node1, branch.node2)
+        forest.setdefault(branch.node1, []).append((branch.node2, branch.id))
+        forest.setdefault(branch.node2, []).append((branch.node1, branch.id))
+    return VoltageSourceForest(node_sets=node_sets, branches=forest, loops=tuple(loops))
+
+def short_circuited_ports(network: Network, ports: list[tuple[str, str]]) -> list[bool]:
+    forest = voltage_source_forest(network)
+    return [forest.connects(node1, node2) for node1, node2 in ports]
+
+def topology_diagnostics(network: Network) -> TopologyDiagnostics:
+    coupled = DisjointNodeSets()
+    for node in network.node_labels:
+        coupled.add(node)
+    branches = [network.topology.branch_index[id] for id in network.branch_ids]
+    for branch in branches:
+        if not is_coupling(branch.element):
+            continue
+        nodes = coupled_nodes(network, branch)
+        for node in nodes[1:]:
+            coupled.union(nodes[0], node)
+
+    floating_nodes = tuple(sorted(node for node in network.node_labels if not coupled.connected(node, network.reference_node_label)))
+    components: dict[str, list[str]] = {}
+    for node in floating_nodes:
+        components.setdefault(coupled.find(node), []).append(node)
+    cutsets = []
+    for nodes in components.values():
+        component = set(nodes)
+        cutsets.append(tuple(
+            branch.id for branch in branches
+            if (branch.node1 in component) != (branch.node2 in component) and branch.element.is_current_source
+        ))
+    return TopologyDiagnostics(
+        floating_nodes=floating_nodes,
+        voltage_source_loops=voltage_source_forest(network).loops,
+        current_source_cutsets=tuple(cutset for cutset in cutsets if cutset)
+    )
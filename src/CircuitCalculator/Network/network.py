@@ -15,6 +15,71 @@ class Branch:
     def id(self) -> str:
         return self.element.name
 
+class DisjointNodeSets:
+    def __init__(self) -> None:
+        self._parent: dict[str, str] = {}
+        self._size: dict[str, int] = {}
+
+    def add(self, node: str) -> None:
+        if node not in self._parent:
+            self._parent[node] = node
+            self._size[node] = 1
+
+    def find(self, node: str) -> str:
+        if node not in self._parent:
+            return node
+        root = node
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[node] != root:
+            self._parent[node], node = root, self._parent[node]
+        return root
+
+    def union(self, node1: str, node2: str) -> None:
+        self.add(node1)
+        self.add(node2)
+        root1, root2 = self.find(node1), self.find(node2)
+        if root1 == root2:
+            return
+        if self._size[root1] < self._size[root2]:
+            root1, root2 = root2, root1
+        self._parent[root2] = root1
+        self._size[root1] += self._size[root2]
+
+    def connected(self, node1: str, node2: str) -> bool:
+        return self.find(node1) == self.find(node2)
+
+    def members(self, node: str) -> set[str]:
+        root = self.find(node)
+        return {node} | {n for n in self._parent if self.find(n) == root}
+
+def node_pair(node1: str, node2: str) -> frozenset[str]:
+    return frozenset((node1, node2))
+
+@dataclass(frozen=True)
+class NetworkTopology:
+    branch_index: dict[str, Branch]
+    adjacency: dict[str, list[Branch]]
+    node_pair_index: dict[frozenset[str], list[Branch]]
+    node_sets: DisjointNodeSets
+
+    @classmethod
+    def from_branches(cls, branches: list[Branch]) -> "NetworkTopology":
+        branch_index: dict[str, Branch] = {}
+        adjacency: dict[str, list[Branch]] = {}
+        node_pair_index: dict[frozenset[str], list[Branch]] = {}
+        node_sets = DisjointNodeSets()
+        for branch in branches:
+            branch_index[branch.id] = branch
+            adjacency.setdefault(branch.node1, []).append(branch)
+            if branch.node2 != branch.node1:
+                adjacency.setdefault(branch.node2, []).append(branch)
+            node_pair_index.setdefault(node_pair(branch.node1, branch.node2), []).append(branch)
+            node_sets.union(branch.node1, branch.node2)
+        for node, connected_branches in adjacency.items():
+            connected_branches.sort(key=lambda x: x.node1 if x.node1!=node else x.node2)
+        return cls(branch_index, adjacency, node_pair_index, node_sets)
+
 @dataclass(frozen=True)
 class Network:
     branches: list[Branch]
@@ -26,14 +91,12 @@ class Network:
             raise AmbiguousBranchIDs
 
     @cached_property
-    def _all_branch_ids(self) -> list[str]:
-        return [b.id for b in self.branches]
+    def topology(self) -> NetworkTopology:
+        return NetworkTopology.from_branches(self.branches)
 
     def _is_connected_branch(self, id: str) -> bool:
-        branch = self.branches[self._all_branch_ids.index(id)]
-        if branch.node1 in self.node_labels or branch.node2 in self.node_labels:
-            return True
-        return False
+        branch = self.topology.branch_index[id]
+        return self.topology.node_sets.connected(branch.node1, self.reference_node_label)
 
     @cached_property
     def branch_ids(self) -> list[str]:
@@ -41,17 +104,7 @@ class Network:
 
     @cached_property
     def node_labels(self) -> set[str]:
-        connected_nodes = set([self.reference_node_label])
-        nodes_to_assess = set([self.reference_node_label])
-        nodes_already_assessed = set()
-        while nodes_to_assess:
-            new_nodes_to_assess = set()
-            for node in nodes_to_assess:
-                new_nodes_to_assess.update(self.nodes_connected_to(node))
-            nodes_already_assessed.update(nodes_to_assess)
-            nodes_to_assess = new_nodes_to_assess - nodes_already_assessed
-            connected_nodes.update(new_nodes_to_assess)
-        return connected_nodes
+        return self.topology.node_sets.members(self.reference_node_label)
 
     @cached_property
     def number_of_nodes(self) -> int:
@@ -60,20 +113,21 @@ class Network:
     def is_zero_node(self, node: str) -> bool:
         return node == self.reference_node_label
 
+    def is_connected(self, node1: str, node2: str) -> bool:
+        return self.topology.node_sets.connected(node1, node2)
+
     def branches_connected_to(self, node: str) -> list[Branch]:
-        connected_branches = [branch for branch in self.branches if branch.node1 == node or branch.node2 == node]
-        connected_branches.sort(key=lambda x: x.node1 if x.node1!=node else x.node2)
-        return connected_branches
+        return list(self.topology.adjacency.get(node, []))
 
     def nodes_connected_to(self, node: str) -> set[str]:
-        return {b.node1 if b.node1 != node else b.node2 for b in self.branches_connected_to(node=node)}
+        return {b.node1 if b.node1 != node else b.node2 for b in self.topology.adjacency.get(node, [])}
 
     def branches_between(self, node1: str, node2: str) -> list[Branch]:
-        return [branch for branch in self.branches if set((branch.node1, branch.node2)) == set((node1, node2))]
+        return list(self.topology.node_pair_index.get(node_pair(node1, node2), []))
 
     def __getitem__(self, id: str) -> Branch:
-        if id not in self._all_branch_ids:
+        if id not in self.topology.branch_index:
             raise KeyError(f"Branch with id '{id}' not found in the network.")
         if not self._is_connected_branch(id):
             raise KeyError(f"Branch with id '{id}' is floating.")
-        return self.branches[self._all_branch_ids.index(id)]
+        return self.topology.branch_index[id]
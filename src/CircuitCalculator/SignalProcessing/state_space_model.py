@@ -1,7 +1,11 @@
 import numpy as np
 import sympy as sp
 from dataclasses import dataclass
+import scipy.linalg
 import scipy.signal
+import scipy.sparse
+import scipy.sparse.linalg
+from functools import lru_cache
 from typing import Protocol, Any
 
 @dataclass(frozen=True)
@@ -86,5 +90,325 @@ def continuous_state_space_solver(ssm: NumericStateSpaceModel, y: np.ndarray, t:
     sys = scipy.signal.StateSpace(ssm.A, ssm.B, ssm.C, ssm.D)
     return scipy.signal.lsim(sys, y, t, x0)
 
+@dataclass(frozen=True)
+class DiscreteStateSpaceModel:
+    A: np.ndarray
+    B0: np.ndarray
+    B1: np.ndarray
+    C: np.ndarray
+    D: np.ndarray
+    dt: float
+    hold: str
+
+    @property
+    def n_states(self) -> int:
+        return self.A.shape[0]
+
+    @property
+    def n_inputs(self) -> int:
+        return self.B0.shape[1]
+
+    @property
+    def n_outputs(self) -> int:
+        return self.C.shape[0]
+
+ArrayKey = tuple[bytes, tuple[int, ...], str]
+
+def array_key(array: np.ndarray) -> ArrayKey:
+    array = np.ascontiguousarray(array)
+    return array.tobytes(), array.shape, array.dtype.str
+
+def from_array_key(key: ArrayKey) -> np.ndarray:
+    data, shape, dtype = key
+    return np.frombuffer(data, dtype=dtype).reshape(shape)
+
+@lru_cache(maxsize=128)
+def _discretization(A_key: ArrayKey, B_key: ArrayKey, dt: float, hold: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    A, B = from_array_key(A_key), from_array_key(B_key)
+    n, m = B.shape
+    if hold == 'zoh':
+        M = np.zeros((n+m, n+m), dtype=np.result_type(A, B, float))
+        M[:n, :n], M[:n, n:] = A*dt, B*dt
+        E = scipy.linalg.expm(M)
+        return E[:n, :n], E[:n, n:], np.zeros((n, m))
+    if hold == 'foh':
+        M = np.zeros((n+2*m, n+2*m), dtype=np.result_type(A, B, float))
+        M[:n, :n], M[:n, n:n+m], M[n:n+m, n+m:] = A*dt, B*dt, np.eye(m)
+        E = scipy.linalg.expm(M)
+        B1 = E[:n, n+m:]
+        return E[:n, :n], E[:n, n:n+m] - B1, B1
+    raise ValueError(f'Unknown hold type "{hold}", expected "zoh" or "foh".')
+
+def discretize(ssm: NumericStateSpaceModel, dt: float, hold: str = 'foh') -> DiscreteStateSpaceModel:
+    A, B0, B1 = _discretization(array_key(ssm.A), array_key(ssm.B), float(dt), hold)
+    return DiscreteStateSpaceModel(A=A, B0=B0, B1=B1, C=ssm.C, D=ssm.D, dt=float(dt), hold=hold)
+
+def fixed_time_step(t: np.ndarray, rtol: float = 1e-9) -> float:
+    if len(t) < 2:
+        return 1.0
+    steps = np.diff(t)
+    if not np.allclose(steps, steps[0], rtol=rtol, atol=0):
+        raise ValueError('Time vector must be uniformly sampled.')
+    return float(steps[0])
+
+def block_length(n_states: int, max_block_size: int = 512) -> int:
+    return max(1, min(64, max_block_size // max(n_states, 1)))
+
+@lru_cache(maxsize=128)
+def _block_propagators(A_key: ArrayKey, L: int) -> tuple[np.ndarray, np.ndarray]:
+    A = from_array_key(A_key)
+    n = A.shape[0]
+    powers = [np.eye(n, dtype=A.dtype)]
+    for _ in range(L):
+        powers.append(powers[-1] @ A)
+    P = np.vstack(powers[1:])
+    T = np.zeros((L*n, L*n), dtype=A.dtype)
+    for j in range(L):
+        for i in range(j+1):
+            T[j*n:(j+1)*n, i*n:(i+1)*n] = powers[j-i]
+    return P, T
+
+def propagate_states(model: DiscreteStateSpaceModel, u: np.ndarray, x0: np.ndarray) -> np.ndarray:
+    N, n = len(u), model.n_states
+    batch_shape = u.shape[1:-1]
+    forcing = u @ model.B0.T
+    forcing[:-1] += u[1:] @ model.B1.T
+    forcing = np.moveaxis(forcing.reshape(N, -1, n), 0, 1)
+    x = np.empty(forcing.shape, dtype=np.result_type(model.A, forcing, x0))
+    if N == 0:
+        return np.moveaxis(x, 1, 0).reshape(u.shape[:-1] + (n,))
+    x[:, 0] = np.broadcast_to(x0, batch_shape + (n,)).reshape(-1, n)
+    L = block_length(n)
+    P, T = _block_propagators(array_key(model.A), L)
+    for s in range(0, N-1, L):
+        l = min(L, N-1-s)
+        block = x[:, s] @ P[:l*n].T + forcing[:, s:s+l].reshape(-1, l*n) @ T[:l*n, :l*n].T
+        x[:, s+1:s+1+l] = block.reshape(-1, l, n)
+    return np.moveaxis(x, 1, 0).reshape(u.shape[:-1] + (n,))
+
+def discrete_state_space_solver(ssm: NumericStateSpaceModel, y: np.ndarray, t: np.ndarray, x0: np.ndarray, hold: str = 'foh') -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    t = np.asarray(t, dtype=float)
+    u = np.reshape(y, (len(t), ssm.n_inputs))
+    model = discretize(ssm, fixed_time_step(t), hold)
+    x = propagate_states(model, u, np.asarray(x0))
+    return t, x @ model.C.T + u @ model.D.T, x
+
+def transient_state_space_solver(ssm: NumericStateSpaceModel, y: np.ndarray, t: np.ndarray, x0: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    try:
+        fixed_time_step(np.asarray(t, dtype=float))
+    except ValueError:
+        return continuous_state_space_solver(ssm, y, t, x0)
+    return discrete_state_space_solver(ssm, y, t, x0)
+
+@dataclass(frozen=True)
+class ExponentialInput:
+    amplitude: complex
+    s: complex = 0
+    t0: float = 0
+
+    def __call__(self, t: np.ndarray) -> np.ndarray:
+        tau = np.asarray(t, dtype=float) - self.t0
+        return np.where(tau > 0, self.amplitude*np.exp(self.s*np.maximum(tau, 0)), 0)
+
+def step_input(amplitude: float, t0: float = 0) -> list[ExponentialInput]:
+    return [ExponentialInput(amplitude=amplitude, s=0, t0=t0)]
+
+def exponential_input(amplitude: float, tau: float, t0: float = 0) -> list[ExponentialInput]:
+    return [ExponentialInput(amplitude=amplitude, s=-1/tau, t0=t0)]
+
+def sinusoidal_input(amplitude: float, w: float, phi: float = 0, t0: float = 0) -> list[ExponentialInput]:
+    return [
+        ExponentialInput(amplitude=amplitude/2*np.exp(1j*(phi + w*t0)), s=1j*w, t0=t0),
+        ExponentialInput(amplitude=amplitude/2*np.exp(-1j*(phi + w*t0)), s=-1j*w, t0=t0)
+    ]
+
+def exponential_convolution(lam: np.ndarray, s: complex, tau: np.ndarray) -> np.ndarray:
+    d = s - lam
+    near = np.abs(d*tau) < 1
+    x = np.where(near, d*tau, 1)
+    small = np.abs(x) < 1e-8
+    series = np.where(small, 1 + x/2, np.expm1(np.where(small, 1, x))/np.where(small, 1, x))
+    direct = (np.exp(s*tau) - np.exp(lam*tau))/np.where(near, 1, d)
+    return np.where(near, np.exp(lam*tau)*tau*series, direct)
+
+@dataclass(frozen=True)
+class ModalDecomposition:
+    eigenvalues: np.ndarray
+    V: np.ndarray
+    V_inv: np.ndarray
+
+@lru_cache(maxsize=128)
+def _modal_decomposition(A_key: ArrayKey, max_condition_number: float) -> ModalDecomposition | None:
+    A = from_array_key(A_key)
+    eigenvalues, V = np.linalg.eig(A)
+    if np.linalg.cond(V) > max_condition_number:
+        return None
+    return ModalDecomposition(eigenvalues=eigenvalues, V=V, V_inv=np.linalg.inv(V))
+
+def modal_states(A: np.ndarray, B: np.ndarray, u: list[list[ExponentialInput]], t: np.ndarray, x0: np.ndarray, max_condition_number: float = 1e8) -> np.ndarray:
+    n = A.shape[0]
+    t = np.asarray(t, dtype=float)
+    modes = _modal_decomposition(array_key(A), max_condition_number)
+    if modes is None:
+        x = scipy.linalg.expm(A*t[:, np.newaxis, np.newaxis]) @ x0
+        for j, terms in enumerate(u):
+            for term in terms:
+                M = np.zeros((n+1, n+1), dtype=complex)
+                M[:n, :n], M[:n, n], M[n, n] = A, B[:, j]*term.amplitude, term.s
+                tau = np.maximum(t - term.t0, 0)
+                x = x + scipy.linalg.expm(M*tau[:, np.newaxis, np.newaxis])[:, :n, n]
+        return x
+    lam = modes.eigenvalues
+    z = np.exp(np.outer(t, lam))*(modes.V_inv @ x0)
+    for j, terms in enumerate(u):
+        beta = modes.V_inv @ B[:, j]
+        for term in terms:
+            tau = np.maximum(t - term.t0, 0)[:, np.newaxis]
+            z = z + term.amplitude*beta*exponential_convolution(lam, term.s, tau)
+    return z @ modes.V.T
+
+def modal_state_space_solver(ssm: NumericStateSpaceModel, u: list[list[ExponentialInput]], t: np.ndarray, x0: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if len(u) != ssm.n_inputs:
+        raise ValueError(f'Expected exponential terms for {ssm.n_inputs} inputs, got {len(u)}.')
+    t = np.asarray(t, dtype=float)
+    x = modal_states(ssm.A, ssm.B, u, t, np.asarray(x0))
+    u_values = np.array([sum((term(t) for term in terms), np.zeros(len(t))) for terms in u]).reshape(len(u), len(t)).T
+    return t, x @ ssm.C.T + u_values @ ssm.D.T, x
+
+def sparsify(matrix: Any, rtol: float = 1e-12) -> scipy.sparse.csr_matrix:
+    matrix = scipy.sparse.csr_matrix(matrix)
+    if matrix.nnz and not np.any(matrix.data.imag if np.iscomplexobj(matrix.data) else 0):
+        matrix = scipy.sparse.csr_matrix(matrix.real)
+    if matrix.nnz:
+        matrix.data[np.abs(matrix.data) < rtol*np.max(np.abs(matrix.data))] = 0
+        matrix.eliminate_zeros()
+    return matrix
+
+SparseKey = tuple[bytes, bytes, bytes, tuple[int, int], str, str]
+
+def sparse_key(matrix: Any) -> SparseKey:
+    matrix = scipy.sparse.csr_matrix(matrix)
+    matrix.sum_duplicates()
+    matrix.sort_indices()
+    return matrix.data.tobytes(), matrix.indices.tobytes(), matrix.indptr.tobytes(), matrix.shape, matrix.data.dtype.str, matrix.indices.dtype.str
+
+def from_sparse_key(key: SparseKey) -> scipy.sparse.csr_matrix:
+    data, indices, indptr, shape, dtype, index_dtype = key
+    return scipy.sparse.csr_matrix((np.frombuffer(data, dtype=dtype), np.frombuffer(indices, dtype=index_dtype), np.frombuffer(indptr, dtype=index_dtype)), shape=shape)
+
+@lru_cache(maxsize=32)
+def _implicit_step(A_key: SparseKey, dt: float, method: str) -> tuple[scipy.sparse.linalg.SuperLU, scipy.sparse.csr_matrix, float]:
+    A = from_sparse_key(A_key)
+    I = scipy.sparse.identity(A.shape[0], dtype=A.dtype, format='csc')
+    if method == 'backward_euler':
+        return scipy.sparse.linalg.splu(scipy.sparse.csc_matrix(I - dt*A)), scipy.sparse.csr_matrix(I), 0.0
+    if method == 'trapezoidal':
+        return scipy.sparse.linalg.splu(scipy.sparse.csc_matrix(I - dt/2*A)), scipy.sparse.csr_matrix(I + dt/2*A), 0.5
+    raise ValueError(f'Unknown integration method "{method}", expected "backward_euler", "trapezoidal" or "krylov".')
+
+def implicit_sparse_states(A: Any, B: Any, u: np.ndarray, dt: float, x0: np.ndarray, method: str = 'trapezoidal') -> np.ndarray:
+    lu, M, theta = _implicit_step(sparse_key(A), float(dt), method)
+    Bu = np.asarray(scipy.sparse.csr_matrix(B) @ u.T).T*dt
+    x = np.empty((len(u), A.shape[0]), dtype=np.result_type(lu.U.dtype, Bu, x0))
+    if len(u) == 0:
+        return x
+    x[0] = x0
+    for k in range(len(u)-1):
+        x[k+1] = lu.solve(M @ x[k] + theta*Bu[k] + (1-theta)*Bu[k+1])
+    return x
+
+def krylov_sparse_states(A: Any, B: Any, u: np.ndarray, dt: float, x0: np.ndarray) -> np.ndarray:
+    n, m = B.shape
+    M = scipy.sparse.bmat([
+        [scipy.sparse.csr_matrix(A)*dt, scipy.sparse.csr_matrix(B)*dt, None],
+        [None, None, scipy.sparse.identity(m)],
+        [None, None, scipy.sparse.csr_matrix((m, m))]
+    ], format='csr') if m else scipy.sparse.csr_matrix(A)*dt
+    x = np.empty((len(u), n), dtype=np.result_type(M.dtype, u, x0))
+    if len(u) == 0:
+        return x
+    x[0] = x0
+    for k in range(len(u)-1):
+        v = np.concatenate((x[k], u[k], u[k+1] - u[k]))
+        x[k+1] = scipy.sparse.linalg.expm_multiply(M, v)[:n]
+    return x
+
+def sparse_state_space_solver(ssm: NumericStateSpaceModel, y: np.ndarray, t: np.ndarray, x0: np.ndarray, method: str = 'trapezoidal') -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    t = np.asarray(t, dtype=float)
+    u = np.reshape(y, (len(t), ssm.n_inputs))
+    dt = fixed_time_step(t)
+    if method == 'krylov':
+        x = krylov_sparse_states(ssm.A, ssm.B, u, dt, np.asarray(x0))
+    else:
+        x = implicit_sparse_states(ssm.A, ssm.B, u, dt, np.asarray(x0), method)
+    return t, np.asarray(ssm.C @ x.T).T + np.asarray(ssm.D @ u.T).T, x
+
+@dataclass(frozen=True)
+class DescriptorStateSpaceModel:
+    E: Any
+    A: Any
+    B: Any
+
+    def __post_init__(self) -> None:
+        if self.E.shape != self.A.shape or self.A.shape[0] != self.A.shape[1]:
+            raise ValueError('Matrices E and A must be square and of equal shape')
+        if self.B.shape[0] != self.A.shape[0]:
+            raise ValueError('Number of rows of matrix B must be equal to number of rows of matrix A')
+
+    @property
+    def n_states(self) -> int:
+        return self.A.shape[0]
+
+    @property
+    def n_inputs(self) -> int:
+        return self.B.shape[1]
+
+DESCRIPTOR_METHODS = {'backward_euler': (1.0, 0.0), 'trapezoidal': (0.5, 0.5), 'bdf2': (2/3, 0.0)}
+
+@lru_cache(maxsize=32)
+def _descriptor_step(E_key: SparseKey, A_key: SparseKey, dt: float, method: str) -> scipy.sparse.linalg.SuperLU:
+    if method not in DESCRIPTOR_METHODS:
+        raise ValueError(f'Unknown integration method "{method}", expected one of {list(DESCRIPTOR_METHODS)}.')
+    theta, _ = DESCRIPTOR_METHODS[method]
+    return scipy.sparse.linalg.splu(scipy.sparse.csc_matrix(from_sparse_key(E_key) - theta*dt*from_sparse_key(A_key)))
+
+def consistent_initial_state(ssm: DescriptorStateSpaceModel, u0: np.ndarray, P: Any) -> tuple[np.ndarray, np.ndarray]:
+    A, P = scipy.sparse.csr_matrix(ssm.A), scipy.sparse.csr_matrix(P)
+    n, k = P.shape
+    K = scipy.sparse.bmat([[-A, -P], [P.T, None]], format='csc') if k else scipy.sparse.csc_matrix(-A)
+    rhs = np.concatenate((np.asarray(scipy.sparse.csr_matrix(ssm.B) @ u0).reshape(n), np.zeros(k)))
+    try:
+        solution = scipy.sparse.linalg.splu(K).solve(rhs.astype(np.result_type(K.dtype, float)))
+    except RuntimeError:
+        solution = scipy.sparse.linalg.lsqr(K, rhs, atol=1e-14, btol=1e-14)[0]
+    return solution[:n], solution[n:]
+
+def descriptor_state_space_solver(ssm: DescriptorStateSpaceModel, y: np.ndarray, t: np.ndarray, x0: np.ndarray, method: str = 'trapezoidal') -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    t = np.asarray(t, dtype=float)
+    u = np.reshape(y, (len(t), ssm.n_inputs))
+    dt = fixed_time_step(t)
+    E, A = scipy.sparse.csr_matrix(ssm.E), scipy.sparse.csr_matrix(ssm.A)
+    E_key, A_key = sparse_key(E), sparse_key(A)
+    lu = _descriptor_step(E_key, A_key, dt, method)
+    first_lu = _descriptor_step(E_key, A_key, dt, 'backward_euler')
+    Bu = np.asarray(scipy.sparse.csr_matrix(ssm.B) @ u.T).T*dt
+    x = np.empty((len(t), ssm.n_states), dtype=np.result_type(E.dtype, A.dtype, Bu, x0))
+    xdot = np.zeros_like(x)
+    if len(t) == 0:
+        return t, x, xdot
+    x[0] = x0
+    theta, explicit = DESCRIPTOR_METHODS[method]
+    for k in range(len(t)-1):
+        if k == 0 or method == 'backward_euler':
+            x[k+1] = first_lu.solve(E @ x[k] + Bu[k+1])
+            xdot[k+1] = (x[k+1] - x[k])/dt
+        elif method == 'trapezoidal':
+            x[k+1] = lu.solve(E @ x[k] + explicit*dt*(A @ x[k]) + theta*(Bu[k] + Bu[k+1]))
+            xdot[k+1] = 2*(x[k+1] - x[k])/dt - xdot[k]
+        else:
+            x[k+1] = lu.solve(E @ (4*x[k] - x[k-1])/3 + theta*Bu[k+1])
+            xdot[k+1] = (3*x[k+1] - 4*x[k] + x[k-1])/(2*dt)
+    return t, x, xdot
+
 def symbolic_state_space_solver(ssm: SymbolicStateSpaceModel, y: sp.Matrix, t: sp.Matrix, x0: sp.Matrix) -> sp.Symbol:
     ...
\ No newline at end of file
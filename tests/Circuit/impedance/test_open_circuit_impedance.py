@@ -61,4 +61,17 @@ def test_impedance_of_resistor_and_capacitor() -> None:
         ],
         ground_node='0'
     )
-    assert open_circuit_impedance(cicuit, '2', '0') == R
\ No newline at end of file
+    assert open_circuit_impedance(cicuit, '2', '0') == R
+
+def test_impedance_across_series_voltage_sources_is_zero() -> None:
+    circuit = Circuit(
+        components=[
+            cp.dc_voltage_source(V=3, id='V1', nodes=('1', '2')),
+            cp.dc_voltage_source(V=2, id='V2', nodes=('2', '3')),
+            cp.resistor(R=3.9, id='R1', nodes=('1', '0')),
+            cp.resistor(R=0.3, id='R2', nodes=('2', '0')),
+            cp.resistor(R=0.9, id='R3', nodes=('3', '0'))
+        ],
+        ground_node='0'
+    )
+    assert open_circuit_impedance(circuit, '1', '3') == 0
@@ -0,0 +1,19 @@
+import numpy as np
+from CircuitCalculator.Circuit.impedance import open_circuit_impedance, port_matrices
+from CircuitCalculator.Circuit.circuit import Circuit
+from CircuitCalculator.Circuit.Components import components as cp
+
+def test_port_matrices_over_frequency() -> None:
+    circuit = Circuit([
+        cp.resistor(R=10, id='R1', nodes=('1', '2')),
+        cp.capacitor(C=1e-3, id='C', nodes=('2', '0')),
+        cp.inductor(L=1e-2, id='L', nodes=('2', '3')),
+        cp.resistor(R=5, id='R2', nodes=('3', '0')),
+    ], ground_node='0')
+    w = np.array([0, 10, 100, 1000])
+    ports = [('1', '0'), ('2', '0'), ('3', '0')]
+    matrices = port_matrices(circuit, ports, w)
+    assert matrices.Z.shape == (4, 3, 3)
+    for k, (node1, node2) in enumerate(ports):
+        np.testing.assert_almost_equal(matrices.Z[:, k, k], open_circuit_impedance(circuit, node1, node2, w))
+    np.testing.assert_almost_equal(matrices.Z, np.swapaxes(matrices.Z, 1, 2))
@@ -0,0 +1,15 @@
+import numpy as np
+from CircuitCalculator.Circuit.circuit import Circuit
+from CircuitCalculator.Circuit.Components import components as ccp
+from CircuitCalculator.Circuit.solution import compiled_circuit
+
+def test_compiled_circuit_solves_voltage_divider_for_different_resistances() -> None:
+    circuit = Circuit([
+        ccp.dc_voltage_source(id='Vs', V=10, nodes=('1', '0')),
+        ccp.resistor(id='R1', R=10, nodes=('1', '2')),
+        ccp.resistor(id='R2', R=10, nodes=('2', '0')),
+    ])
+    compiled = compiled_circuit(circuit)
+    for R2 in [1, 10, 100]:
+        solution = compiled.solve(element_values=compiled.element_vector({'R2': 1/R2}))
+        np.testing.assert_almost_equal(solution.get_voltage('R2'), 10*R2/(10+R2))
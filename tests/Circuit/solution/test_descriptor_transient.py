@@ -0,0 +1,62 @@
+from CircuitCalculator.Circuit.solution import descriptor_transient_solution, transient_solution
+from CircuitCalculator.Circuit.circuit import Circuit
+from CircuitCalculator.Circuit.Components import components as cmp
+import numpy as np
+import pytest
+
+def test_descriptor_transient_solution_equals_transient_solution() -> None:
+    circuit = Circuit(components=[
+        cmp.dc_voltage_source(id='Vs', V=1, nodes=('1', '0')),
+        cmp.resistor(id='R1', R=10, nodes=('1', '2')),
+        cmp.inductor(id='L', L=1e-2, nodes=('2', '3')),
+        cmp.capacitor(id='C', C=1e-4, nodes=('3', '0')),
+        cmp.resistor(id='R2', R=100, nodes=('3', '0')),
+        cmp.dc_current_source(id='Is', I=0.1, nodes=('0', '3')),
+    ], ground_node='0')
+    t = np.arange(0, 0.02, 1e-6)
+    input = {'Vs': lambda t: np.sin(2*np.pi*100*t), 'Is': lambda t: 0.05*np.cos(2*np.pi*300*t)}
+    reference = transient_solution(circuit, t, input)
+    for method in ['trapezoidal', 'bdf2']:
+        solution = descriptor_transient_solution(circuit, t, input, method=method)
+        np.testing.assert_allclose(solution.get_potential('3')[1], reference.get_potential('3')[1], atol=1e-5)
+        np.testing.assert_allclose(solution.get_potential('0')[1], 0)
+        for id in ['Vs', 'R1', 'L', 'C', 'R2', 'Is']:
+            np.testing.assert_allclose(solution.get_voltage(id)[1], reference.get_voltage(id)[1], atol=1e-5)
+            np.testing.assert_allclose(solution.get_current(id)[1], reference.get_current(id)[1], atol=1e-6)
+
+@pytest.mark.parametrize('method', ['backward_euler', 'trapezoidal', 'bdf2'])
+def test_descriptor_transient_solution_of_capacitor_loop(method: str) -> None:
+    C1, C2, R, w = 1e-6, 2e-6, 1e3, 2*np.pi*200
+    circuit = Circuit(components=[
+        cmp.dc_voltage_source(id='Vs', V=1, nodes=('1', '0')),
+        cmp.capacitor(id='C1', C=C1, nodes=('1', '2')),
+        cmp.capacitor(id='C2', C=C2, nodes=('2', '0')),
+        cmp.resistor(id='R', R=R, nodes=('2', '0')),
+    ], ground_node='0')
+    t = np.arange(0, 0.01, 1e-6)
+    solution = descriptor_transient_solution(circuit, t, {'Vs': lambda t: np.sin(w*t)}, method=method)
+    a, k = 1/(R*(C1+C2)), C1/(C1+C2)
+    v2 = k*w*(a*np.cos(w*t) + w*np.sin(w*t) - a*np.exp(-a*t))/(a**2 + w**2)
+    np.testing.assert_allclose(solution.get_voltage('C2')[1], v2, atol=1e-4)
+    np.testing.assert_allclose(solution.get_current('C1')[1], -solution.get_current('Vs')[1], atol=1e-12)
+    np.testing.assert_allclose(solution.get_current('C1')[1], solution.get_current('C2')[1] + solution.get_current('R')[1], atol=1e-12)
+
+def test_descriptor_transient_solution_scales_to_large_ladders() -> None:
+    n = 2000
+    components = [cmp.dc_voltage_source(id='Vs', V=1, nodes=('1', '0'))]
+    for k in range(1, n+1):
+        components.append(cmp.resistor(id=f'R{k}', R=10, nodes=(str(k), str(k+1))))
+        components.append(cmp.capacitor(id=f'C{k}', C=1e-6, nodes=(str(k+1), '0')))
+    circuit = Circuit(components=components, ground_node='0')
+    t = np.arange(0, 1e-4, 1e-6)
+    solution = descriptor_transient_solution(circuit, t, {'Vs': lambda t: np.ones_like(t)}, method='bdf2')
+    assert 0 < solution.get_voltage('C1')[1][-1] < 1
+    assert abs(solution.get_voltage(f'C{n}')[1][-1]) < 1e-6
+
+def test_descriptor_transient_solution_requires_all_inputs() -> None:
+    circuit = Circuit(components=[
+        cmp.dc_voltage_source(id='Vs', V=1, nodes=('1', '0')),
+        cmp.resistor(id='R', R=1, nodes=('1', '0')),
+    ], ground_node='0')
+    with pytest.raises(KeyError):
+        descriptor_transient_solution(circuit, np.arange(3)*1e-3, {})
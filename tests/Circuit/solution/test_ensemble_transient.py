@@ -0,0 +1,50 @@
+from CircuitCalculator.Circuit.solution import ensemble_transient_solution, transient_solution
+from CircuitCalculator.Circuit.state_space_model import numeric_state_space_model_constructor
+from CircuitCalculator.Circuit.circuit import Circuit
+from CircuitCalculator.Circuit.Components import components as cmp
+import numpy as np
+import pytest
+
+def rlc_circuit() -> Circuit:
+    return Circuit(
+        components=[
+            cmp.dc_voltage_source(id='Vs', V=1, nodes=('1', '0')),
+            cmp.resistor(id='R1', R=10, nodes=('1', '2')),
+            cmp.inductor(id='L', L=1e-2, nodes=('2', '3')),
+            cmp.capacitor(id='C', C=1e-4, nodes=('3', '0')),
+            cmp.dc_current_source(id='Is', I=0.1, nodes=('0', '3')),
+        ],
+        ground_node='0'
+    )
+
+def test_ensemble_equals_individual_transient_solutions() -> None:
+    circuit = rlc_circuit()
+    t = np.arange(0, 0.02, 1e-5)
+    rng = np.random.default_rng(0)
+    amplitudes = rng.uniform(0.5, 2, size=(6, 2))
+    frequencies = rng.uniform(50, 500, size=(6, 2))
+    u = np.stack([np.column_stack([a*np.sin(2*np.pi*f*t) for a, f in zip(amplitudes[k], frequencies[k])]) for k in range(6)])
+    ensemble = ensemble_transient_solution(circuit, t, u, sources=['Vs', 'Is'])
+    assert ensemble.get_voltage('C')[1].shape == (6, len(t))
+    for k in [0, 3, 5]:
+        reference = transient_solution(circuit, t, {'Vs': lambda t, k=k: u[k, :, 0], 'Is': lambda t, k=k: u[k, :, 1]})
+        np.testing.assert_allclose(ensemble.get_voltage('C')[1][k], reference.get_voltage('C')[1], atol=1e-10)
+        np.testing.assert_allclose(ensemble.get_current('R1')[1][k], reference.get_current('R1')[1], atol=1e-10)
+        np.testing.assert_allclose(ensemble.get_potential('2')[1][k], reference.get_potential('2')[1], atol=1e-10)
+
+def test_ensemble_input_columns_follow_state_space_sources_by_default() -> None:
+    circuit = rlc_circuit()
+    t = np.arange(0, 1e-3, 1e-5)
+    sources = numeric_state_space_model_constructor(circuit).sources
+    u = np.zeros((2, len(t), len(sources)))
+    u[:, :, sources.index('Vs')] = [[1], [2]]
+    ensemble = ensemble_transient_solution(circuit, t, u)
+    np.testing.assert_allclose(ensemble.get_potential('1')[1][:, -1], [1, 2])
+
+def test_ensemble_rejects_malformed_inputs() -> None:
+    circuit = rlc_circuit()
+    t = np.arange(0, 1e-3, 1e-5)
+    with pytest.raises(ValueError):
+        ensemble_transient_solution(circuit, t, np.zeros((len(t), 2)))
+    with pytest.raises(KeyError):
+        ensemble_transient_solution(circuit, t, np.zeros((1, len(t), 2)), sources=['Vs', 'Ix'])
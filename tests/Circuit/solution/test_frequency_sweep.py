@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+from CircuitCalculator.Circuit.circuit import Circuit, transform_circuit
+from CircuitCalculator.Circuit.Components import components as ccp
+from CircuitCalculator.Circuit.frequency_sweep import frequency_sweep_solution
+from CircuitCalculator.Circuit.impedance import open_circuit_impedance, port_matrices
+from CircuitCalculator.Circuit.solution import complex_solution, frequency_domain_solution, time_domain_solution
+from CircuitCalculator.Network.NodalAnalysis import node_analysis as na
+
+def rlc_circuit() -> Circuit:
+    return Circuit([
+        ccp.ac_voltage_source(id='Vs', V=2, w=100, phi=0.3, nodes=('1', '0')),
+        ccp.dc_voltage_source(id='Vdc', V=1, R=5, nodes=('4', '0')),
+        ccp.resistor(id='R1', R=10, nodes=('1', '2')),
+        ccp.inductor(id='L', L=0.1, nodes=('2', '3')),
+        ccp.capacitor(id='C', C=1e-4, nodes=('3', '0')),
+        ccp.resistor(id='R2', R=20, nodes=('3', '4')),
+        ccp.periodic_current_source(id='Ip', wavetype='rect', I=0.5, w=50, phi=0, nodes=('0', '3')),
+    ], ground_node='0')
+
+def test_frequency_sweep_equals_single_frequency_solutions() -> None:
+    circuit = rlc_circuit()
+    w = np.array([0, 50, 99.9995, 100, 150, 250, 333])
+    sweep = frequency_sweep_solution(circuit, w)
+    for k, w_ in enumerate(w):
+        solution = complex_solution(circuit, w=w_)
+        for id in ['Vs', 'Vdc', 'R1', 'L', 'C', 'R2', 'Ip']:
+            np.testing.assert_almost_equal(sweep.get_voltage(id)[k], solution.get_voltage(id))
+            np.testing.assert_almost_equal(sweep.get_current(id)[k], solution.get_current(id))
+            np.testing.assert_almost_equal(sweep.get_power(id)[k], solution.get_power(id))
+
+def test_frequency_sweep_returns_arrays_indexed_by_frequency_and_quantity() -> None:
+    w = np.linspace(1, 1000, 20)
+    sweep = frequency_sweep_solution(rlc_circuit(), w)
+    voltages = sweep.get_voltages(['R1', 'L', 'C'])
+    assert voltages.shape == (20, 3)
+    np.testing.assert_almost_equal(voltages[:, 1], sweep.get_voltage('L'))
+    assert sweep.get_potentials(['1', '2', '3', '0']).shape == (20, 4)
+
+def test_frequency_domain_solution_uses_sweep_results() -> None:
+    circuit = rlc_circuit()
+    w, V = frequency_domain_solution(circuit, w_max=300).get_voltage('C')
+    np.testing.assert_almost_equal(V, 1/2*np.array([complex_solution(circuit, w=w_).get_voltage('C') for w_ in w]))
+
+def test_time_domain_solution_uses_sweep_results() -> None:
+    circuit = rlc_circuit()
+    solution = time_domain_solution(circuit, w_max=300)
+    for w_, point in zip(solution.w, solution.solutions):
+        np.testing.assert_almost_equal(point.get_current('L'), complex_solution(circuit, w=w_, peak_values=True).get_current('L'))
+
+def test_open_circuit_impedance_sweep_equals_single_frequency_impedance() -> None:
+    circuit = rlc_circuit()
+    w = np.array([0, 10, 50, 100, 1000])
+    for node1, node2 in [('3', '0'), ('2', '4'), ('0', '3'), ('1', '0'), ('2', '2')]:
+        Z = open_circuit_impedance(circuit, node1, node2, w)
+        np.testing.assert_almost_equal(Z, [na.open_circuit_impedance(transform_circuit(circuit, w_), node1, node2) for w_ in w])
+
+def test_open_circuit_impedance_sweep_of_isolated_capacitor_falls_back_to_infinity() -> None:
+    circuit = Circuit([ccp.capacitor(id='C', C=1e-3, nodes=('1', '0'))], ground_node='0')
+    np.testing.assert_almost_equal(open_circuit_impedance(circuit, '1', '0', np.array([0, 10])), [float('inf'), 1/(10j*1e-3)])
+
+def test_large_bode_sweep_of_rc_lowpass() -> None:
+    R, C = 1e3, 1e-6
+    circuit = Circuit([
+        ccp.ac_voltage_source(id='Vs', V=1, w=0, nodes=('1', '0')),
+        ccp.resistor(id='R', R=R, nodes=('1', '2')),
+        ccp.capacitor(id='C', C=C, nodes=('2', '0')),
+    ], ground_node='0')
+    w = np.logspace(0, 6, 10_000)
+    Z = open_circuit_impedance(circuit, '2', '0', w)
+    np.testing.assert_almost_equal(Z, R/(1+1j*w*R*C))
+
+def test_port_matrices_of_capacitively_isolated_port_are_consistent_with_open_circuit_impedance() -> None:
+    circuit = Circuit([
+        ccp.capacitor(id='C', C=1e-3, nodes=('1', '2')),
+        ccp.resistor(id='R1', R=10, nodes=('2', '0')),
+        ccp.resistor(id='R2', R=20, nodes=('2', '3')),
+        ccp.resistor(id='R3', R=5, nodes=('3', '0')),
+    ], ground_node='0')
+    w = np.array([0, 10])
+    Z = port_matrices(circuit, [('1', '0'), ('3', '0')], w).Z
+    np.testing.assert_almost_equal(Z[:, 0, 0], open_circuit_impedance(circuit, '1', '0', w))
+    np.testing.assert_almost_equal(Z[:, 1, 1], open_circuit_impedance(circuit, '3', '0', w))
+    assert np.isnan(Z[0, 0, 1]) and np.isnan(Z[0, 1, 0])
+    np.testing.assert_almost_equal(Z[1, 0, 1], Z[1, 1, 0])
+
+def test_port_matrices_of_unknown_port_node_raise_descriptive_error() -> None:
+    with pytest.raises(KeyError, match="port \\('x', '0'\\)"):
+        port_matrices(rlc_circuit(), [('x', '0')])
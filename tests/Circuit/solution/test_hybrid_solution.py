@@ -0,0 +1,60 @@
+import numpy as np
+import sympy as sp
+from CircuitCalculator.Circuit.circuit import Circuit
+from CircuitCalculator.Circuit.Components import symbolic_components as scp
+from CircuitCalculator.Circuit.solution import hybrid_solution, no_simplification, symbolic_solution
+from CircuitCalculator.Network.NodalAnalysis import matrix_operations as mo
+
+VALUES = {'Vs': 2, 'R1': 100, 'C1': 1e-6, 'R2': 220, 'L1': 1e-3}
+
+def filter_circuit(**values: str) -> Circuit:
+    return Circuit([
+        scp.voltage_source(id='Vs', nodes=('1', '0'), **values),
+        scp.resistor(id='R1', nodes=('1', '2'), R=values.get('R1', '')),
+        scp.capacitor(id='C1', nodes=('2', '0'), C=values.get('C1', '')),
+        scp.resistor(id='R2', nodes=('2', '3'), R=values.get('R2', '')),
+        scp.resistor(id='R3', nodes=('3', '0'), R=values.get('R3', '')),
+        scp.inductor(id='L1', nodes=('3', '0'), L=values.get('L1', '')),
+        scp.ground(nodes=('0',)),
+    ])
+
+def numeric_filter_circuit() -> Circuit:
+    return filter_circuit(R1='100', C1='1e-6', R2='220', R3='300', L1='1e-3', V='2')
+
+def test_hybrid_solution_keeps_only_requested_symbols() -> None:
+    voltage = hybrid_solution(numeric_filter_circuit(), keep=('s', 'R3')).get_voltage('L1')
+    assert {symbol.name for symbol in voltage.free_symbols} == {'s', 'R3'}
+    assert voltage.atoms(sp.Float)
+    _, denominator = sp.fraction(voltage)
+    assert sp.Poly(denominator, *sorted(denominator.free_symbols, key=str)).LC() == sp.Float(1)
+
+def test_hybrid_solution_equals_substituted_symbolic_solution() -> None:
+    hybrid = hybrid_solution(numeric_filter_circuit(), keep=('s', 'R3'))
+    reference = symbolic_solution(filter_circuit(), simplification=no_simplification)
+    for component_id in ['R1', 'C1', 'L1']:
+        value = hybrid.get_voltage(component_id)
+        symbols = {symbol.name: symbol for symbol in value.free_symbols}
+        reference_value = reference.get_voltage(component_id)
+        reference_symbols = {symbol.name: symbol for symbol in reference_value.free_symbols}
+        for w, R3 in [(1e3, 300), (2e4, 47), (5e5, 1e3)]:
+            expected = reference_value.subs({reference_symbols[k]: v for k, v in (VALUES | {'s': 1j*w, 'R3': R3}).items()})
+            np.testing.assert_allclose(complex(value.subs({symbols['s']: 1j*w, symbols['R3']: R3})), complex(expected), rtol=1e-9)
+
+def test_hybrid_solution_substitutes_values_of_symbolic_components() -> None:
+    circuit = Circuit([
+        scp.voltage_source(id='Vs', nodes=('1', '0')),
+        scp.resistor(id='R1', nodes=('1', '2')),
+        scp.resistor(id='R2', nodes=('2', '0')),
+        scp.ground(nodes=('0',)),
+    ])
+    voltage = hybrid_solution(circuit, keep=('R2',), values={'s': 0, 'Vs': 10, 'R1': 1e3}).get_voltage('R2')
+    R2 = next(iter(voltage.free_symbols))
+    assert R2.name == 'R2'
+    np.testing.assert_allclose(float(voltage.subs(R2, 3e3)), 7.5)
+
+def test_hybrid_matrix_operations_keep_exact_elimination_of_floats() -> None:
+    x = sp.Symbol('x')
+    a = sp.Symbol('a')
+    ops = mo.SymPyHybridMatrixOperations({'a': 0.1})
+    value, = ops.solve(sp.Matrix([[a + x]]), sp.Matrix([0.3]))
+    assert sp.simplify(value - 0.3/(x + 0.1)) == 0
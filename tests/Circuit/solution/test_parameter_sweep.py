@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from CircuitCalculator.Circuit.circuit import Circuit
+from CircuitCalculator.Circuit.Components import components as ccp
+from CircuitCalculator.Circuit.Components.components import Component
+from CircuitCalculator.Circuit.parameter_sweep import StructureChangingSweep, dc_parameter_sweep_solution, parameter_sweep_solution
+from CircuitCalculator.Circuit.solution import complex_solution, dc_solution
+
+def divider() -> Circuit:
+    return Circuit([
+        ccp.dc_voltage_source(id='Vs', V=10, nodes=('1', '0')),
+        ccp.resistor(id='R1', R=10, nodes=('1', '2')),
+        ccp.resistor(id='R2', R=10, nodes=('2', '0')),
+        ccp.dc_current_source(id='Is', I=0.1, nodes=('0', '2')),
+    ], ground_node='0')
+
+def test_dc_parameter_sweep_broadcasts_element_values() -> None:
+    R1 = np.array([1, 10, 100])[:, np.newaxis]
+    R2 = np.array([5, 50])[np.newaxis, :]
+    solution = dc_parameter_sweep_solution(divider(), {'R1': {'R': R1}, 'R2': {'R': R2}, 'Vs': {'V': 12}})
+    assert solution.get_voltage('R2').shape == (3, 2)
+    np.testing.assert_almost_equal(solution.get_voltage('R2'), (12/R1 + 0.1)/(1/R1 + 1/R2))
+    np.testing.assert_almost_equal(solution.get_potential('0'), np.zeros((3, 2)))
+
+def test_parameter_sweep_equals_point_solutions() -> None:
+    circuit = Circuit([
+        ccp.ac_voltage_source(id='Vs', V=2, w=100, phi=0.2, R=1, nodes=('1', '0')),
+        ccp.resistor(id='R', R=10, nodes=('1', '2')),
+        ccp.capacitor(id='C', C=1e-3, nodes=('2', '0')),
+        ccp.inductor(id='L', L=1e-2, nodes=('2', '0')),
+    ], ground_node='0')
+    C = np.array([1e-4, 1e-3, 1e-2])
+    V = np.array([1, 3])[:, np.newaxis]
+    solution = parameter_sweep_solution(circuit, {'C': {'C': C}, 'Vs': {'V': V}}, w=100)
+    for (i, j), current in np.ndenumerate(solution.get_current('Vs')):
+        point = Circuit([
+            ccp.ac_voltage_source(id='Vs', V=V[i, 0], w=100, phi=0.2, R=1, nodes=('1', '0')),
+            ccp.resistor(id='R', R=10, nodes=('1', '2')),
+            ccp.capacitor(id='C', C=C[j], nodes=('2', '0')),
+            ccp.inductor(id='L', L=1e-2, nodes=('2', '0')),
+        ], ground_node='0')
+        reference = complex_solution(point, w=100)
+        np.testing.assert_almost_equal(current, reference.get_current('Vs'))
+        np.testing.assert_almost_equal(solution.get_power('C')[i, j], reference.get_power('C'))
+
+def test_array_valued_components_are_swept() -> None:
+    R2 = np.linspace(1, 100, 50)
+    circuit = Circuit([
+        ccp.dc_voltage_source(id='Vs', V=10, nodes=('1', '0')),
+        ccp.resistor(id='R1', R=10, nodes=('1', '2')),
+        Component(type='resistor', id='R2', nodes=('2', '0'), value={'R': R2}),
+    ], ground_node='0')
+    np.testing.assert_almost_equal(dc_parameter_sweep_solution(circuit).get_current('R1'), 10/(10+R2))
+
+def test_parameter_sweep_without_swept_values_equals_dc_solution() -> None:
+    solution = dc_parameter_sweep_solution(divider())
+    assert solution.get_voltage('R2').shape == ()
+    np.testing.assert_almost_equal(solution.get_voltage('R2'), dc_solution(divider()).get_voltage('R2'))
+
+def test_structure_changing_sweep_raises() -> None:
+    with pytest.raises(StructureChangingSweep):
+        parameter_sweep_solution(divider(), {'R2': {'R': np.array([1, 0])}})
+
+def test_sweep_of_unknown_component_raises() -> None:
+    with pytest.raises(KeyError):
+        parameter_sweep_solution(divider(), {'R3': {'R': np.array([1, 2])}})
+
+@pytest.mark.parametrize('R2', [np.array([1., 2., 3.]), np.array([1., 2.])])
+def test_parameter_sweep_keeps_control_nodes_of_controlled_sources(R2: np.ndarray) -> None:
+    circuit = Circuit([
+        ccp.dc_voltage_source(id='Vs', V=2, nodes=('1', '0')),
+        ccp.resistor(id='R1', R=1, nodes=('1', '0')),
+        ccp.voltage_controlled_current_source(id='G', G=0.5, nodes=('0', '2'), control_nodes=('1', '0')),
+        ccp.resistor(id='R2', R=1, nodes=('2', '0')),
+    ], ground_node='0')
+    solution = dc_parameter_sweep_solution(circuit, {'R2': {'R': R2}})
+    assert solution.get_voltage('R2').shape == R2.shape
+    np.testing.assert_almost_equal(solution.get_voltage('R2'), 0.5*2*R2)
+
+def test_parameter_sweep_raises_for_unknown_component() -> None:
+    solution = dc_parameter_sweep_solution(divider(), {'R1': {'R': np.array([1, 10])}})
+    with pytest.raises(KeyError):
+        solution.get_voltage('R3')
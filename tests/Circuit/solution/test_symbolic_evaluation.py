@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+import sympy as sp
+from CircuitCalculator.Circuit.circuit import Circuit
+from CircuitCalculator.Circuit.Components import symbolic_components as cp
+from CircuitCalculator.Circuit.impedance import symbolic_open_circuit_impedance
+from CircuitCalculator.Circuit.solution import symbolic_solution
+from CircuitCalculator.Circuit.state_space_model import symbolic_state_space_model
+from CircuitCalculator.Circuit.symbolic_evaluation import compile_expression
+
+def rc_circuit() -> Circuit:
+    return Circuit([
+        cp.voltage_source(id='Vs', nodes=('1', '0')),
+        cp.resistor(id='R', nodes=('1', '2')),
+        cp.capacitor(id='C', nodes=('2', '0')),
+        cp.ground(nodes=('0',)),
+    ])
+
+def test_compiled_voltage_broadcasts_over_parameter_and_frequency_grid() -> None:
+    voltage = symbolic_solution(rc_circuit()).get_voltage('C')
+    f = compile_expression(voltage)
+    assert f.arguments == ('s', 'C', 'R', 'Vs')
+    s = 1j*np.logspace(0, 4, 50)
+    R = np.array([10, 100, 1000])[:, np.newaxis]
+    result = f(s=s, C=1e-4, R=R, Vs=2)
+    assert result.shape == (3, 50)
+    symbols = {symbol.name: symbol for symbol in voltage.free_symbols}
+    for i, j in [(0, 0), (1, 20), (2, 49)]:
+        reference = complex(voltage.subs({symbols['s']: s[j], symbols['C']: 1e-4, symbols['R']: R[i, 0], symbols['Vs']: 2}))
+        np.testing.assert_almost_equal(result[i, j], reference)
+
+def test_compiled_impedance_accepts_positional_arguments() -> None:
+    Z = symbolic_open_circuit_impedance(rc_circuit(), '2', '0')
+    f = compile_expression(Z)
+    assert f.arguments == ('s', 'C', 'R')
+    np.testing.assert_almost_equal(f(0, 1e-3, 10), 10)
+    np.testing.assert_almost_equal(f(1j*1000, 1e-3, 10), 10/(1 + 10j))
+
+def test_compiled_state_space_matrices_have_matrix_shape() -> None:
+    model = symbolic_state_space_model(rc_circuit(), voltage_ids=['C'])
+    A = compile_expression(model.A)
+    np.testing.assert_almost_equal(A(C=[1e-3, 1e-2], R=10), [[[-100]], [[-10]]])
+    B = compile_expression(model.B, arguments=tuple(sorted(model.A.free_symbols | model.B.free_symbols, key=str)))
+    assert B(C=1e-3, R=10).shape == (1, 1)
+
+def test_compiled_expressions_are_cached() -> None:
+    x, y = sp.symbols('x y')
+    assert compile_expression(x*y + sp.sin(x*y)) is compile_expression(x*y + sp.sin(x*y))
+
+def test_compiled_expression_rejects_unknown_arguments() -> None:
+    x = sp.Symbol('x')
+    with pytest.raises(TypeError):
+        compile_expression(2*x)(y=1)
+    with pytest.raises(TypeError):
+        compile_expression(2*x)()
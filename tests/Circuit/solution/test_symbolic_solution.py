@@ -0,0 +1,74 @@
+import pytest
+import sympy as sp
+from typing import Any
+from CircuitCalculator.Circuit.circuit import Circuit
+from CircuitCalculator.Circuit.Components import symbolic_components as cp
+from CircuitCalculator.Circuit.Components import components as cmp
+from CircuitCalculator.Circuit.solution import (
+    bounded_simplification,
+    cancel_simplification,
+    factor_simplification,
+    full_simplification,
+    no_simplification,
+    symbolic_solution,
+    together_simplification,
+)
+
+def divider() -> Circuit:
+    return Circuit([
+        cp.voltage_source(id='Vs', nodes=('1', '0')),
+        cp.resistor(id='R1', nodes=('1', '2')),
+        cp.resistor(id='R2', nodes=('2', '0')),
+        cp.capacitor(id='C', nodes=('2', '0')),
+        cp.ground(nodes=('0',)),
+    ])
+
+def test_simplified_quantities_are_memoized() -> None:
+    calls: list[Any] = []
+    def counting_simplification(expression: Any) -> Any:
+        calls.append(expression)
+        return full_simplification(expression)
+    solution = symbolic_solution(divider(), simplification=counting_simplification)
+    voltage = solution.get_voltage('R2')
+    assert solution.get_voltage('R2') is voltage
+    solution.get_power('R2')
+    solution.get_power('R2')
+    assert len(calls) == 3
+
+@pytest.mark.parametrize('simplification', [cancel_simplification, together_simplification, factor_simplification, no_simplification, bounded_simplification(5)])
+def test_cheaper_simplifications_are_equivalent_to_full_simplification(simplification) -> None:
+    reference = symbolic_solution(divider())
+    solution = symbolic_solution(divider(), simplification=simplification)
+    for component_id in ['R1', 'R2', 'C']:
+        assert sp.simplify(solution.get_voltage(component_id) - reference.get_voltage(component_id)) == 0
+        assert sp.simplify(solution.get_power(component_id) - reference.get_power(component_id)) == 0
+
+def test_bounded_simplification_falls_back_for_large_expressions() -> None:
+    x, y = sp.symbols('x y')
+    used: list[str] = []
+    simplification = bounded_simplification(
+        3,
+        simplification=lambda e: used.append('full') or full_simplification(e),
+        fallback=lambda e: used.append('fallback') or cancel_simplification(e)
+    )
+    simplification(x + 1)
+    simplification((x**2 - y**2)/(x - y) + x*y + 1/x)
+    assert used == ['full', 'fallback']
+
+def test_symbolic_solution_of_float_valued_rc_ladder() -> None:
+    R1, C1, R2, C2 = 1.5, 2.2e-6, 3.3, 4.7e-6
+    circuit = Circuit([
+        cmp.dc_voltage_source(id='Vs', V=1, nodes=('1', '0')),
+        cmp.resistor(id='R1', R=R1, nodes=('1', '2')),
+        cmp.capacitor(id='C1', C=C1, nodes=('2', '0')),
+        cmp.resistor(id='R2', R=R2, nodes=('2', '3')),
+        cmp.capacitor(id='C2', C=C2, nodes=('3', '0')),
+    ], ground_node='0')
+    solution = symbolic_solution(circuit)
+    s = 1000j
+    Z2 = R2 + 1/(s*C2)
+    Z1 = R1 + 1/(s*C1 + 1/Z2)
+    expected = (1/Z1)*(1/(s*C1 + 1/Z2))*(1/(s*C2))/Z2
+    voltage, current = sp.sympify(solution.get_voltage('C2')), sp.sympify(solution.get_current('R1'))
+    assert complex(voltage.subs({x: s for x in voltage.free_symbols})) == pytest.approx(expected, rel=1e-9)
+    assert complex(current.subs({x: s for x in current.free_symbols})) == pytest.approx(1/Z1, rel=1e-9)
@@ -1,5 +1,6 @@
-from CircuitCalculator.Circuit.solution import transient_solution
+from CircuitCalculator.Circuit.solution import modal_transient_solution, sparse_transient_solution, transient_solution
 from CircuitCalculator.SignalProcessing.one_sided_functions import step
+from CircuitCalculator.SignalProcessing.state_space_model import sinusoidal_input
 from CircuitCalculator.Circuit.circuit import Circuit
 from CircuitCalculator.Circuit.Components import components as cmp
 import numpy as np
@@ -523,4 +524,69 @@ def test_transient_analysis_of_example_network_9() -> None:
     np.testing.assert_allclose(solution.get_power('Vs')[1], V*(-i_ref), atol=1e-3)
     np.testing.assert_allclose(solution.get_power('R')[1], uR_ref*i_ref, atol=1e-3)
     np.testing.assert_allclose(solution.get_power('L')[1], uL_ref*i_ref, atol=1e-3)
-    np.testing.assert_allclose(solution.get_power('C')[1], uC_ref*i_ref, atol=1e-3)
\ No newline at end of file
+    np.testing.assert_allclose(solution.get_power('C')[1], uC_ref*i_ref, atol=1e-3)
+
+def test_batch_transient_outputs_equal_single_outputs() -> None:
+    circuit = Circuit(
+        components=[
+            cmp.dc_voltage_source(id='Vs', V=1, nodes=('1', '0')),
+            cmp.resistor(id='R1', R=10, nodes=('1', '2')),
+            cmp.capacitor(id='C', C=1e-3, nodes=('2', '0')),
+            cmp.dc_current_source(id='Is', I=0.1, nodes=('0', '2')),
+            cmp.voltage_controlled_current_source(id='G', G=0.1, nodes=('0', '3'), control_nodes=('2', '0')),
+            cmp.current_controlled_current_source(id='F', current_gain=2, nodes=('0', '4'), control_branch='R1'),
+            cmp.resistor(id='R2', R=20, nodes=('3', '0')),
+            cmp.resistor(id='R3', R=30, nodes=('4', '0')),
+            cmp.inductor(id='L', L=1e-2, nodes=('4', '0')),
+        ],
+        ground_node='0'
+    )
+    t_vec = np.arange(0, 0.05, 1e-4)
+    solution = transient_solution(circuit, t_vec, {'Vs': lambda t: step(t, t0=0.01), 'Is': lambda t: 0.1*step(t, t0=0.02)})
+    t, potentials = solution.get_potentials()
+    assert potentials.shape == (5, len(t))
+    for k, node in enumerate(['0', '1', '2', '3', '4']):
+        np.testing.assert_allclose(potentials[k], solution.get_potential(node)[1])
+    ids = ['Vs', 'R1', 'C', 'Is', 'G', 'F', 'R2', 'R3', 'L']
+    _, currents = solution.get_currents(ids)
+    _, voltages = solution.get_voltages(ids)
+    for k, id in enumerate(ids):
+        np.testing.assert_allclose(currents[k], solution.get_current(id)[1])
+        np.testing.assert_allclose(voltages[k], solution.get_voltage(id)[1])
+    _, all_currents = solution.get_currents()
+    assert all_currents.shape == (len(ids), len(t))
+
+def test_modal_transient_solution_equals_stepped_solution_at_irregular_times() -> None:
+    circuit = Circuit(
+        components=[
+            cmp.dc_voltage_source(id='Vs', V=1, nodes=('1', '0')),
+            cmp.resistor(id='R1', R=10, nodes=('1', '2')),
+            cmp.inductor(id='L', L=1e-2, nodes=('2', '3')),
+            cmp.capacitor(id='C', C=1e-4, nodes=('3', '0')),
+        ],
+        ground_node='0'
+    )
+    t_ref = np.linspace(0, 0.03, 30001)
+    reference = transient_solution(circuit, t_ref, {'Vs': lambda t: np.sin(2*np.pi*100*t)})
+    t = np.array([0.0013, 0.004, 0.0111, 0.02, 0.0297])
+    solution = modal_transient_solution(circuit, t, {'Vs': sinusoidal_input(1, 2*np.pi*100, phi=-np.pi/2)})
+    for id in ['C', 'L', 'R1']:
+        np.testing.assert_allclose(solution.get_voltage(id)[1], np.interp(t, t_ref, reference.get_voltage(id)[1].real), atol=1e-6)
+        np.testing.assert_allclose(solution.get_current(id)[1], np.interp(t, t_ref, reference.get_current(id)[1].real), atol=1e-6)
+
+def test_sparse_transient_solution_converges_to_transient_solution() -> None:
+    components = [cmp.dc_voltage_source(id='Vs', V=1, nodes=('1', '0'))]
+    for k in range(1, 31):
+        components.append(cmp.resistor(id=f'R{k}', R=10, nodes=(str(k), str(k+1))))
+        components.append(cmp.capacitor(id=f'C{k}', C=1e-6, nodes=(str(k+1), '0')))
+    components.append(cmp.inductor(id='L', L=1e-3, nodes=('31', '0')))
+    circuit = Circuit(components=components, ground_node='0')
+    t = np.arange(0, 1e-3, 1e-7)
+    input = {'Vs': lambda t: np.sin(2*np.pi*5e3*t)}
+    reference = transient_solution(circuit, t, input)
+    for method in ['trapezoidal', 'krylov']:
+        solution = sparse_transient_solution(circuit, t[:2000] if method == 'krylov' else t, input, method=method)
+        n = len(solution.t)
+        for id in ['C10', 'C30', 'L']:
+            np.testing.assert_allclose(solution.get_voltage(id)[1], reference.get_voltage(id)[1][:n], atol=1e-6)
+        np.testing.assert_allclose(solution.get_current('L')[1], reference.get_current('L')[1][:n], atol=1e-6)
@@ -0,0 +1,61 @@
+from CircuitCalculator.Circuit.solution import transient_solution, transient_stream
+from CircuitCalculator.SignalProcessing.one_sided_functions import step
+from CircuitCalculator.Circuit.circuit import Circuit
+from CircuitCalculator.Circuit.Components import components as cmp
+import numpy as np
+import pytest
+
+def rlc_circuit() -> Circuit:
+    return Circuit(
+        components=[
+            cmp.dc_voltage_source(id='Vs', V=1, nodes=('1', '0')),
+            cmp.resistor(id='R1', R=10, nodes=('1', '2')),
+            cmp.inductor(id='L', L=1e-2, nodes=('2', '3')),
+            cmp.capacitor(id='C', C=1e-4, nodes=('3', '0')),
+            cmp.dc_current_source(id='Is', I=0.1, nodes=('0', '3')),
+        ],
+        ground_node='0'
+    )
+
+INPUT = {'Vs': lambda t: step(t, t0=1e-3), 'Is': lambda t: 0.1*np.sin(2*np.pi*200*t)}
+
+def test_streamed_blocks_equal_full_transient_solution() -> None:
+    circuit = rlc_circuit()
+    dt, n = 1e-5, 2500
+    reference = transient_solution(circuit, np.arange(n)*dt, INPUT)
+    blocks = list(transient_stream(circuit, dt, n, INPUT, potential_nodes=['3'], current_ids=['L', 'R1'], chunk_size=700))
+    assert [len(block.t) for block in blocks] == [700, 700, 700, 400]
+    t = np.concatenate([block.t for block in blocks])
+    np.testing.assert_allclose(t, reference.t)
+    for get in ['get_potential', 'get_current']:
+        ids = ['3'] if get == 'get_potential' else ['L', 'R1']
+        for id in ids:
+            streamed = np.concatenate([getattr(block, get)(id)[1] for block in blocks])
+            np.testing.assert_allclose(streamed, getattr(reference, get)(id)[1], atol=1e-10)
+
+def test_stream_can_be_resumed_from_checkpoint_with_array_inputs() -> None:
+    circuit = rlc_circuit()
+    dt, n = 1e-5, 2000
+    t = np.arange(n)*dt
+    u = {id: fcn(t) for id, fcn in INPUT.items()}
+    full = np.concatenate([block.get_voltage('C')[1] for block in transient_stream(circuit, dt, n, INPUT, voltage_ids=['C'], chunk_size=500)])
+    first = list(transient_stream(circuit, dt, 1200, {id: iter([v[:600], v[600:1200]]) for id, v in u.items()}, voltage_ids=['C'], chunk_size=600))
+    resumed = list(transient_stream(circuit, dt, 800, {id: iter([v[1200:]]) for id, v in u.items()}, voltage_ids=['C'], chunk_size=800, state=first[-1].state))
+    np.testing.assert_allclose(resumed[0].t, t[1200:])
+    np.testing.assert_allclose(np.concatenate([block.get_voltage('C')[1] for block in first + resumed]), full, atol=1e-10)
+
+def test_stream_rejects_unselected_outputs_and_mismatching_chunks() -> None:
+    circuit = rlc_circuit()
+    block = next(transient_stream(circuit, 1e-5, 10, INPUT, voltage_ids=['C']))
+    with pytest.raises(KeyError):
+        block.get_current('C')
+    with pytest.raises(ValueError):
+        next(transient_stream(circuit, 1e-5, 10, {'Vs': iter([np.zeros(5)]), 'Is': INPUT['Is']}))
+
+def test_stream_rejects_exhausted_inputs_and_mismatching_time_steps() -> None:
+    circuit = rlc_circuit()
+    with pytest.raises(ValueError, match='exhausted'):
+        list(transient_stream(circuit, 1e-5, 20, {'Vs': iter([np.zeros(10)]), 'Is': INPUT['Is']}, chunk_size=10))
+    block = next(transient_stream(circuit, 1e-9, 10, INPUT))
+    with pytest.raises(ValueError):
+        next(transient_stream(circuit, 2e-9, 10, INPUT, state=block.state))
@@ -1,8 +1,12 @@
+import numpy as np
 from numpy.testing import assert_almost_equal
+import pytest
 
 from CircuitCalculator.Circuit import terminal_analysis as ta
-from CircuitCalculator.Circuit.circuit import Circuit
+from CircuitCalculator.Circuit.circuit import Circuit, transform_circuit
+from CircuitCalculator.Network.NodalAnalysis import network_analysis, node_analysis
 from CircuitCalculator.Circuit.Components import components as cp
+from CircuitCalculator.Network.solution import NetworkSolutionException
 
 
 def voltage_divider_circuit() -> Circuit:
@@ -80,3 +84,77 @@ def test_frequency_parameter_selects_operating_point() -> None:
     voltage = ta.open_circuit_voltage(voltage_divider_circuit(), '2', '0', w=1)
 
     assert_almost_equal(voltage, 0)
+
+
+def rc_feeder_circuit() -> Circuit:
+    return Circuit(
+        components=[
+            cp.ac_voltage_source(V=10, w=100, phi=0.4, id='V', nodes=('1', '0')),
+            cp.resistor(R=10, id='R1', nodes=('1', '2')),
+            cp.capacitor(C=1e-3, id='C', nodes=('2', '0')),
+            cp.resistor(R=20, id='R2', nodes=('2', '3')),
+            cp.resistor(R=30, id='R3', nodes=('3', '0'))
+        ],
+        ground_node='0'
+    )
+
+
+def test_equivalent_source_parameters_are_batched_over_terminals_and_frequencies() -> None:
+    terminals = [('2', '0'), ('3', '0'), ('3', '2')]
+    w = np.array([0, 100, 200])
+    parameters = ta.equivalent_source_parameters(rc_feeder_circuit(), terminals, w)
+
+    assert parameters.impedance.shape == (3, 3)
+    for i, w_ in enumerate(w):
+        for k, (node1, node2) in enumerate(terminals):
+            network = transform_circuit(rc_feeder_circuit(), w_)
+            assert_almost_equal(parameters[i, k].open_circuit_voltage, network_analysis.open_circuit_voltage(network, node1, node2))
+            assert_almost_equal(parameters[i, k].impedance, node_analysis.open_circuit_impedance(network, node1, node2))
+            assert_almost_equal(parameters[i, k].short_circuit_current, network_analysis.short_circuit_current(network, node1, node2))
+
+
+def test_impedance_across_ideal_voltage_source_is_exactly_zero() -> None:
+    resistors = [('1', '2', 9.66), ('1', '0', 2.66), ('4', '1', 2.34), ('0', '3', 2.95), ('3', '2', 8.12), ('2', '0', 2.96), ('2', '1', 6.3), ('3', '4', 3.76)]
+    circuit = Circuit(
+        components=[cp.dc_voltage_source(V=3, id='V', nodes=('1', '2'))]
+        + [cp.resistor(R=R, id=f'R{k}', nodes=(node1, node2)) for k, (node1, node2, R) in enumerate(resistors)],
+        ground_node='0'
+    )
+    parameters = ta.equivalent_source_parameters(circuit, [('1', '2')], np.array([0]))
+
+    assert parameters.impedance[0, 0] == 0
+    assert np.isinf(parameters.admittance[0, 0])
+    assert np.isinf(parameters.short_circuit_current[0, 0])
+
+
+def test_impedance_across_series_ideal_voltage_sources_is_exactly_zero() -> None:
+    circuit = Circuit(
+        components=[
+            cp.dc_voltage_source(V=3, id='V1', nodes=('1', '2')),
+            cp.dc_voltage_source(V=2, id='V2', nodes=('2', '3')),
+            cp.resistor(R=3.9, id='R1', nodes=('1', '0')),
+            cp.resistor(R=0.3, id='R2', nodes=('2', '0')),
+            cp.resistor(R=0.9, id='R3', nodes=('3', '0'))
+        ],
+        ground_node='0'
+    )
+    parameters = ta.equivalent_source_parameters(circuit, [('1', '3'), ('1', '0')], np.array([0]))
+
+    assert parameters.impedance[0, 0] == 0
+    assert np.isinf(parameters.short_circuit_current[0, 0])
+    assert np.isinf(parameters.admittance[0, 0])
+    assert parameters.impedance[0, 1] != 0
+
+
+def test_equivalent_source_parameters_of_unsolvable_circuit_raise() -> None:
+    circuit = Circuit(
+        components=[
+            cp.dc_current_source(I=1, id='I1', nodes=('1', '0')),
+            cp.resistor(R=10, id='R', nodes=('1', '2')),
+            cp.dc_current_source(I=1, id='I2', nodes=('2', '0'))
+        ],
+        ground_node='0'
+    )
+    with pytest.raises(NetworkSolutionException) as e:
+        ta.equivalent_source_parameters(circuit, [('1', '0')])
+    assert e.value.floating_nodes == ('1', '2')
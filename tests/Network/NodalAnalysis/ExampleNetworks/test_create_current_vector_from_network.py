@@ -1,10 +1,14 @@
-from CircuitCalculator.Network.NodalAnalysis.node_analysis_calculations import current_source_incidence_vector
-from CircuitCalculator.Network.NodalAnalysis.label_mapping import default_label_mappings_factory
-from CircuitCalculator.Network.NodalAnalysis.matrix_operations import NumPyMatrixOperations
+from CircuitCalculator.Network.NodalAnalysis.node_analysis_calculations import nodal_analysis_system
+from CircuitCalculator.Network.NodalAnalysis.label_mapping import NetworkLabelMappings, default_label_mappings_factory
+from CircuitCalculator.Network.NodalAnalysis.matrix_operations import Matrix, MatrixOperations, NumPyMatrixOperations
 from CircuitCalculator.Network.network import Network, Branch
 from CircuitCalculator.Network.elements import resistor, voltage_source, current_source
 import numpy as np
 
+def current_source_incidence_vector(network: Network, matrix_ops: MatrixOperations, label_mappings: NetworkLabelMappings) -> Matrix:
+    _, b = nodal_analysis_system(network, matrix_ops, label_mappings)
+    return b[:label_mappings.node_mapping.N, :]
+
 def test_create_current_vector_from_reference_network_1() -> None:
     Vq = 1+0j
     R = 1
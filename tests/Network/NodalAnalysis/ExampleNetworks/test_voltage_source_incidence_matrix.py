@@ -1,10 +1,14 @@
-from CircuitCalculator.Network.NodalAnalysis.node_analysis_calculations import voltage_source_incidence_matrix
-from CircuitCalculator.Network.NodalAnalysis.label_mapping import default_label_mappings_factory
-from CircuitCalculator.Network.NodalAnalysis.matrix_operations import NumPyMatrixOperations
+from CircuitCalculator.Network.NodalAnalysis.node_analysis_calculations import nodal_analysis_coefficient_matrix
+from CircuitCalculator.Network.NodalAnalysis.label_mapping import NetworkLabelMappings, default_label_mappings_factory
+from CircuitCalculator.Network.NodalAnalysis.matrix_operations import Matrix, MatrixOperations, NumPyMatrixOperations
 from CircuitCalculator.Network.network import Network, Branch
 from CircuitCalculator.Network.elements import resistor, voltage_source, current_source
 import numpy as np
 
+def voltage_source_incidence_matrix(network: Network, matrix_ops: MatrixOperations, label_mappings: NetworkLabelMappings) -> Matrix:
+    N = label_mappings.node_mapping.N
+    return nodal_analysis_coefficient_matrix(network, matrix_ops, label_mappings)[:N, N:]
+
 def test_voltage_source_incidence_matrix_from_reference_network_1() -> None:
     Vq = 1+0j
     R = 1
@@ -1,10 +1,14 @@
-from CircuitCalculator.Network.NodalAnalysis.node_analysis_calculations import current_source_incidence_vector
-from CircuitCalculator.Network.NodalAnalysis.label_mapping import default_label_mappings_factory
-from CircuitCalculator.Network.NodalAnalysis.matrix_operations import SymPyMatrixOperations
+from CircuitCalculator.Network.NodalAnalysis.node_analysis_calculations import nodal_analysis_system
+from CircuitCalculator.Network.NodalAnalysis.label_mapping import NetworkLabelMappings, default_label_mappings_factory
+from CircuitCalculator.Network.NodalAnalysis.matrix_operations import Matrix, MatrixOperations, SymPyMatrixOperations
 from CircuitCalculator.Network.network import Network, Branch
 from CircuitCalculator.Network.symbolic_elements import resistor, voltage_source, current_source
 import sympy as sp
 
+def current_source_incidence_vector(network: Network, matrix_ops: MatrixOperations, label_mappings: NetworkLabelMappings) -> Matrix:
+    _, b = nodal_analysis_system(network, matrix_ops, label_mappings)
+    return b[:label_mappings.node_mapping.N, :]
+
 def test_create_current_vector_from_reference_network_1() -> None:
     network = Network(
         [
@@ -24,7 +28,7 @@ def test_create_current_vector_from_reference_network_2() -> None:
         ]
     )
     I = current_source_incidence_vector(network, matrix_ops=SymPyMatrixOperations(), label_mappings=default_label_mappings_factory(network))
-    I_ref = sp.Matrix(['1.0*Iq'])
+    I_ref = sp.Matrix(['Iq'])
     assert sp.simplify(I) == I_ref
 
 def test_create_current_vector_from_reference_network_3() -> None:
@@ -36,7 +40,7 @@ def test_create_current_vector_from_reference_network_3() -> None:
         ]
     )
     I = current_source_incidence_vector(network, matrix_ops=SymPyMatrixOperations(), label_mappings=default_label_mappings_factory(network))
-    I_ref = sp.Matrix([['1.0*Iq'],
+    I_ref = sp.Matrix([['Iq'],
                        ['0']])
     assert I == I_ref
 
@@ -97,7 +101,7 @@ def test_create_current_vector_from_reference_network_7() -> None:
         ]
     )
     I = current_source_incidence_vector(network, matrix_ops=SymPyMatrixOperations(), label_mappings=default_label_mappings_factory(network))
-    I_ref = sp.Matrix([[0], [0], ['-1.0*I4'], [0], ['1.0*I4']])
+    I_ref = sp.Matrix([[0], [0], ['-I4'], [0], ['I4']])
     assert I == I_ref
 
 def test_create_current_vector_from_reference_network_10() -> None:
@@ -114,7 +118,7 @@ def test_create_current_vector_from_reference_network_10() -> None:
         ]
     )
     I = current_source_incidence_vector(network, matrix_ops=SymPyMatrixOperations(), label_mappings=default_label_mappings_factory(network))
-    I_ref = sp.Matrix([[0], [0], ['1.0*I4'], ['-1.0*I4']])
+    I_ref = sp.Matrix([[0], [0], ['I4'], ['-I4']])
     assert I == I_ref
 
 def test_create_current_vector_from_reference_network_13() -> None:
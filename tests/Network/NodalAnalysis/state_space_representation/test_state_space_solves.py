@@ -0,0 +1,51 @@
+import numpy as np
+import scipy.sparse
+
+from CircuitCalculator.Circuit.circuit import Circuit
+from CircuitCalculator.Circuit.Components import components as cp
+from CircuitCalculator.Circuit.solution import complex_solution
+from CircuitCalculator.Circuit.state_space_model import numeric_state_space_model
+from CircuitCalculator.Network.NodalAnalysis import matrix_operations as mo
+from CircuitCalculator.Network.NodalAnalysis.node_analysis import state_space_matrices
+from CircuitCalculator.Network.elements import open_circuit, resistor, voltage_source
+from CircuitCalculator.Network.network import Branch, Network
+
+
+def rc_ladder(n: int) -> Network:
+    branches = [Branch('1', '0', voltage_source('Vs', 1))]
+    for k in range(1, n+1):
+        branches.append(Branch(str(k), str(k+1), resistor(f'R{k}', 10*k)))
+        branches.append(Branch(str(k+1), '0', open_circuit(f'C{k}')))
+    return Network(branches)
+
+
+def test_state_space_matrices_of_large_ladder_match_sparse_solves() -> None:
+    network = rc_ladder(300)
+    c_values = {f'C{k}': 1e-6*k for k in range(1, 301)}
+    dense = state_space_matrices(network, c_values=c_values, matrix_ops=mo.NumPyMatrixOperations())
+    sparse = state_space_matrices(network, c_values=c_values, matrix_ops=mo.SciPySparseMatrixOperations())
+    for M_sparse, M_dense in zip(sparse, dense):
+        assert scipy.sparse.issparse(M_sparse)
+        np.testing.assert_allclose(M_sparse.toarray(), M_dense, rtol=1e-9, atol=1e-6)
+    assert sparse[0].nnz == 3*300 - 2
+    A = np.real(dense[0])
+    np.testing.assert_allclose(A[0, :2], [-(1/10 + 1/20)/1e-6, 1/20/1e-6])
+
+
+def test_state_space_model_matches_phasor_solution_with_controlled_source() -> None:
+    circuit = Circuit([
+        cp.ac_voltage_source(id='Vs', nodes=('1', '0'), V=1, w=1e3),
+        cp.resistor(id='R1', nodes=('1', '2'), R=100),
+        cp.capacitor(id='C1', nodes=('2', '0'), C=1e-6),
+        cp.voltage_controlled_current_source(id='G', nodes=('0', '3'), G=0.02, control_nodes=('2', '0')),
+        cp.resistor(id='R2', nodes=('3', '4'), R=50),
+        cp.inductor(id='L1', nodes=('4', '0'), L=1e-2),
+        cp.resistor(id='R3', nodes=('3', '0'), R=200),
+    ])
+    nodes = ['2', '3', '4']
+    model = numeric_state_space_model(circuit, potential_nodes=nodes)
+    w = 1e3
+    H = model.C @ np.linalg.solve(1j*w*np.eye(model.A.shape[0]) - model.A, model.B) + model.D
+    reference = complex_solution(circuit, w=w, peak_values=True)
+    for k, node in enumerate(nodes):
+        np.testing.assert_allclose(H[k, 0], reference.get_potential(node), rtol=1e-9)
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from CircuitCalculator.Network.NodalAnalysis.compiled_network import compile_network
+from CircuitCalculator.Network.NodalAnalysis.node_analysis import NodalAnalysisException
+from CircuitCalculator.Network.NodalAnalysis.solution import numeric_nodal_analysis_bias_point_solution
+from CircuitCalculator.Network.elements import (
+    current_controlled_current_source,
+    current_controlled_voltage_source,
+    current_source,
+    impedance,
+    resistor,
+    voltage_controlled_current_source,
+    voltage_controlled_voltage_source,
+    voltage_source,
+)
+from CircuitCalculator.Network.network import Branch, Network
+
+
+def example_network(R1: float = 10, Vs: float = 2, Is: float = 0.5, F: float = 3) -> Network:
+    return Network([
+        Branch('1', '0', voltage_source('Vs', Vs)),
+        Branch('1', '2', resistor('R1', R1)),
+        Branch('2', '0', impedance('Z1', complex(5, 3))),
+        Branch('3', '2', current_source('Is', Is, Y=0.1)),
+        Branch('3', '0', resistor('R2', 20)),
+        Branch('4', '0', voltage_controlled_current_source('G', 0.2, control_nodes=('2', '0'))),
+        Branch('4', '0', resistor('R3', 30)),
+        Branch('5', '0', current_controlled_current_source('F', F, control_branch='Vs')),
+        Branch('5', '0', resistor('R4', 40)),
+        Branch('6', '0', voltage_controlled_voltage_source('E', 2, control_nodes=('3', '0'))),
+        Branch('6', '7', resistor('R5', 50)),
+        Branch('7', '0', current_controlled_voltage_source('H', 4, control_branch='Is')),
+        Branch('8', '0', voltage_source('Vr', 1, Z=5)),
+        Branch('8', '0', current_controlled_current_source('K', 2, control_branch='Vr')),
+        Branch('a', 'b', resistor('Rf', 1)),
+    ])
+
+
+def assert_solutions_equal(solution, reference, network: Network) -> None:
+    for node in network.node_labels:
+        np.testing.assert_almost_equal(solution.get_potential(node), reference.get_potential(node))
+    for branch_id in network.branch_ids:
+        np.testing.assert_almost_equal(solution.get_voltage(branch_id), reference.get_voltage(branch_id))
+        np.testing.assert_almost_equal(solution.get_current(branch_id), reference.get_current(branch_id))
+        np.testing.assert_almost_equal(solution.get_power(branch_id), reference.get_power(branch_id))
+
+
+def test_compiled_network_reproduces_nodal_analysis_solution() -> None:
+    network = example_network()
+    solution = compile_network(network).solve()
+    assert_solutions_equal(solution, numeric_nodal_analysis_bias_point_solution(network), network)
+
+
+def test_compiled_network_resolves_with_changed_element_values() -> None:
+    compiled = compile_network(example_network())
+    solution = compiled.solve(element_values=compiled.element_vector({'R1': 1/25, 'F': 5}))
+    modified_network = example_network(R1=25, F=5)
+    assert_solutions_equal(solution, numeric_nodal_analysis_bias_point_solution(modified_network), modified_network)
+
+
+def test_compiled_network_resolves_with_changed_source_values() -> None:
+    compiled = compile_network(example_network())
+    solution = compiled.solve(source_values=compiled.source_vector({'Vs': 7, 'Is': -1}))
+    modified_network = example_network(Vs=7, Is=-1)
+    assert_solutions_equal(solution, numeric_nodal_analysis_bias_point_solution(modified_network), modified_network)
+
+
+def test_compiled_network_keeps_structure_of_original_network() -> None:
+    compiled = compile_network(example_network())
+    A1 = compiled.coefficient_matrix()
+    A2 = compiled.coefficient_matrix(compiled.element_vector({'R1': 1}))
+    np.testing.assert_array_equal(A1.indices, A2.indices)
+    np.testing.assert_array_equal(A1.indptr, A2.indptr)
+
+
+def test_compiled_network_rejects_unknown_parameter() -> None:
+    compiled = compile_network(example_network())
+    with pytest.raises(KeyError):
+        compiled.element_vector({'X': 1})
+    with pytest.raises(KeyError):
+        compiled.source_vector({'R1': 1})
+
+
+def test_compiled_network_raises_on_singular_network() -> None:
+    compiled = compile_network(Network([
+        Branch('1', '0', current_source('Is', 1)),
+        Branch('1', '0', resistor('R', 1)),
+    ]))
+    with pytest.raises(NodalAnalysisException):
+        compiled.solve(element_values=compiled.element_vector({'R': 0}))
@@ -5,8 +5,6 @@ import sympy as sp
 from CircuitCalculator.Network.NodalAnalysis.label_mapping import default_label_mappings_factory
 from CircuitCalculator.Network.NodalAnalysis.matrix_operations import NumPyMatrixOperations, SymPyMatrixOperations
 from CircuitCalculator.Network.NodalAnalysis.node_analysis_calculations import (
-    current_controlled_current_source_admittance_matrix,
-    current_controlled_current_source_incidence_matrix,
     InvalidControlledSource,
     nodal_analysis_coefficient_matrix,
 )
@@ -42,17 +40,17 @@ def test_current_controlled_current_source_stamps_voltage_source_current_block()
         reference_node_label='0',
     )
 
-    B = current_controlled_current_source_incidence_matrix(
+    A = nodal_analysis_coefficient_matrix(
         network,
         NumPyMatrixOperations(),
         default_label_mappings_factory(network),
     )
 
     B_ref = np.array([
-        [0],
+        [1],
         [-current_gain],
     ], dtype=complex)
-    np.testing.assert_almost_equal(B, B_ref)
+    np.testing.assert_almost_equal(A[:2, 2:], B_ref)
 
 
 def test_current_controlled_current_source_only_changes_top_right_mna_block() -> None:
@@ -234,17 +232,17 @@ def test_current_controlled_current_source_stamps_control_branch_admittance() ->
         reference_node_label='0',
     )
 
-    Y = current_controlled_current_source_admittance_matrix(
+    A = nodal_analysis_coefficient_matrix(
         network,
         NumPyMatrixOperations(),
         default_label_mappings_factory(network),
     )
 
     Y_ref = np.array([
-        [0, 0],
-        [-current_gain, 0],
+        [1, 0],
+        [-current_gain, 1],
     ], dtype=complex)
-    np.testing.assert_almost_equal(Y, Y_ref)
+    np.testing.assert_almost_equal(A[:2, :2], Y_ref)
 
 
 def test_symbolic_current_controlled_current_source_stamps_mna_matrix() -> None:
@@ -308,7 +306,7 @@ def test_current_controlled_current_source_requires_existing_control_branch() ->
     )
 
     with pytest.raises(InvalidControlledSource):
-        current_controlled_current_source_incidence_matrix(
+        nodal_analysis_coefficient_matrix(
             network,
             NumPyMatrixOperations(),
             default_label_mappings_factory(network),
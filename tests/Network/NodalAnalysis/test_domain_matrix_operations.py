@@ -0,0 +1,48 @@
+import pytest
+import sympy as sp
+
+from CircuitCalculator.Network.NodalAnalysis import matrix_operations as mo
+from CircuitCalculator.Network.NodalAnalysis.solution import symbolic_nodal_analysis_bias_point_solution
+from CircuitCalculator.Network.symbolic_elements import impedance, resistor, voltage_source
+from CircuitCalculator.Network.network import Branch, Network
+
+
+def symbolic_ladder(n: int) -> Network:
+    R, C, s = sp.symbols('R C s')
+    branches = [Branch('1', '0', voltage_source('Vs', sp.Symbol('V')))]
+    for k in range(1, n):
+        branches.append(Branch(str(k), str(k+1), resistor(f'R{k}', R*(k % 3 + 1))))
+        branches.append(Branch(str(k+1), '0', impedance(f'C{k}', 1/(s*C*k))))
+    return Network(branches)
+
+
+def test_domain_matrix_solve_equals_dense_solve() -> None:
+    a, b, s = sp.symbols('a b s')
+    A = sp.Matrix([[1/a + s, -1/a, 0], [-1/a, 1/a + 1/b, -1/b], [0, -1/b, 1/b + 2*s + sp.I]])
+    rhs = sp.Matrix([1, 0, sp.Rational(1, 2)])
+    x = mo.SymPyDomainMatrixOperations.solve(A, rhs)
+    for value, reference in zip(x, A.LUsolve(rhs)):
+        assert sp.simplify(value - reference) == 0
+
+
+def test_domain_matrix_inverse_equals_dense_inverse() -> None:
+    a, b = sp.symbols('a b')
+    A = sp.Matrix([[a, 1, 0], [2, b, 1], [0, 3, a + b]])
+    assert sp.simplify(mo.SymPyDomainMatrixOperations.inv(A) - A.inv()) == sp.zeros(3, 3)
+
+
+def test_domain_matrix_solve_of_singular_matrix_raises() -> None:
+    a = sp.Symbol('a')
+    with pytest.raises(mo.MatrixInversionException):
+        mo.SymPyDomainMatrixOperations.solve(sp.Matrix([[a, 2*a], [1, 2]]), sp.Matrix([1, 0]))
+
+
+def test_symbolic_solution_of_large_ladder_is_tractable() -> None:
+    solution = symbolic_nodal_analysis_bias_point_solution(symbolic_ladder(20))
+    voltage = solution.get_voltage('C19')
+    V, R, C, s = sp.symbols('V R C s')
+    assert voltage == sp.cancel(voltage)
+    numerator, denominator = sp.fraction(voltage)
+    assert numerator.free_symbols == {V}
+    assert sp.degree(denominator, s) == 19
+    assert voltage.subs(s, 0) == V
@@ -0,0 +1,70 @@
+from CircuitCalculator.Network.NodalAnalysis.label_mapping import LabelMapping, NetworkLabelMappings, default_label_mappings_factory
+from CircuitCalculator.Network.NodalAnalysis import label_mapping as map
+from CircuitCalculator.Network.network import Network, Branch
+from CircuitCalculator.Network.elements import resistor, voltage_source, current_source
+
+def test_label_mapping_provides_inverse_mapping() -> None:
+    label_mapping = LabelMapping({'a': 1, 'b': 0, 'c': 2})
+    assert label_mapping.inverse == {1: 'a', 0: 'b', 2: 'c'}
+    assert label_mapping.label(2) == 'c'
+
+def test_label_mapping_supports_membership_test() -> None:
+    label_mapping = LabelMapping({'a': 1, 'b': 0})
+    assert 'a' in label_mapping
+    assert 'x' not in label_mapping
+
+def test_network_label_mappings_are_computed_once() -> None:
+    calls: list[str] = []
+    def counting(mapper: map.LabelMapper) -> map.LabelMapper:
+        def counting_mapper(network: Network) -> LabelMapping:
+            calls.append(mapper.__name__)
+            return mapper(network)
+        return counting_mapper
+    network = Network([
+        Branch('1', '0', voltage_source('Vs', 1)),
+        Branch('1', '2', resistor('R', 1)),
+        Branch('2', '0', current_source('Is', 1)),
+    ])
+    label_mappings = NetworkLabelMappings(
+        network=network,
+        node_mapper=counting(map.alphabetic_node_mapper),
+        source_mapper=counting(map.alphabetic_source_mapper),
+        current_source_mapper=counting(map.alphabetic_current_source_mapper),
+        voltage_source_mapper=counting(map.alphabetic_voltage_source_mapper),
+    )
+    for _ in range(3):
+        label_mappings.node_mapping
+        label_mappings.source_mapping
+        label_mappings.current_source_mapping
+        label_mappings.voltage_source_current_mapping
+    assert sorted(calls) == sorted([
+        'alphabetic_node_mapper',
+        'alphabetic_source_mapper',
+        'alphabetic_current_source_mapper',
+        'alphabetic_voltage_source_mapper',
+    ])
+
+def test_default_label_mappings_inverse_maps_indices_to_labels() -> None:
+    network = Network([
+        Branch('1', '0', voltage_source('Vs', 1)),
+        Branch('1', '2', resistor('R', 1)),
+    ])
+    label_mappings = default_label_mappings_factory(network)
+    assert label_mappings.node_mapping.inverse == {0: '1', 1: '2'}
+    assert label_mappings.voltage_source_mapping.inverse == {0: 'Vs'}
+
+def test_nodal_analysis_solution_builds_label_mappings_once() -> None:
+    from CircuitCalculator.Network.NodalAnalysis.solution import numeric_nodal_analysis_bias_point_solution
+    factory_calls: list[Network] = []
+    def counting_factory(network: Network) -> NetworkLabelMappings:
+        factory_calls.append(network)
+        return default_label_mappings_factory(network)
+    network = Network([
+        Branch('1', '0', voltage_source('Vs', 1)),
+        Branch('1', '2', resistor('R', 1)),
+        Branch('2', '0', current_source('Is', 1)),
+    ])
+    solution = numeric_nodal_analysis_bias_point_solution(network, label_mappings_factory=counting_factory)
+    solution.get_voltage('R')
+    solution.get_current('Vs')
+    assert len(factory_calls) == 1
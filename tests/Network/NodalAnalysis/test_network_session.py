@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+import scipy.sparse.linalg
+from CircuitCalculator.Network.NodalAnalysis import network_session
+from CircuitCalculator.Network.NodalAnalysis.network_session import NetworkSession
+from CircuitCalculator.Network.NodalAnalysis.solution import numeric_nodal_analysis_bias_point_solution
+from CircuitCalculator.Network.elements import (
+    current_controlled_current_source,
+    current_source,
+    resistor,
+    short_circuit,
+    voltage_controlled_current_source,
+    voltage_source,
+)
+from CircuitCalculator.Network.network import AmbiguousBranchIDs, Branch, Network
+
+def ladder_network(n: int = 10) -> Network:
+    return Network(
+        [Branch('1', '0', voltage_source('Vs', 10, Z=1))]
+        + [Branch(str(k), str(k+1), resistor(f'R{k}', k)) for k in range(1, n)]
+        + [Branch(str(k), '0', resistor(f'G{k}', 2*k)) for k in range(2, n+1)]
+        + [Branch('0', str(n), current_source('Is', 0.5))]
+        + [Branch('0', '3', voltage_controlled_current_source('G', 0.01, control_nodes=('2', '0')))]
+        + [Branch('0', '4', current_controlled_current_source('F', 0.5, control_branch='R2'))]
+    )
+
+@pytest.fixture
+def factorizations(monkeypatch) -> list[int]:
+    calls: list[int] = []
+    splu = scipy.sparse.linalg.splu
+    def counting_splu(A, *args, **kwargs):
+        calls.append(A.shape[0])
+        return splu(A, *args, **kwargs)
+    monkeypatch.setattr(network_session.scipy.sparse.linalg, 'splu', counting_splu)
+    return calls
+
+def assert_session_equals_nodal_analysis(session: NetworkSession) -> None:
+    reference = numeric_nodal_analysis_bias_point_solution(session.network)
+    for branch_id in session.network.branch_ids:
+        np.testing.assert_almost_equal(session.get_voltage(branch_id), reference.get_voltage(branch_id))
+        np.testing.assert_almost_equal(session.get_current(branch_id), reference.get_current(branch_id))
+
+def test_changed_element_values_are_updated_with_low_rank_corrections(factorizations: list[int]) -> None:
+    session = NetworkSession(ladder_network())
+    session.solve()
+    session.change_element(resistor('R3', 100))
+    session.change_element(current_source('Is', 2))
+    session.change_element(voltage_source('Vs', 5, Z=2))
+    session.change_element(current_controlled_current_source('F', 2, control_branch='R2'))
+    assert_session_equals_nodal_analysis(session)
+    assert len(factorizations) == 1
+
+def test_removed_and_inserted_elements_are_updated_with_low_rank_corrections() -> None:
+    session = NetworkSession(ladder_network())
+    session.remove_element('G5')
+    session.insert_element(Branch('2', '7', resistor('Rx', 3)))
+    session.insert_element(Branch('0', '6', current_source('Ix', 1, Y=0.1)))
+    assert_session_equals_nodal_analysis(session)
+    session.change_element(resistor('Rx', 30))
+    session.remove_element('Ix')
+    assert_session_equals_nodal_analysis(session)
+    with pytest.raises(KeyError):
+        session.get_current('G5')
+
+def test_structural_edits_rebuild_the_session() -> None:
+    session = NetworkSession(ladder_network())
+    session.change_element(short_circuit('R4'))
+    session.insert_element(Branch('9', '11', resistor('Rnew', 1)))
+    session.insert_element(Branch('11', '0', resistor('Rnew2', 1)))
+    assert_session_equals_nodal_analysis(session)
+
+def test_removing_bridge_element_falls_back_to_rebuild() -> None:
+    session = NetworkSession(ladder_network())
+    session.remove_element('R9')
+    session.remove_element('G10')
+    session.remove_element('Is')
+    assert_session_equals_nodal_analysis(session)
+    with pytest.raises(KeyError):
+        session.get_potential('10')
+
+def test_session_refactorizes_after_many_edits(factorizations: list[int]) -> None:
+    session = NetworkSession(ladder_network(), max_rank=4)
+    session.solve()
+    for k in range(1, 10):
+        session.change_element(resistor(f'R{k}', 10*k))
+    assert_session_equals_nodal_analysis(session)
+    assert len(factorizations) == 2
+
+def test_inserting_existing_branch_id_raises() -> None:
+    session = NetworkSession(ladder_network())
+    with pytest.raises(AmbiguousBranchIDs):
+        session.insert_element(Branch('1', '2', resistor('R1', 1)))
+
+def test_edits_of_large_network_reuse_the_factorization(factorizations: list[int]) -> None:
+    n = 3000
+    session = NetworkSession(ladder_network(n), max_rank=64)
+    session.solve()
+    for k in range(1, 21):
+        session.change_element(resistor(f'R{k*100}', 2))
+        session.solve()
+    assert len(factorizations) == 1
+    np.testing.assert_almost_equal(
+        session.get_potential(str(n)),
+        numeric_nodal_analysis_bias_point_solution(session.network).get_potential(str(n))
+    )
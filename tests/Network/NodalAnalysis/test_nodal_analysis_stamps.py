@@ -0,0 +1,98 @@
+import numpy as np
+
+from CircuitCalculator.Network.NodalAnalysis import node_analysis_calculations
+from CircuitCalculator.Network.NodalAnalysis.label_mapping import default_label_mappings_factory
+from CircuitCalculator.Network.NodalAnalysis.matrix_operations import NumPyMatrixOperations
+from CircuitCalculator.Network.NodalAnalysis.node_analysis import nodal_analysis_solution
+from CircuitCalculator.Network.NodalAnalysis.node_analysis_calculations import (
+    nodal_analysis_coefficient_matrix,
+    nodal_analysis_stamps,
+    nodal_analysis_system,
+)
+from CircuitCalculator.Network.elements import (
+    current_controlled_current_source,
+    current_controlled_voltage_source,
+    current_source,
+    impedance,
+    resistor,
+    voltage_controlled_current_source,
+    voltage_controlled_voltage_source,
+    voltage_source,
+)
+from CircuitCalculator.Network.network import Branch, Network
+
+
+def controlled_source_network() -> Network:
+    return Network(
+        branches=[
+            Branch('1', '0', voltage_source('Vs', 2, Z=0)),
+            Branch('1', '2', resistor('R1', 10)),
+            Branch('2', '0', impedance('Z1', complex(5, 3))),
+            Branch('3', '2', current_source('Is', 0.5, Y=0.1)),
+            Branch('3', '0', resistor('R2', 20)),
+            Branch('4', '0', voltage_controlled_current_source('G', 0.2, control_nodes=('2', '0'))),
+            Branch('4', '0', resistor('R3', 30)),
+            Branch('5', '0', current_controlled_current_source('F', 3, control_branch='Vs')),
+            Branch('5', '0', resistor('R4', 40)),
+            Branch('6', '0', voltage_controlled_voltage_source('E', 2, control_nodes=('3', '0'))),
+            Branch('6', '7', resistor('R5', 50)),
+            Branch('7', '0', current_controlled_voltage_source('H', 4, control_branch='Is')),
+            Branch('a', 'b', resistor('Rf', 1)),
+        ],
+        reference_node_label='0',
+    )
+
+
+G1, Y1, Gs, G2, G3, G4, G5 = 1/10, 1/complex(5, 3), 1/10, 1/20, 1/30, 1/40, 1/50
+gm, beta, mu, r = 0.2, 3, 2, 4
+Is, Vs = 0.5, 2
+
+
+def test_coefficient_matrix_of_controlled_source_network() -> None:
+    network = controlled_source_network()
+    A = nodal_analysis_coefficient_matrix(network, NumPyMatrixOperations(), default_label_mappings_factory(network))
+
+    A_ref = np.array([
+        [G1, -G1, 0, 0, 0, 0, 0, 0, 0, 1],
+        [-G1, G1+Y1+Gs, -Gs, 0, 0, 0, 0, 0, 0, 0],
+        [0, -Gs, Gs+G2, 0, 0, 0, 0, 0, 0, 0],
+        [0, gm, 0, G3, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, G4, 0, 0, 0, 0, beta],
+        [0, 0, 0, 0, 0, G5, -G5, 1, 0, 0],
+        [0, 0, 0, 0, 0, -G5, G5, 0, 1, 0],
+        [0, 0, -mu, 0, 0, 1, 0, 0, 0, 0],
+        [0, -r*Gs, r*Gs, 0, 0, 0, 1, 0, 0, 0],
+        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    ], dtype=complex)
+    np.testing.assert_almost_equal(A, A_ref)
+
+
+def test_constants_vector_of_controlled_source_network() -> None:
+    network = controlled_source_network()
+    _, b = nodal_analysis_system(network, NumPyMatrixOperations(), default_label_mappings_factory(network))
+
+    b_ref = np.array([[0], [Is], [-Is], [0], [0], [0], [0], [0], [-r*Is], [Vs]], dtype=complex)
+    np.testing.assert_almost_equal(b, b_ref)
+
+
+def test_stamps_of_ladder_network_scale_with_number_of_branches() -> None:
+    n = 2000
+    network = Network(
+        [Branch('1', '0', voltage_source('Vs', 1))]
+        + [Branch(str(k), str(k+1), resistor(f'R{k}', 1)) for k in range(1, n)]
+        + [Branch(str(n), '0', resistor('Rload', 1))]
+    )
+    stamps = nodal_analysis_stamps(network, NumPyMatrixOperations(), default_label_mappings_factory(network))
+    assert stamps.coefficients.shape == (n+1, n+1)
+    assert len(stamps.coefficients.values) <= 4*n + 2
+
+
+def test_nodal_analysis_solution_stamps_network_once(monkeypatch) -> None:
+    calls: list[Network] = []
+    stamps = node_analysis_calculations.nodal_analysis_stamps
+    def counting_stamps(network, *args, **kwargs):
+        calls.append(network)
+        return stamps(network, *args, **kwargs)
+    monkeypatch.setattr(node_analysis_calculations, 'nodal_analysis_stamps', counting_stamps)
+    nodal_analysis_solution(controlled_source_network())
+    assert len(calls) == 1
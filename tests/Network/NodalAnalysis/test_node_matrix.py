@@ -1,10 +1,14 @@
-from CircuitCalculator.Network.NodalAnalysis.node_analysis_calculations import node_admittance_matrix
-from CircuitCalculator.Network.NodalAnalysis.label_mapping import default_label_mappings_factory
-from CircuitCalculator.Network.NodalAnalysis.matrix_operations import NumPyMatrixOperations
+from CircuitCalculator.Network.NodalAnalysis.node_analysis_calculations import nodal_analysis_coefficient_matrix
+from CircuitCalculator.Network.NodalAnalysis.label_mapping import NetworkLabelMappings, default_label_mappings_factory
+from CircuitCalculator.Network.NodalAnalysis.matrix_operations import Matrix, MatrixOperations, NumPyMatrixOperations
 from CircuitCalculator.Network.network import Network, Branch
 from CircuitCalculator.Network.elements import voltage_source, conductance
 import numpy as np
 
+def node_admittance_matrix(network: Network, matrix_ops: MatrixOperations, label_mappings: NetworkLabelMappings) -> Matrix:
+    N = label_mappings.node_mapping.N
+    return nodal_analysis_coefficient_matrix(network, matrix_ops, label_mappings)[:N, :N]
+
 def test_ideal_voltage_sources_are_ignored_but_matrix_is_finite() -> None:
     network = Network([
         Branch('0', '2', voltage_source('Us1', 1)),
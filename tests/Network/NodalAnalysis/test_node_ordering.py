@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+import scipy.sparse.linalg
+from CircuitCalculator.Network.NodalAnalysis import node_ordering as no
+from CircuitCalculator.Network.NodalAnalysis.compiled_network import compile_network
+from CircuitCalculator.Network.NodalAnalysis.label_mapping import default_label_mappings_factory
+from CircuitCalculator.Network.NodalAnalysis.solution import numeric_nodal_analysis_bias_point_solution, ordered_sparse_nodal_analysis_bias_point_solution
+from CircuitCalculator.Network.elements import current_controlled_current_source, current_source, resistor, voltage_controlled_voltage_source, voltage_source
+from CircuitCalculator.Network.network import Branch, Network
+
+ordered_factories = [
+    no.reverse_cuthill_mckee_label_mappings_factory,
+    no.minimum_degree_label_mappings_factory,
+    no.nested_dissection_label_mappings_factory,
+]
+
+def grid_network(m: int) -> Network:
+    branches = [Branch('n_0_0', '0', voltage_source('Vs', 1, Z=0.1)), Branch('0', f'n_{m-1}_{m-1}', current_source('Is', 0.2))]
+    for i in range(m):
+        for j in range(m):
+            if i+1 < m:
+                branches.append(Branch(f'n_{i}_{j}', f'n_{i+1}_{j}', resistor(f'Rv_{i}_{j}', 1 + (i*j) % 3)))
+            if j+1 < m:
+                branches.append(Branch(f'n_{i}_{j}', f'n_{i}_{j+1}', resistor(f'Rh_{i}_{j}', 2 + (i+j) % 2)))
+            branches.append(Branch(f'n_{i}_{j}', '0', resistor(f'G_{i}_{j}', 100)))
+    branches.append(Branch('x', '0', voltage_controlled_voltage_source('E', 2, control_nodes=('n_1_1', '0'))))
+    branches.append(Branch('x', '0', resistor('Rx', 10)))
+    branches.append(Branch('0', 'n_2_2', current_controlled_current_source('F', 0.5, control_branch='Rx')))
+    return Network(branches)
+
+def factorization_fill(network: Network, label_mappings_factory) -> int:
+    compiled = compile_network(network, label_mappings_factory)
+    A = compiled.coefficient_matrix(compiled.element_values).tocsc()
+    lu = scipy.sparse.linalg.splu(A, permc_spec='NATURAL', diag_pivot_thresh=0.1)
+    return lu.L.nnz + lu.U.nnz
+
+@pytest.mark.parametrize('label_mappings_factory', ordered_factories)
+def test_ordered_node_mapping_is_permutation_of_node_labels(label_mappings_factory) -> None:
+    network = grid_network(8)
+    node_mapping = label_mappings_factory(network).node_mapping
+    assert set(node_mapping.keys) == network.node_labels - {'0'}
+    assert sorted(node_mapping.values) == list(range(len(network.node_labels) - 1))
+
+@pytest.mark.parametrize('label_mappings_factory', ordered_factories)
+def test_ordered_solution_is_reported_by_label(label_mappings_factory) -> None:
+    network = grid_network(8)
+    reference = numeric_nodal_analysis_bias_point_solution(network)
+    solution = ordered_sparse_nodal_analysis_bias_point_solution(network, label_mappings_factory)
+    for branch_id in network.branch_ids:
+        np.testing.assert_almost_equal(solution.get_current(branch_id), reference.get_current(branch_id))
+        np.testing.assert_almost_equal(solution.get_voltage(branch_id), reference.get_voltage(branch_id))
+
+def test_reverse_cuthill_mckee_reduces_bandwidth() -> None:
+    network = grid_network(12)
+    def bandwidth(label_mappings_factory) -> int:
+        node_mapping = label_mappings_factory(network).node_mapping
+        return max(abs(node_mapping[b.node1] - node_mapping[b.node2]) for b in network.branches if '0' not in (b.node1, b.node2))
+    assert bandwidth(no.reverse_cuthill_mckee_label_mappings_factory) < bandwidth(default_label_mappings_factory)
+
+@pytest.mark.parametrize('label_mappings_factory', [no.minimum_degree_label_mappings_factory, no.nested_dissection_label_mappings_factory])
+def test_fill_reducing_orderings_reduce_fill_in(label_mappings_factory) -> None:
+    network = grid_network(30)
+    assert factorization_fill(network, label_mappings_factory) < factorization_fill(network, no.reverse_cuthill_mckee_label_mappings_factory) < factorization_fill(network, default_label_mappings_factory)
+
+def test_minimum_degree_order_is_computed_once_per_topology(monkeypatch) -> None:
+    no._minimum_degree_order.cache_clear()
+    factorizations: list[int] = []
+    splu = scipy.sparse.linalg.splu
+    def counting_splu(*args, **kwargs):
+        factorizations.append(1)
+        return splu(*args, **kwargs)
+    monkeypatch.setattr(no.scipy.sparse.linalg, 'splu', counting_splu)
+    labels, graph = no.node_graph(grid_network(6))
+    order = no.minimum_degree_order(graph)
+    order[:] = 0
+    np.testing.assert_array_equal(np.sort(no.minimum_degree_order(graph.copy())), np.arange(len(labels)))
+    assert len(factorizations) == 1
@@ -1,7 +1,9 @@
 from CircuitCalculator.Network.network import Network, Branch
-from CircuitCalculator.Network.elements import open_circuit, resistor, voltage_source
+from CircuitCalculator.Network.elements import open_circuit, resistor, voltage_controlled_voltage_source, voltage_source
+from CircuitCalculator.Network.NodalAnalysis.matrix_operations import MatrixInversionException
 from CircuitCalculator.Network.NodalAnalysis.node_analysis import open_circuit_impedance
 from numpy.testing import assert_almost_equal
+import pytest
 
 def test_total_impedeance_returns_zero_on_equal_nodes() -> None:
     R1, R2, R3 = 10, 20, 30
@@ -53,3 +55,13 @@ def test_total_impedeance_returns_correct_values() -> None:
     assert_almost_equal(complex(open_circuit_impedance(network, '1', '2')), R2*(R1+R3)/(R1+R2+R3), decimal=4)
     assert_almost_equal(complex(open_circuit_impedance(network, '0', '1')), R1*(R2+R3)/(R1+R2+R3), decimal=4)
     assert_almost_equal(complex(open_circuit_impedance(network, '0', '2')), (R1+R2)*R3/(R1+R2+R3), decimal=4)
+
+def test_open_circuit_impedance_of_singular_network_raises_matrix_inversion_exception() -> None:
+    network = Network([
+        Branch('1', '0', resistor('R0', 1)),
+        Branch('1', '2', resistor('R1', 10)),
+        Branch('2', '0', voltage_controlled_voltage_source('E1', 1, control_nodes=('1', '0'))),
+        Branch('2', '0', voltage_controlled_voltage_source('E2', 1, control_nodes=('1', '0'))),
+    ])
+    with pytest.raises(MatrixInversionException):
+        open_circuit_impedance(network, '1', '0')
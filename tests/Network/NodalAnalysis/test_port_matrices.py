@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from CircuitCalculator.Network.NodalAnalysis.matrix_operations import MatrixInversionException
+from CircuitCalculator.Network.NodalAnalysis.network_analysis import port_matrices
+from CircuitCalculator.Network.NodalAnalysis.node_analysis import open_circuit_impedance
+from CircuitCalculator.Network.elements import current_source, open_circuit, resistor, voltage_source
+from CircuitCalculator.Network.network import Branch, Network
+
+def t_network() -> Network:
+    return Network([
+        Branch('1', '2', resistor('R1', 10)),
+        Branch('2', '0', resistor('R2', 20)),
+        Branch('2', '3', resistor('R3', 30)),
+        Branch('3', '0', current_source('Is', 1)),
+    ])
+
+def test_port_impedance_matrix_of_t_network() -> None:
+    Z = port_matrices(t_network(), [('1', '0'), ('3', '0')]).Z
+    np.testing.assert_almost_equal(Z, [[30, 20], [20, 50]])
+
+def test_port_admittance_matrix_is_inverse_of_impedance_matrix() -> None:
+    ports = port_matrices(t_network(), [('1', '0'), ('3', '0')])
+    np.testing.assert_almost_equal(ports.Y @ ports.Z, np.eye(2))
+
+def test_port_impedances_equal_open_circuit_impedances() -> None:
+    network = t_network()
+    ports = [('1', '0'), ('3', '2'), ('0', '2'), ('1', '3')]
+    Z = port_matrices(network, ports).Z
+    for k, (node1, node2) in enumerate(ports):
+        np.testing.assert_almost_equal(Z[k, k], open_circuit_impedance(network, node1, node2))
+
+def test_port_across_voltage_source_has_zero_impedance() -> None:
+    network = Network([
+        Branch('1', '0', voltage_source('Vs', 1)),
+        Branch('1', '2', resistor('R1', 10)),
+        Branch('2', '0', resistor('R2', 10)),
+    ])
+    Z = port_matrices(network, [('1', '0'), ('2', '0')]).Z
+    np.testing.assert_almost_equal(Z, [[0, 0], [0, 5]])
+
+def test_isolated_port_has_infinite_impedance() -> None:
+    network = Network([
+        Branch('1', '2', open_circuit('C')),
+        Branch('2', '0', resistor('R', 10)),
+    ])
+    Z = port_matrices(network, [('1', '0'), ('2', '0')]).Z
+    assert Z[0, 0] == open_circuit_impedance(network, '1', '0') == float('inf')
+    np.testing.assert_almost_equal(Z[1, 1], 10)
+
+def test_isolated_port_carries_no_short_circuit_current() -> None:
+    network = Network([
+        Branch('1', '2', open_circuit('C')),
+        Branch('2', '0', resistor('R', 10)),
+    ])
+    Y = port_matrices(network, [('1', '0'), ('2', '0')]).Y
+    np.testing.assert_almost_equal(Y, [[0, 0], [0, 0.1]])
+
+def test_admittance_matrix_of_port_across_voltage_source_is_undefined() -> None:
+    network = Network([
+        Branch('1', '0', voltage_source('Vs', 1)),
+        Branch('1', '2', resistor('R1', 10)),
+        Branch('2', '0', resistor('R2', 10)),
+    ])
+    with pytest.raises(MatrixInversionException):
+        port_matrices(network, [('1', '0'), ('2', '0')]).Y
+
+def test_unknown_port_node_raises_descriptive_error() -> None:
+    with pytest.raises(KeyError, match='x'):
+        port_matrices(t_network(), [('x', '0')])
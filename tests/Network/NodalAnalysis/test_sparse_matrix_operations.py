@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+import scipy.sparse
+
+from CircuitCalculator.Network.NodalAnalysis import matrix_operations as mo
+from CircuitCalculator.Network.NodalAnalysis.node_analysis import nodal_analysis_solution, open_circuit_impedance, state_space_matrices
+from CircuitCalculator.Network.NodalAnalysis.solution import sparse_nodal_analysis_bias_point_solution
+from CircuitCalculator.Network.elements import current_source, resistor, voltage_source
+from CircuitCalculator.Network.network import Branch, Network
+from CircuitCalculator.Network.solution import NetworkSolutionException
+
+
+def example_network() -> Network:
+    return Network([
+        Branch('1', '0', voltage_source('Vs', 5)),
+        Branch('1', '2', resistor('R1', 10)),
+        Branch('2', '0', resistor('R2', 20)),
+        Branch('2', '3', resistor('R3', 30)),
+        Branch('3', '0', resistor('C', 1e12)),
+        Branch('0', '3', current_source('Is', 0.1)),
+    ])
+
+
+def test_sparse_coefficient_matrix_is_kept_sparse() -> None:
+    A = mo.SciPySparseMatrixOperations.from_triplets((2, 2), [0, 0, 1], [0, 0, 1], [1, 2, 3])
+    assert scipy.sparse.issparse(A)
+    np.testing.assert_almost_equal(A.toarray(), np.array([[3, 0], [0, 3]]))
+
+
+def test_sparse_solution_equals_dense_solution() -> None:
+    network = example_network()
+    x_dense = nodal_analysis_solution(network, matrix_ops=mo.NumPyMatrixOperations())
+    x_sparse = nodal_analysis_solution(network, matrix_ops=mo.SciPySparseMatrixOperations())
+    np.testing.assert_almost_equal(x_sparse, x_dense)
+
+
+def test_sparse_open_circuit_impedance_equals_dense_impedance() -> None:
+    network = example_network()
+    for node1, node2 in [('2', '0'), ('3', '0'), ('2', '3'), ('0', '3')]:
+        Z_dense = open_circuit_impedance(network, node1, node2, matrix_ops=mo.NumPyMatrixOperations())
+        Z_sparse = open_circuit_impedance(network, node1, node2, matrix_ops=mo.SciPySparseMatrixOperations())
+        np.testing.assert_almost_equal(Z_sparse, Z_dense)
+
+
+def test_sparse_state_space_matrices_equal_dense_matrices() -> None:
+    network = example_network()
+    dense = state_space_matrices(network, c_values={'C': 1e-3}, matrix_ops=mo.NumPyMatrixOperations())
+    sparse = state_space_matrices(network, c_values={'C': 1e-3}, matrix_ops=mo.SciPySparseMatrixOperations())
+    for M_sparse, M_dense in zip(sparse, dense):
+        np.testing.assert_almost_equal(M_sparse.toarray(), M_dense)
+
+
+def test_factorization_is_reused_for_same_matrix() -> None:
+    matrix_ops = mo.SciPySparseMatrixOperations()
+    A = mo.SciPySparseMatrixOperations.from_triplets((2, 2), [0, 1, 0, 1], [0, 1, 1, 0], [2, 2, -1, -1])
+    lu = matrix_ops.factorize(A)
+    matrix_ops.solve(A, np.array([[1], [0]]))
+    assert matrix_ops.factorize(A) is lu
+    assert matrix_ops.factorize(A.copy()) is lu
+
+
+def test_factorization_is_renewed_for_modified_matrix() -> None:
+    matrix_ops = mo.SciPySparseMatrixOperations()
+    A = mo.SciPySparseMatrixOperations.from_triplets((2, 2), [0, 1, 0, 1], [0, 1, 1, 0], [2, 2, -1, -1])
+    x = matrix_ops.solve(A, np.array([[1], [0]]))
+    A.data[:] *= 2
+    np.testing.assert_almost_equal(matrix_ops.solve(A, np.array([[1], [0]])), np.array(x)/2)
+
+
+def test_sparse_inverse_is_sparse_and_equals_dense_inverse() -> None:
+    A = mo.SciPySparseMatrixOperations.from_triplets((3, 3), [0, 1, 2, 0, 1], [0, 1, 2, 1, 0], [2, 3, 4, -1, -1])
+    inverse = mo.SciPySparseMatrixOperations(inverse_block_size=2).inv(A)
+    assert scipy.sparse.issparse(inverse)
+    np.testing.assert_almost_equal(inverse.toarray(), np.linalg.inv(A.toarray()))
+    with pytest.raises(mo.MatrixInversionException):
+        mo.SciPySparseMatrixOperations().inv(mo.SciPySparseMatrixOperations.from_triplets((2, 2), [0], [0], [1]))
+
+
+def test_sparse_solution_of_large_ladder_network() -> None:
+    n = 5000
+    network = Network(
+        [Branch('1', '0', voltage_source('Vs', 1))]
+        + [Branch(str(k), str(k+1), resistor(f'R{k}', 1)) for k in range(1, n)]
+        + [Branch(str(n), '0', resistor('Rload', 1))]
+    )
+    solution = sparse_nodal_analysis_bias_point_solution(network)
+    np.testing.assert_almost_equal(solution.get_current('Rload'), 1/n)
+
+
+def test_sparse_solution_raises_on_floating_node() -> None:
+    network = Network([
+        Branch('1', '0', current_source('Is', 1)),
+        Branch('1', '2', current_source('Is2', 1)),
+        Branch('2', '0', resistor('R', 1)),
+        Branch('3', '2', current_source('Is3', 0)),
+    ])
+    with pytest.raises(NetworkSolutionException):
+        sparse_nodal_analysis_bias_point_solution(network)
+
+
+def test_solve_with_sparse_right_hand_side_stays_sparse() -> None:
+    A = mo.SciPySparseMatrixOperations.from_triplets((3, 3), [0, 1, 2, 0, 1], [0, 1, 2, 1, 0], [2, 2, 1, -1, -1])
+    B = mo.SciPySparseMatrixOperations.from_triplets((3, 2), [0, 2], [0, 1], [1, 3])
+    X = mo.SciPySparseMatrixOperations(inverse_block_size=1).solve_matrix(A, B)
+    assert scipy.sparse.issparse(X) and X.nnz == 3
+    np.testing.assert_almost_equal(X.toarray(), np.linalg.solve(A.toarray(), B.toarray()))
@@ -0,0 +1,79 @@
+import pytest
+import sympy as sp
+
+from CircuitCalculator.Network.NodalAnalysis import matrix_operations as mo
+from CircuitCalculator.Network.NodalAnalysis import node_analysis as na
+from CircuitCalculator.Network.NodalAnalysis.label_mapping import default_label_mappings_factory
+from CircuitCalculator.Network.NodalAnalysis.solution import NodalAnalysisQuantities, NodalAnalysisQuerySolution, NodalAnalysisSolution, symbolic_nodal_analysis_bias_point_solution
+from CircuitCalculator.Network.symbolic_elements import current_source, resistor, voltage_controlled_current_source, voltage_controlled_voltage_source, voltage_source
+from CircuitCalculator.Network.network import Branch, Network
+
+
+def symbolic_network() -> Network:
+    V, I, R1, R2, R3, G = sp.symbols('V I R1 R2 R3 G')
+    return Network([
+        Branch('1', '0', voltage_source('Vs', V, Z=0)),
+        Branch('1', '2', resistor('R1', R1)),
+        Branch('2', '0', resistor('R2', R2)),
+        Branch('2', '3', resistor('R3', R3)),
+        Branch('3', '0', current_source('Is', I, Y=1/R2)),
+        Branch('0', '3', voltage_controlled_current_source('G', G, control_nodes=('1', '2'))),
+    ])
+
+
+def test_domain_matrix_functional_equals_dot_product() -> None:
+    a, b = sp.symbols('a b')
+    A = sp.Matrix([[a + 1, -1, 0], [-1, b + 2, -1], [0, -1, a + b]])
+    rhs = sp.Matrix([a, 0, 1])
+    x = A.LUsolve(rhs)
+    value = mo.SymPyDomainMatrixOperations.solve_functional(A, rhs, {0: 1, 2: -b})
+    assert sp.simplify(value - (x[0] - b*x[2])) == 0
+
+
+def test_query_solution_equals_full_symbolic_solution() -> None:
+    network = symbolic_network()
+    query = symbolic_nodal_analysis_bias_point_solution(network)
+    assert isinstance(query, NodalAnalysisQuerySolution)
+    full = NodalAnalysisSolution(
+        network=network,
+        solution_vector=na.nodal_analysis_solution(network, matrix_ops=mo.SymPyMatrixOperations()),
+        label_mappings_factory=default_label_mappings_factory
+    )
+    for branch_id in ['Vs', 'R1', 'R2', 'R3', 'G']:
+        assert sp.simplify(query.get_voltage(branch_id) - full.get_voltage(branch_id)) == 0
+        assert sp.simplify(query.get_current(branch_id) - full.get_current(branch_id)) == 0
+    assert query.get_potential('0') == 0
+
+
+def test_query_solution_solves_only_requested_quantities() -> None:
+    query = symbolic_nodal_analysis_bias_point_solution(symbolic_network())
+    assert list(query._queries) == [()]
+    query.get_voltage('R3')
+    query.get_voltage('R3')
+    assert len(query._queries) == 2
+
+
+def test_symbolic_open_circuit_impedance_is_single_entry_of_inverse() -> None:
+    R1, R2, R3 = sp.symbols('R1 R2 R3')
+    network = Network([
+        Branch('1', '2', resistor('R1', R1)),
+        Branch('2', '0', resistor('R2', R2)),
+        Branch('2', '0', resistor('R3', R3)),
+    ])
+    Z = na.open_circuit_impedance(network, '1', '0', matrix_ops=mo.SymPyDomainMatrixOperations())
+    assert sp.simplify(Z - (R1 + R2*R3/(R2 + R3))) == 0
+
+
+def test_query_solution_raises_for_singular_system_on_construction() -> None:
+    network = Network([
+        Branch('1', '0', voltage_source('Vs', sp.Symbol('V'))),
+        Branch('1', '2', resistor('R1', sp.Symbol('R'))),
+        Branch('2', '0', voltage_controlled_voltage_source('E', 1, control_nodes=('2', '0'))),
+    ])
+    with pytest.raises(mo.MatrixInversionException):
+        symbolic_nodal_analysis_bias_point_solution(network)
+
+
+def test_nodal_analysis_quantities_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        NodalAnalysisQuantities() # type: ignore
@@ -1,14 +1,19 @@
 import numpy as np
 import pytest
 import sympy as sp
-from CircuitCalculator.Network.NodalAnalysis.label_mapping import default_label_mappings_factory
-from CircuitCalculator.Network.NodalAnalysis.matrix_operations import NumPyMatrixOperations, SymPyMatrixOperations
-from CircuitCalculator.Network.NodalAnalysis.node_analysis_calculations import InvalidControlledSource, node_admittance_matrix
+from CircuitCalculator.Network.NodalAnalysis.label_mapping import NetworkLabelMappings, default_label_mappings_factory
+from CircuitCalculator.Network.NodalAnalysis.matrix_operations import Matrix, MatrixOperations, NumPyMatrixOperations, SymPyMatrixOperations
+from CircuitCalculator.Network.NodalAnalysis.node_analysis_calculations import InvalidControlledSource, nodal_analysis_coefficient_matrix
 from CircuitCalculator.Network.network import Branch, Network
 from CircuitCalculator.Network.elements import conductance, voltage_controlled_current_source
 from CircuitCalculator.Network.symbolic_elements import admittance, voltage_controlled_current_source as symbolic_vccs
 
 
+def node_admittance_matrix(network: Network, matrix_ops: MatrixOperations, label_mappings: NetworkLabelMappings) -> Matrix:
+    N = label_mappings.node_mapping.N
+    return nodal_analysis_coefficient_matrix(network, matrix_ops, label_mappings)[:N, :N]
+
+
 def test_voltage_controlled_current_source_stamps_node_admittance_matrix() -> None:
     transconductance = 0.5
     network = Network(
@@ -0,0 +1,72 @@
+import pytest
+from CircuitCalculator.Network.network import Network, Branch
+from CircuitCalculator.Network.diagnostics import short_circuited_ports, topology_diagnostics, voltage_source_forest
+from CircuitCalculator.Network.elements import current_source, open_circuit, resistor, short_circuit, voltage_controlled_voltage_source, voltage_source
+from CircuitCalculator.Network.NodalAnalysis.node_analysis import NodalAnalysisException, nodal_analysis_solution
+
+def test_solvable_network_has_no_diagnostics() -> None:
+    network = Network([
+        Branch('1', '0', voltage_source('Vs', 10)),
+        Branch('1', '2', resistor('R1', 10)),
+        Branch('2', '0', current_source('Is', 1)),
+        Branch('3', '0', voltage_controlled_voltage_source('E', 2, control_nodes=('2', '0'))),
+    ])
+    diagnostics = topology_diagnostics(network)
+    assert diagnostics.is_solvable
+    assert diagnostics.floating_nodes == ()
+    assert diagnostics.contradictional_elements == ()
+
+def test_node_connected_via_current_sources_reports_cutset() -> None:
+    network = Network([
+        Branch('0', '1', current_source('I1', 1)),
+        Branch('1', '2', resistor('R1', 10)),
+        Branch('2', '0', current_source('I2', 2)),
+        Branch('0', '3', resistor('R2', 10)),
+    ])
+    diagnostics = topology_diagnostics(network)
+    assert diagnostics.floating_nodes == ('1', '2')
+    assert diagnostics.current_source_cutsets == (('I1', 'I2'),)
+
+def test_node_connected_via_open_circuit_is_floating() -> None:
+    network = Network([
+        Branch('1', '0', voltage_source('Vs', 10)),
+        Branch('1', '2', open_circuit('Ro')),
+        Branch('2', '0', open_circuit('Ru')),
+    ])
+    diagnostics = topology_diagnostics(network)
+    assert diagnostics.floating_nodes == ('2',)
+    assert diagnostics.current_source_cutsets == ()
+
+def test_loop_of_voltage_sources_and_shorts_is_reported() -> None:
+    network = Network([
+        Branch('1', '0', voltage_source('V1', 10)),
+        Branch('1', '2', short_circuit('S1')),
+        Branch('2', '3', resistor('R1', 10)),
+        Branch('3', '0', resistor('R2', 10)),
+        Branch('2', '0', voltage_source('V2', 5)),
+    ])
+    diagnostics = topology_diagnostics(network)
+    assert diagnostics.voltage_source_loops == (('S1', 'V1', 'V2'),)
+    assert not diagnostics.is_solvable
+
+def test_nodal_analysis_raises_with_element_names_before_assembly() -> None:
+    network = Network([
+        Branch('1', '0', voltage_source('V1', 10)),
+        Branch('1', '0', voltage_source('V2', 10)),
+    ])
+    with pytest.raises(NodalAnalysisException) as e:
+        nodal_analysis_solution(network)
+    assert set(e.value.contradictional_elements) == {'V1', 'V2'}
+
+def test_voltage_source_forest_connects_nodes_across_series_sources() -> None:
+    network = Network([
+        Branch('1', '2', voltage_source('V1', 3)),
+        Branch('2', '3', short_circuit('S1')),
+        Branch('3', '0', resistor('R1', 10)),
+        Branch('4', '0', voltage_controlled_voltage_source('E', 2, control_nodes=('1', '0'))),
+    ])
+    forest = voltage_source_forest(network)
+    assert forest.connects('1', '3')
+    assert not forest.connects('1', '0')
+    assert not forest.connects('4', '0')
+    assert short_circuited_ports(network, [('3', '1'), ('2', '2'), ('3', '0')]) == [True, True, False]
@@ -0,0 +1,47 @@
+from CircuitCalculator.Network.network import Network, Branch
+from CircuitCalculator.Network.elements import resistor
+
+def test_topology_indexes_branches_by_id() -> None:
+    branchA = Branch('0', '1', resistor('R1', 10))
+    branchB = Branch('1', '2', resistor('R2', 20))
+    network = Network([branchA, branchB])
+    assert network.topology.branch_index == {'R1': branchA, 'R2': branchB}
+
+def test_topology_adjacency_is_sorted_by_opposite_node() -> None:
+    branchA = Branch('2', '0', resistor('R1', 10))
+    branchB = Branch('1', '2', resistor('R2', 20))
+    branchC = Branch('2', '3', resistor('R3', 30))
+    network = Network([branchC, branchA, branchB])
+    assert network.branches_connected_to('2') == [branchA, branchB, branchC]
+
+def test_modifying_returned_branch_list_does_not_alter_topology() -> None:
+    branchA = Branch('0', '1', resistor('R1', 10))
+    network = Network([branchA])
+    network.branches_connected_to('1').clear()
+    network.branches_between('0', '1').clear()
+    assert network.branches_connected_to('1') == [branchA]
+    assert network.branches_between('1', '0') == [branchA]
+
+def test_network_reports_connectivity_of_nodes() -> None:
+    network = Network([
+        Branch('0', '1', resistor('R1', 10)),
+        Branch('1', '2', resistor('R2', 20)),
+        Branch('a', 'b', resistor('R3', 30)),
+    ])
+    assert network.is_connected('0', '2')
+    assert network.is_connected('a', 'b')
+    assert not network.is_connected('0', 'a')
+    assert not network.is_connected('0', 'x')
+
+def test_isolated_reference_node_is_only_node_label() -> None:
+    network = Network([Branch('1', '2', resistor('R1', 10))], reference_node_label='0')
+    assert network.node_labels == {'0'}
+    assert network.branch_ids == []
+
+def test_large_ladder_network_is_indexed_completely() -> None:
+    n = 5000
+    branches = [Branch(str(k), str(k+1), resistor(f'R{k}', 1)) for k in range(n)]
+    network = Network(branches)
+    assert network.number_of_nodes == n+1
+    assert network[f'R{n-1}'] == branches[-1]
+    assert network.nodes_connected_to(str(n//2)) == {str(n//2-1), str(n//2+1)}
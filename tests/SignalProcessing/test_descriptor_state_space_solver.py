@@ -0,0 +1,41 @@
+from CircuitCalculator.SignalProcessing.state_space_model import DescriptorStateSpaceModel, descriptor_state_space_solver, consistent_initial_state
+import numpy as np
+import scipy.sparse
+import pytest
+
+def rc_divider_model(R: float = 1e3, C: float = 1e-6) -> DescriptorStateSpaceModel:
+    # x = (phi1, phi2, i_V): source at node 1, R from 1 to 2, C from 2 to ground
+    E = scipy.sparse.csr_matrix(([C], ([1], [1])), shape=(3, 3))
+    A = -scipy.sparse.csr_matrix(np.array([[1/R, -1/R, 1], [-1/R, 1/R, 0], [1, 0, 0]]))
+    B = scipy.sparse.csr_matrix(([1.0], ([2], [0])), shape=(3, 1))
+    return DescriptorStateSpaceModel(E=E, A=A, B=B)
+
+def test_descriptor_model_rejects_inconsistent_shapes() -> None:
+    with pytest.raises(ValueError):
+        DescriptorStateSpaceModel(E=np.zeros((2, 2)), A=np.zeros((3, 3)), B=np.zeros((3, 1)))
+    with pytest.raises(ValueError):
+        DescriptorStateSpaceModel(E=np.zeros((3, 3)), A=np.zeros((3, 3)), B=np.zeros((2, 1)))
+
+def test_consistent_initial_state_solves_algebraic_equations() -> None:
+    ssm = rc_divider_model()
+    P = scipy.sparse.csr_matrix(([1.0], ([1], [0])), shape=(3, 1))
+    x0, j0 = consistent_initial_state(ssm, np.array([2.0]), P)
+    np.testing.assert_allclose(x0, [2.0, 0.0, -2e-3], atol=1e-12)
+    np.testing.assert_allclose(j0, [-2e-3], atol=1e-12)
+
+@pytest.mark.parametrize('method, order', [('backward_euler', 1), ('trapezoidal', 2), ('bdf2', 2)])
+def test_descriptor_solvers_converge_with_their_order(method: str, order: int) -> None:
+    ssm = rc_divider_model()
+    w, tau = 2*np.pi*500, 1e-3
+    errors = []
+    for dt in [4e-6, 2e-6]:
+        t = np.arange(0, 5e-3 + dt/2, dt)
+        _, x, _ = descriptor_state_space_solver(ssm, np.sin(w*t), t, np.zeros(3), method=method)
+        reference = (np.sin(w*t) - w*tau*np.cos(w*t) + w*tau*np.exp(-t/tau))/(1 + (w*tau)**2)
+        errors.append(np.max(np.abs(x[:, 1] - reference)))
+    assert errors[0]/errors[1] == pytest.approx(2**order, rel=0.25)
+
+def test_descriptor_solver_rejects_unknown_method() -> None:
+    t = np.arange(3)*1e-6
+    with pytest.raises(ValueError):
+        descriptor_state_space_solver(rc_divider_model(), np.zeros(3), t, np.zeros(3), method='gear')
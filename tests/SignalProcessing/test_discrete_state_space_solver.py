@@ -0,0 +1,44 @@
+from CircuitCalculator.SignalProcessing.state_space_model import NumericStateSpaceModel, continuous_state_space_solver, discrete_state_space_solver, discretize
+import numpy as np
+import pytest
+
+def rlc_model() -> NumericStateSpaceModel:
+    R, L, C = 10, 1e-2, 1e-4
+    return NumericStateSpaceModel(
+        A=np.array([[0, 1/C], [-1/L, -R/L]]),
+        B=np.array([[0, 1/C], [1/L, 0]]),
+        C=np.array([[1, 0], [0, R]]),
+        D=np.array([[0, 0], [0, 0]])
+    )
+
+def test_first_order_hold_solver_equals_lsim() -> None:
+    ssm = rlc_model()
+    t = np.linspace(0, 0.05, 2001)
+    u = np.column_stack((np.sin(2*np.pi*50*t), 0.01*np.cos(2*np.pi*120*t)))
+    x0 = np.array([0.5, -0.01])
+    t_ref, y_ref, x_ref = continuous_state_space_solver(ssm, u, t, x0)
+    t_out, y, x = discrete_state_space_solver(ssm, u, t, x0)
+    np.testing.assert_allclose(t_out, t_ref)
+    np.testing.assert_allclose(x, x_ref, atol=1e-9)
+    np.testing.assert_allclose(y, y_ref, atol=1e-9)
+
+def test_zero_order_hold_is_exact_for_piecewise_constant_input() -> None:
+    tau = 1e-3
+    ssm = NumericStateSpaceModel(A=np.array([[-1/tau]]), B=np.array([[1/tau]]), C=np.array([[1]]), D=np.array([[0]]))
+    t = np.arange(0, 5e-3, 1e-4)
+    _, y, _ = discrete_state_space_solver(ssm, np.ones_like(t), t, np.zeros(1), hold='zoh')
+    np.testing.assert_allclose(y[:, 0], 1 - np.exp(-t/tau), atol=1e-12)
+
+def test_discretization_is_cached_per_model_step_and_hold() -> None:
+    ssm = rlc_model()
+    same = NumericStateSpaceModel(A=ssm.A.copy(), B=ssm.B.copy(), C=ssm.C, D=ssm.D)
+    assert discretize(ssm, 1e-5).A is discretize(same, 1e-5).A
+    assert discretize(ssm, 1e-5).A is not discretize(ssm, 2e-5).A
+    assert discretize(ssm, 1e-5, hold='zoh').B0 is not discretize(ssm, 1e-5).B0
+
+def test_discrete_solver_rejects_non_uniform_time_vector_and_unknown_hold() -> None:
+    ssm = rlc_model()
+    with pytest.raises(ValueError):
+        discrete_state_space_solver(ssm, np.zeros((3, 2)), np.array([0, 1e-3, 3e-3]), np.zeros(2))
+    with pytest.raises(ValueError):
+        discretize(ssm, 1e-3, hold='tustin')
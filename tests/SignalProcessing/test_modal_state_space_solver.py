@@ -0,0 +1,48 @@
+from CircuitCalculator.SignalProcessing.state_space_model import NumericStateSpaceModel, exponential_input, modal_state_space_solver, modal_states, sinusoidal_input, step_input
+import numpy as np
+import pytest
+
+def rlc_model() -> NumericStateSpaceModel:
+    R, L, C = 10, 1e-2, 1e-4
+    return NumericStateSpaceModel(
+        A=np.array([[0, 1/C], [-1/L, -R/L]]),
+        B=np.array([[0, 1/C], [1/L, 0]]),
+        C=np.array([[1, 0], [0, R]]),
+        D=np.array([[0, 1], [0, 0]])
+    )
+
+def test_first_order_responses_match_closed_form() -> None:
+    tau = 1e-3
+    ssm = NumericStateSpaceModel(A=np.array([[-1/tau]]), B=np.array([[1/tau]]), C=np.array([[1]]), D=np.array([[0]]))
+    t = np.array([0, 5e-4, 1e-3, 2e-3, 1.0, 1e3])
+    _, y, _ = modal_state_space_solver(ssm, [step_input(2, t0=1e-3)], t, np.array([1]))
+    np.testing.assert_allclose(y[:, 0], np.exp(-t/tau) + 2*(1 - np.exp(-np.maximum(t-1e-3, 0)/tau)), atol=1e-12)
+    _, y, _ = modal_state_space_solver(ssm, [exponential_input(1, tau)], t, np.zeros(1))
+    np.testing.assert_allclose(y[:, 0], t/tau*np.exp(-t/tau), atol=1e-12)
+    w = 1e4
+    _, y, _ = modal_state_space_solver(ssm, [sinusoidal_input(1, w, phi=0.3)], t, np.zeros(1))
+    H = 1/(1 + 1j*w*tau)
+    steady = np.abs(H)*np.cos(w*t + 0.3 + np.angle(H))
+    np.testing.assert_allclose(y[-2:, 0].real, steady[-2:], atol=1e-9)
+
+def test_modal_solution_equals_matrix_exponential_solution() -> None:
+    ssm = rlc_model()
+    t = np.sort(np.random.default_rng(1).uniform(0, 0.05, 200))
+    u = [step_input(1, 0.01) + exponential_input(2, 1e-3, 0.02), sinusoidal_input(0.01, 2*np.pi*120, 0.3, t0=0.005)]
+    x0 = np.array([0.5, -0.01])
+    _, y, x = modal_state_space_solver(ssm, u, t, x0)
+    x_expm = modal_states(ssm.A, ssm.B, u, t, x0, max_condition_number=0)
+    np.testing.assert_allclose(x, x_expm, atol=1e-12)
+    np.testing.assert_allclose(y[:, 0], x[:, 0] + sum(term(t) for term in u[1]), atol=1e-12)
+    assert np.max(np.abs(x.imag)) < 1e-12
+
+def test_defective_state_matrix_uses_matrix_exponential() -> None:
+    ssm = NumericStateSpaceModel(A=np.array([[-1.0, 1.0], [0.0, -1.0]]), B=np.array([[0.0], [1.0]]), C=np.eye(2), D=np.zeros((2, 1)))
+    t = np.array([0.5, 1.0, 3.0])
+    _, _, x = modal_state_space_solver(ssm, [step_input(1)], t, np.zeros(2))
+    np.testing.assert_allclose(x[:, 1], 1 - np.exp(-t), atol=1e-12)
+    np.testing.assert_allclose(x[:, 0], 1 - np.exp(-t) - t*np.exp(-t), atol=1e-12)
+
+def test_modal_solver_requires_terms_for_every_input() -> None:
+    with pytest.raises(ValueError):
+        modal_state_space_solver(rlc_model(), [step_input(1)], np.zeros(1), np.zeros(2))
@@ -0,0 +1,53 @@
+from CircuitCalculator.SignalProcessing.state_space_model import NumericStateSpaceModel, discrete_state_space_solver, sparse_state_space_solver, sparsify
+import numpy as np
+import scipy.sparse
+import pytest
+
+def rc_ladder_model(n: int, R: float = 10, C: float = 1e-6) -> NumericStateSpaceModel:
+    main = np.full(n, -2.0)
+    main[-1] = -1.0
+    A = scipy.sparse.diags([np.ones(n-1), main, np.ones(n-1)], [-1, 0, 1], format='csr')/(R*C)
+    B = scipy.sparse.csr_matrix(([1/(R*C)], ([0], [0])), shape=(n, 1))
+    C_out = scipy.sparse.csr_matrix(([1.0], ([0], [n-1])), shape=(1, n))
+    return NumericStateSpaceModel(A=A, B=B, C=C_out, D=scipy.sparse.csr_matrix((1, 1)))
+
+def dense(ssm: NumericStateSpaceModel) -> NumericStateSpaceModel:
+    return NumericStateSpaceModel(A=ssm.A.toarray(), B=ssm.B.toarray(), C=ssm.C.toarray(), D=ssm.D.toarray())
+
+def test_krylov_solver_equals_first_order_hold_discretization() -> None:
+    ssm = rc_ladder_model(20)
+    t = np.arange(0, 2e-3, 1e-5)
+    u = np.sin(2*np.pi*2e3*t)
+    _, y_ref, x_ref = discrete_state_space_solver(dense(ssm), u, t, np.zeros(20))
+    _, y, x = sparse_state_space_solver(ssm, u, t, np.zeros(20), method='krylov')
+    np.testing.assert_allclose(x, x_ref, atol=1e-10)
+    np.testing.assert_allclose(y, y_ref, atol=1e-10)
+
+@pytest.mark.parametrize('method, order', [('backward_euler', 1), ('trapezoidal', 2)])
+def test_implicit_solvers_converge_with_their_order(method: str, order: int) -> None:
+    ssm = rc_ladder_model(20)
+    errors = []
+    for dt in [4e-6, 2e-6]:
+        t = np.arange(0, 2e-3 + dt/2, dt)
+        u = np.sin(2*np.pi*2e3*t)
+        _, y_ref, _ = discrete_state_space_solver(dense(ssm), u, t, np.zeros(20))
+        _, y, _ = sparse_state_space_solver(ssm, u, t, np.zeros(20), method=method)
+        errors.append(np.max(np.abs(y - y_ref)))
+    assert errors[0]/errors[1] == pytest.approx(2**order, rel=0.2)
+
+def test_trapezoidal_solver_scales_to_large_sparse_ladders() -> None:
+    n = 20000
+    ssm = rc_ladder_model(n)
+    t = np.arange(0, 1e-4, 1e-6)
+    _, y, x = sparse_state_space_solver(ssm, np.ones_like(t), t, np.zeros(n))
+    assert x.shape == (len(t), n)
+    assert 0 < x[-1, 0] < 1 and abs(y[-1, 0]) < 1e-6
+
+def test_sparsify_drops_round_off_entries() -> None:
+    A = sparsify(np.array([[1.0 + 0j, 1e-15], [0, -2]]))
+    assert A.nnz == 2 and not np.iscomplexobj(A.data)
+
+def test_sparse_solver_rejects_unknown_method() -> None:
+    ssm = rc_ladder_model(3)
+    with pytest.raises(ValueError):
+        sparse_state_space_solver(ssm, np.zeros(3), np.arange(3)*1e-6, np.zeros(3), method='rk4')